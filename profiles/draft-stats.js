@@ -14,14 +14,71 @@ const memberFileMap = {
     'JMar': 'jmar',
     'JJ': 'jj',
     'Drew': 'drew',
-    'Nuts': 'nuts',
-    'PPWW': 'ppww',
+    'Nuts': 'nate',
+    'PPWW': 'trey',
     'D-Lew': 'd-lew',
     'Baker': 'baker',
     'Nate': 'nate',
     'Trey': 'trey'
 };
 
+// Keys that only exist in the compact profile format (see scripts/profile_format.py)
+const compactOnlyKeys = ['format', 'player_ids', 'player_names', 'positions', 'value_types', 'picks', 'draft_pos_overrides'];
+
+// Rebuild full pick records from a compact profile so the rest of the page can stay format-agnostic
+function expandProfile(data) {
+    if (data.format !== 'compact') return data;
+    
+    const columns = data.picks;
+    const overrides = data.draft_pos_overrides || {};
+    const picks = columns.year.map((year, i) => {
+        const position = data.positions[columns.position[i]];
+        const seasonFinishNum = columns.season_finish_num[i];
+        return {
+            year: year,
+            round: columns.round[i],
+            pick: columns.pick[i],
+            player_id: data.player_ids[columns.player[i]],
+            player_name: data.player_names[columns.player[i]],
+            position: position,
+            draft_pos: overrides[i] !== undefined ? overrides[i] : `${data.positions[columns.draft_position[i]]} ${columns.draft_pos_num[i]}`,
+            draft_pos_num: columns.draft_pos_num[i],
+            season_finish: seasonFinishNum ? `${position} ${seasonFinishNum}` : '—',
+            season_finish_num: seasonFinishNum,
+            ppr_points: columns.ppr_points[i],
+            value_diff: columns.value_diff[i],
+            value_type: data.value_types[columns.value_type[i]]
+        };
+    });
+    
+    const picksByYear = {};
+    picks.forEach(pick => {
+        (picksByYear[pick.year] = picksByYear[pick.year] || []).push(pick);
+    });
+    const picksByPosition = {};
+    Object.entries(data.picks_by_position || {}).forEach(([position, indexes]) => {
+        picksByPosition[position] = indexes.map(i => picks[i]);
+    });
+    const best = (data.top_10_best_picks || []).map(i => picks[i]);
+    const worst = (data.top_10_worst_picks || []).map(i => picks[i]);
+    
+    const profile = {
+        member: data.member,
+        draft_stats: Object.assign({}, data.draft_stats, { best_pick: best[0] || null, worst_pick: worst[0] || null }),
+        picks_by_year: picksByYear,
+        picks_by_position: picksByPosition,
+        round_stats: data.round_stats || {},
+        top_10_best_picks: best,
+        top_10_worst_picks: worst
+    };
+    Object.keys(data).forEach(key => {
+        if (!(key in profile) && !compactOnlyKeys.includes(key)) {
+            profile[key] = data[key];
+        }
+    });
+    return profile;
+}
+
 function getValueIcon(valueType, valueDiff) {
     if (valueType === 'super_hit') {
         return '<span class="value-icon super-hit">💎</span>';
@@ -51,6 +108,17 @@ async function loadDraftStats() {
     const memberName = profileNameElement.textContent.trim();
     const filename = memberFileMap[memberName] || memberName.toLowerCase().replace(/\s+/g, '-');
     
+    // Pages rendered by render_profiles.py point at a per-member summary (with
+    // lazily loaded year shards) and a slim bundle to fall back on
+    const profilePage = document.querySelector('.profile-page');
+    const dataset = profilePage && profilePage.dataset ? profilePage.dataset : {};
+    if (dataset.summary && await loadSummary(dataset.summary)) {
+        return;
+    }
+    if (dataset.bundle && await loadBundle(dataset.bundle)) {
+        return;
+    }
+    
     try {
         const response = await fetch(`../data/profiles/${filename}.json`);
         if (!response.ok) {
@@ -58,13 +126,21 @@ async function loadDraftStats() {
             return;
         }
         
-        const data = await response.json();
+        const data = expandProfile(await response.json());
         displayDraftStats(data);
         
-        // Load players data for tendencies and achievements
-        const playersResponse = await fetch('../data/players.json');
-        if (playersResponse.ok) {
-            const playersData = await playersResponse.json();
+        // Tendencies and achievements are precomputed by calculate_profile_draft_stats.py
+        if (data.tendencies && data.achievements) {
+            displayPrecomputedTendencies(data);
+            displayPrecomputedAchievements(data);
+            return;
+        }
+        
+        // Older profile JSON: the team index has each drafted player's team by year,
+        // which is all tendencies and achievements need from players data
+        const indexResponse = await fetch('../data/team_index.json');
+        if (indexResponse.ok) {
+            const playersData = playersFromTeamIndex(await indexResponse.json());
             displayDraftTendencies(data, playersData);
             await displayDraftAchievements(data, playersData);
         }
@@ -73,6 +149,70 @@ async function loadDraftStats() {
     }
 }
 
+// Expand data/team_index.json (see scripts/team_index.py) into players.json's
+// { players: { id: { teams_by_year } } } shape for the drafted players
+function playersFromTeamIndex(index) {
+    const players = {};
+    index.entries.forEach(([yearId, teamId, pairs]) => {
+        const year = String(index.years[yearId]);
+        const team = index.teams[teamId];
+        for (let i = 1; i < pairs.length; i += 2) {
+            const playerId = index.players[pairs[i]];
+            if (!players[playerId]) {
+                players[playerId] = { teams_by_year: {} };
+            }
+            players[playerId].teams_by_year[year] = team;
+        }
+    });
+    return { players };
+}
+
+async function loadBundle(bundleUrl) {
+    try {
+        const response = await fetch(bundleUrl);
+        if (!response.ok) {
+            console.warn(`Profile bundle not found: ${bundleUrl}`);
+            return false;
+        }
+        
+        const data = expandProfile(await response.json());
+        displayDraftStats(data);
+        if (data.tendencies && data.achievements) {
+            displayPrecomputedTendencies(data);
+            displayPrecomputedAchievements(data);
+        } else {
+            // Bundles carry the players and league rows the member's picks need
+            displayDraftTendencies(data, { players: data.players || {} });
+            await displayDraftAchievements(data, { players: data.players || {} });
+        }
+        return true;
+    } catch (error) {
+        console.error('Error loading profile bundle:', error);
+        return false;
+    }
+}
+
+async function loadSummary(summaryUrl) {
+    try {
+        const response = await fetch(summaryUrl);
+        if (!response.ok) {
+            console.warn(`Profile summary not found: ${summaryUrl}`);
+            return false;
+        }
+        
+        // Year shards are listed relative to the summary
+        const summary = await response.json();
+        const baseUrl = summaryUrl.replace(/[^/]*$/, '');
+        displaySummaryTable(summary, baseUrl);
+        displayPrecomputedTendencies(summary);
+        displayPrecomputedAchievements(summary);
+        return true;
+    } catch (error) {
+        console.error('Error loading profile summary:', error);
+        return false;
+    }
+}
+
 function displayDraftStats(data) {
     const stats = data.draft_stats;
     
@@ -92,40 +232,140 @@ function displayDraftStatsTable(picksByYear, overallStats) {
     // Add year rows
     years.forEach(year => {
         const picks = picksByYear[year];
-        const stats = calculateYearStats(picks);
+        tbody.appendChild(createYearRow(year, picks.length, calculateYearStats(picks)));
+    });
+    
+    // Add career totals row
+    tbody.appendChild(createCareerRow(overallStats));
+    displayLeagueRow(tbody, years.map(year => parseInt(year)));
+}
+
+// Year rows come from the summary; a year's picks are fetched the first time it is expanded
+function displaySummaryTable(summary, baseUrl) {
+    const tbody = document.getElementById('draft-stats-tbody');
+    if (!tbody) return;
+    
+    tbody.innerHTML = '';
+    
+    summary.years.forEach(entry => {
+        const stats = {
+            hits: entry.hits,
+            misses: entry.misses,
+            pushes: entry.pushes,
+            hitRate: entry.hit_rate,
+            bestPick: entry.best_pick,
+            worstPick: entry.worst_pick
+        };
+        const row = createYearRow(entry.year, entry.picks, stats);
+        row.classList.add('year-row-expandable');
+        row.setAttribute('tabindex', '0');
+        row.setAttribute('aria-expanded', 'false');
         
-        const row = document.createElement('tr');
-        row.innerHTML = `
-            <td class="col-year">${year}</td>
-            <td>${picks.length}</td>
-            <td>${stats.hits}</td>
-            <td>${stats.misses}</td>
-            <td>${stats.pushes}</td>
-            <td>${stats.hitRate.toFixed(1)}%</td>
-            <td class="best-pick-cell">
-                ${stats.bestPick ? `
-                    <span class="pick-name">${stats.bestPick.player_name}</span>
-                    <span class="pick-detail">${stats.bestPick.draft_pos} → ${stats.bestPick.season_finish}</span>
-                ` : '<span class="pick-detail">—</span>'}
-            </td>
-            <td class="value-cell">
-                ${stats.bestPick ? getValueIcon(stats.bestPick.value_type, stats.bestPick.value_diff) : '—'}
-            </td>
-            <td></td>
-            <td class="worst-pick-cell">
-                ${stats.worstPick ? `
-                    <span class="pick-name">${stats.worstPick.player_name}</span>
-                    <span class="pick-detail">${stats.worstPick.draft_pos} → ${stats.worstPick.season_finish}</span>
-                ` : '<span class="pick-detail">—</span>'}
-            </td>
-            <td class="value-cell">
-                ${stats.worstPick ? getValueIcon(stats.worstPick.value_type, stats.worstPick.value_diff) : '—'}
-            </td>
-        `;
+        const shardUrl = `${baseUrl}${entry.file}?v=${entry.sha256.slice(0, 12)}`;
+        const toggle = () => toggleYearPicks(row, entry.year, shardUrl);
+        row.addEventListener('click', toggle);
+        row.addEventListener('keydown', event => {
+            if (event.key === 'Enter' || event.key === ' ') {
+                event.preventDefault();
+                toggle();
+            }
+        });
         tbody.appendChild(row);
     });
     
-    // Add career totals row
+    tbody.appendChild(createCareerRow(summary.draft_stats));
+    // The summary carries the league row precomputed; older summaries fall back to the cube
+    if (summary.league !== undefined) {
+        if (summary.league) tbody.appendChild(createLeagueRow(summary.league));
+    } else {
+        displayLeagueRow(tbody, summary.years.map(entry => entry.year));
+    }
+}
+
+async function toggleYearPicks(row, year, shardUrl) {
+    const expanded = row.getAttribute('aria-expanded') === 'true';
+    row.setAttribute('aria-expanded', expanded ? 'false' : 'true');
+    
+    let detailRow = row.nextElementSibling;
+    if (detailRow && detailRow.classList.contains('year-picks-row')) {
+        detailRow.hidden = expanded;
+        return;
+    }
+    
+    detailRow = document.createElement('tr');
+    detailRow.className = 'year-picks-row';
+    detailRow.innerHTML = '<td colspan="11" class="year-picks-loading">Loading...</td>';
+    row.after(detailRow);
+    
+    try {
+        const response = await fetch(shardUrl);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        const shard = expandProfile(await response.json());
+        detailRow.innerHTML = `<td colspan="11">${renderYearPicks(shard.picks_by_year[year] || [])}</td>`;
+    } catch (error) {
+        console.error(`Error loading ${year} picks:`, error);
+        // Drop the row so the next click retries
+        detailRow.remove();
+        row.setAttribute('aria-expanded', 'false');
+    }
+}
+
+function renderYearPicks(picks) {
+    const rows = picks.map(pick => `
+        <tr>
+            <td>${pick.round}.${pick.pick}</td>
+            <td class="pick-name">${pick.player_name}</td>
+            <td>${pick.draft_pos}</td>
+            <td>${pick.season_finish}</td>
+            <td>${pick.ppr_points !== null && pick.ppr_points !== undefined ? pick.ppr_points.toFixed(1) : '—'}</td>
+            <td class="value-cell">${getValueIcon(pick.value_type, pick.value_diff)} ${formatValueDiff(pick.value_diff)}</td>
+        </tr>
+    `).join('');
+    return `
+        <table class="year-picks-table">
+            <thead>
+                <tr><th>Pick</th><th>Player</th><th>Drafted</th><th>Finished</th><th>PPR</th><th>Value</th></tr>
+            </thead>
+            <tbody>${rows}</tbody>
+        </table>
+    `;
+}
+
+function createYearRow(year, pickCount, stats) {
+    const row = document.createElement('tr');
+    row.innerHTML = `
+        <td class="col-year">${year}</td>
+        <td>${pickCount}</td>
+        <td>${stats.hits}</td>
+        <td>${stats.misses}</td>
+        <td>${stats.pushes}</td>
+        <td>${stats.hitRate.toFixed(1)}%</td>
+        <td class="best-pick-cell">
+            ${stats.bestPick ? `
+                <span class="pick-name">${stats.bestPick.player_name}</span>
+                <span class="pick-detail">${stats.bestPick.draft_pos} → ${stats.bestPick.season_finish}</span>
+            ` : '<span class="pick-detail">—</span>'}
+        </td>
+        <td class="value-cell">
+            ${stats.bestPick ? getValueIcon(stats.bestPick.value_type, stats.bestPick.value_diff) : '—'}
+        </td>
+        <td></td>
+        <td class="worst-pick-cell">
+            ${stats.worstPick ? `
+                <span class="pick-name">${stats.worstPick.player_name}</span>
+                <span class="pick-detail">${stats.worstPick.draft_pos} → ${stats.worstPick.season_finish}</span>
+            ` : '<span class="pick-detail">—</span>'}
+        </td>
+        <td class="value-cell">
+            ${stats.worstPick ? getValueIcon(stats.worstPick.value_type, stats.worstPick.value_diff) : '—'}
+        </td>
+    `;
+    return row;
+}
+
+function createCareerRow(overallStats) {
     const careerRow = document.createElement('tr');
     careerRow.className = 'career-row';
     careerRow.innerHTML = `
@@ -155,7 +395,7 @@ function displayDraftStatsTable(picksByYear, overallStats) {
             ${overallStats.worst_pick ? getValueIcon(overallStats.worst_pick.value_type, overallStats.worst_pick.value_diff) : '—'}
         </td>
     `;
-    tbody.appendChild(careerRow);
+    return careerRow;
 }
 
 function calculateYearStats(picks) {
@@ -184,6 +424,91 @@ function calculateYearStats(picks) {
     return { hits, misses, pushes, hitRate, bestPick, worstPick };
 }
 
+// League-wide draft cube (member x year x round x position), written by scripts/draft_cube.py.
+// The file is a uint32 header length, a JSON header, then 8-byte aligned little-endian arrays.
+const cubeArrayTypes = { uint8: Uint8Array, int16: Int16Array, float32: Float32Array };
+
+async function loadDraftCube() {
+    const response = await fetch('../data/draft_cube.bin');
+    if (!response.ok) throw new Error(`Failed to load draft cube: ${response.status}`);
+    const buffer = await response.arrayBuffer();
+    const headerLength = new DataView(buffer).getUint32(0, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 4, headerLength)));
+    const arrays = {};
+    Object.entries(header.arrays).forEach(([name, spec]) => {
+        const length = spec.shape.reduce((product, size) => product * size, 1);
+        arrays[name] = new cubeArrayTypes[spec.dtype](buffer, spec.offset, length);
+    });
+    return { ...header, arrays };
+}
+
+// Sum one measure over the cube, keeping the dimensions in `by` and only the labels in `where`,
+// e.g. sumDraftCube(cube, 'value_sum', ['year'], { position: ['RB'], round: [3, 4, 5] }).
+// Returns a flat array in row-major order over `by` (with a trailing value-class axis for counts).
+function sumDraftCube(cube, measure, by = [], where = {}) {
+    const dims = cube.dimensions;
+    const sizes = dims.map(dim => cube.labels[dim].length);
+    const allowed = dims.map(dim => where[dim] ? new Set(where[dim].map(label => cube.labels[dim].indexOf(label))) : null);
+    const classes = measure === 'counts' ? cube.value_types.length : 1;
+    const kept = dims.map((dim, axis) => by.includes(dim) ? axis : -1).filter(axis => axis >= 0);
+    const totals = new Float64Array(kept.reduce((product, axis) => product * sizes[axis], 1) * classes);
+    const values = cube.arrays[measure];
+    const index = new Array(dims.length).fill(0);
+    for (let cell = 0; cell < values.length / classes; cell++) {
+        let remainder = cell;
+        for (let axis = dims.length - 1; axis >= 0; axis--) {
+            index[axis] = remainder % sizes[axis];
+            remainder = Math.floor(remainder / sizes[axis]);
+        }
+        if (allowed.some((labels, axis) => labels && !labels.has(index[axis]))) continue;
+        const group = kept.reduce((offset, axis) => offset * sizes[axis] + index[axis], 0);
+        for (let k = 0; k < classes; k++) totals[group * classes + k] += values[cell * classes + k];
+    }
+    return totals;
+}
+
+// Every member's picks in the years this member drafted, for comparison with their career row
+function createLeagueRow(league) {
+    const row = document.createElement('tr');
+    row.className = 'league-row';
+    row.innerHTML = `
+        <td class="col-year">League</td>
+        <td>${league.picks}</td>
+        <td>${league.hits}</td>
+        <td>${league.misses}</td>
+        <td>${league.pushes}</td>
+        <td>${league.hit_rate.toFixed(1)}%</td>
+        <td colspan="5" class="pick-detail">All members, ${league.first_year === league.last_year ? league.first_year : `${league.first_year}–${league.last_year}`}</td>
+    `;
+    return row;
+}
+
+// Pages without a summary sum the league row from the draft cube
+async function displayLeagueRow(tbody, years) {
+    try {
+        const cube = await loadDraftCube();
+        years = years.filter(year => cube.labels.year.includes(year));
+        if (!years.length) return;
+        const counts = sumDraftCube(cube, 'counts', [], { year: years });
+        const count = type => counts[cube.value_types.indexOf(type)];
+        const hits = count('hit') + count('extreme_hit') + count('super_hit');
+        const misses = count('miss');
+        const pushes = count('push');
+        const graded = hits + misses + pushes;
+        tbody.appendChild(createLeagueRow({
+            picks: counts.reduce((total, value) => total + value, 0),
+            hits: hits,
+            misses: misses,
+            pushes: pushes,
+            hit_rate: graded > 0 ? hits / graded * 100 : 0,
+            first_year: Math.min(...years),
+            last_year: Math.max(...years)
+        }));
+    } catch (error) {
+        console.warn('League comparison unavailable:', error);
+    }
+}
+
 function displayDraftTendencies(profileData, playersData) {
     const container = document.getElementById('draft-tendencies-content');
     if (!container) return;
@@ -231,6 +556,50 @@ function displayDraftTendencies(profileData, playersData) {
         });
     }
     
+    renderTendencyInsights(container, insights);
+}
+
+// Summaries list their years; full profiles and bundles carry picks_by_year
+function hasDraftData(profileData) {
+    if (profileData.years) return profileData.years.length > 0;
+    return Object.keys(profileData.picks_by_year || {}).length > 0;
+}
+
+function displayPrecomputedTendencies(profileData) {
+    const container = document.getElementById('draft-tendencies-content');
+    if (!container) return;
+    
+    if (!hasDraftData(profileData)) {
+        container.innerHTML = '<p class="no-tendencies">No draft data available</p>';
+        return;
+    }
+    
+    const { franchise_player, theme_team, early_round_strategy } = profileData.tendencies;
+    const insights = [];
+    if (franchise_player) {
+        insights.push({
+            label: 'Franchise Player',
+            value: `${franchise_player.player_name} (${franchise_player.count}x)`,
+            years: franchise_player.years
+        });
+    }
+    if (theme_team) {
+        insights.push({
+            label: 'Theme Team',
+            value: `${theme_team.team} (${theme_team.percentage}%)`
+        });
+    }
+    if (early_round_strategy) {
+        insights.push({
+            label: 'Early Round Strategy',
+            value: `${early_round_strategy.position} (${early_round_strategy.percentage}% of rounds 1-3)`
+        });
+    }
+    
+    renderTendencyInsights(container, insights);
+}
+
+function renderTendencyInsights(container, insights) {
     if (insights.length === 0) {
         container.innerHTML = '<p class="no-tendencies">No significant tendencies found</p>';
         return;
@@ -256,6 +625,7 @@ function findFranchisePlayers(allPicks) {
         const playerId = pick.player_id;
         if (!playerCounts[playerId]) {
             playerCounts[playerId] = {
+                player_id: playerId,
                 player_name: pick.player_name,
                 count: 0,
                 years: []
@@ -410,13 +780,8 @@ async function displayDraftAchievements(profileData, playersData) {
         });
         
         // Sort years within each achievement type
-        Object.values(achievementsByType).forEach(achievement => {
+        const badges = Object.values(achievementsByType).map(achievement => {
             achievement.years.sort((a, b) => parseInt(b.year) - parseInt(a.year));
-        });
-        
-        let html = '<div class="achievements-grid">';
-        Object.values(achievementsByType).forEach(achievement => {
-            const yearsList = achievement.years.map(y => y.year).join(', ');
             
             // Build full tooltip with all years' details
             let fullDescription = '';
@@ -427,23 +792,57 @@ async function displayDraftAchievements(profileData, playersData) {
                 fullDescription = achievement.years.map(y => `${y.year}: ${y.description}`).join(' | ');
             }
             
-            html += `
-                <div class="achievement-badge" data-tooltip="${fullDescription.replace(/"/g, '&quot;')}">
-                    <span class="achievement-icon">${achievement.icon}</span>
-                    <span class="achievement-name">${achievement.name}</span>
-                    <span class="achievement-year">${yearsList}</span>
-                </div>
-            `;
+            return {
+                name: achievement.name,
+                icon: achievement.icon,
+                years: achievement.years.map(y => y.year),
+                description: fullDescription
+            };
         });
-        html += '</div>';
         
-        container.innerHTML = html;
+        renderAchievementBadges(container, badges);
     } catch (error) {
         console.error('Error displaying achievements:', error);
         container.innerHTML = '<p class="no-achievements">Error loading achievements</p>';
     }
 }
 
+function displayPrecomputedAchievements(profileData) {
+    const container = document.getElementById('achievements-content');
+    if (!container) {
+        console.warn('Achievements container not found');
+        return;
+    }
+    
+    if (!hasDraftData(profileData)) {
+        container.innerHTML = '<p class="no-achievements">No achievements available</p>';
+        return;
+    }
+    
+    if (profileData.achievements.length === 0) {
+        container.innerHTML = '<p class="no-achievements">No achievements earned yet</p>';
+        return;
+    }
+    
+    renderAchievementBadges(container, profileData.achievements);
+}
+
+function renderAchievementBadges(container, badges) {
+    let html = '<div class="achievements-grid">';
+    badges.forEach(achievement => {
+        html += `
+            <div class="achievement-badge" data-tooltip="${achievement.description.replace(/"/g, '&quot;')}">
+                <span class="achievement-icon">${achievement.icon}</span>
+                <span class="achievement-name">${achievement.name}</span>
+                <span class="achievement-year">${achievement.years.join(', ')}</span>
+            </div>
+        `;
+    });
+    html += '</div>';
+    
+    container.innerHTML = html;
+}
+
 async function calculateAchievements(allPicks, stats, playersData, picksByYear, leagueData) {
     const achievements = [];
     
@@ -0,0 +1,197 @@
+"""
+Benchmark the build scripts against synthetic leagues.
+Reports wall time, peak memory and throughput for each stage and compares
+the results against a stored baseline to catch performance regressions.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import calculate_profile_draft_stats
+import league_data
+import render_profiles
+import streaming_stats
+from synthetic_league import generate_league
+
+BASELINE_FILE = Path(__file__).parent / "benchmark_baseline.json"
+
+# name -> (members, years, rounds, ranked players per position)
+SCENARIOS = {
+    "small": (12, 5, 14, 60),
+    "expansion": (24, 5, 16, 120),
+    "backfill": (12, 20, 14, 120),
+}
+
+def stage_load_data(context):
+    """Cold-load every draft, season, player and league file."""
+    league_data.clear_cache()
+    league_data.preload()
+    return {"files": len(league_data.year_files(league_data.DRAFTS_DIR)) * 2 + 2}
+
+def stage_calculate(context):
+    """Load all data and calculate member stats."""
+    league_data.clear_cache()
+    context["member_stats"] = calculate_profile_draft_stats.calculate_member_stats()
+    return {"picks": sum(s["total_picks"] for s in context["member_stats"].values())}
+
+def stage_calculate_numpy(context):
+    """Load all data and calculate member stats with the vectorized engine."""
+    league_data.clear_cache()
+    from draft_value_engine import calculate_member_stats_vectorized
+    member_stats = calculate_member_stats_vectorized()
+    return {"picks": sum(s["total_picks"] for s in member_stats.values())}
+
+def stage_stream(context):
+    """Grade every pick in one streaming pass, keeping only per-member totals."""
+    league_data.clear_cache()
+    member_stats = streaming_stats.stream_member_stats()
+    return {"picks": sum(s["total_picks"] for s in member_stats.values())}
+
+def stage_insights(context):
+    """Precompute tendencies and achievements for every member."""
+    calculate_profile_draft_stats.add_member_insights(context["member_stats"])
+    return {"profiles": len(context["member_stats"])}
+
+def stage_profile_json(context):
+    """Write every member's profile JSON."""
+    # Start from an empty directory so unchanged files aren't skipped
+    shutil.rmtree("data/profiles", ignore_errors=True)
+    for member_name, stats in context["member_stats"].items():
+        calculate_profile_draft_stats.generate_profile_json(member_name, stats)
+    return {"profiles": len(context["member_stats"])}
+
+def stage_render_profiles(context):
+    """Render every profile page, biographies included."""
+    render_profiles.render_all()
+    return {"profiles": len(league_data.load_json(render_profiles.MEMBER_PAGES_FILE, {}))}
+
+STAGES = [
+    ("load_league_data", stage_load_data),
+    ("calculate_member_stats", stage_calculate),
+    ("calculate_member_stats_numpy", stage_calculate_numpy),
+    ("stream_member_stats", stage_stream),
+    ("add_member_insights", stage_insights),
+    ("generate_profile_json", stage_profile_json),
+    ("render_profiles", stage_render_profiles),
+]
+
+def numpy_available():
+    """Check whether the optional NumPy engine can be benchmarked."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def run_stage(stage, context, repeats):
+    """Run a stage, returning best-of-N wall time, peak memory and its counters."""
+    best = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeats):
+            start = time.perf_counter()
+            counters = stage(context)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        # Peak memory is measured on a separate run so tracing doesn't skew timings
+        tracemalloc.start()
+        stage(context)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    result = {"wall_time": best, "peak_memory": peak}
+    for name, count in counters.items():
+        result[name] = count
+        result[f"{name}_per_sec"] = count / best if best > 0 else 0
+    return result
+
+def run_scenario(name, members, years, rounds, ranked, repeats):
+    """Generate a synthetic league and benchmark every stage against it."""
+    results = {}
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix=f"sml-bench-{name}-") as league_dir:
+        generate_league(league_dir, members, years, rounds, ranked)
+        os.chdir(league_dir)
+        try:
+            context = {}
+            for stage_name, stage in STAGES:
+                if stage is stage_calculate_numpy and not numpy_available():
+                    continue
+                results[stage_name] = run_stage(stage, context, repeats)
+        finally:
+            os.chdir(previous_dir)
+    return results
+
+def format_result(result):
+    """Format one stage result as a report line."""
+    parts = [f"{result['wall_time'] * 1000:9.1f} ms", f"{result['peak_memory'] / 1024 / 1024:7.2f} MiB"]
+    for key in ["files_per_sec", "picks_per_sec", "profiles_per_sec"]:
+        if key in result:
+            parts.append(f"{result[key]:12,.0f} {key.replace('_per_sec', '')}/sec")
+    return " | ".join(parts)
+
+def compare_to_baseline(results, baseline, tolerance):
+    """List stages whose wall time or peak memory regressed past the tolerance."""
+    regressions = []
+    for scenario, stages in results.items():
+        for stage_name, result in stages.items():
+            previous = baseline.get(scenario, {}).get(stage_name)
+            if not previous:
+                continue
+            for metric in ["wall_time", "peak_memory"]:
+                if previous[metric] and result[metric] > previous[metric] * (1 + tolerance):
+                    change = (result[metric] / previous[metric] - 1) * 100
+                    regressions.append(f"{scenario}/{stage_name} {metric} +{change:.0f}%")
+    return regressions
+
+def main():
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description="Benchmark the build scripts against synthetic leagues.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (default: all)")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown or memory growth before a stage counts as a regression")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.scenario or list(SCENARIOS):
+        members, years, rounds, ranked = SCENARIOS[name]
+        print(f"\n⏱️  {name}: {members} members, {years} years, {rounds} rounds, {ranked} ranked/position")
+        results[name] = run_scenario(name, members, years, rounds, ranked, args.repeats)
+        for stage_name, result in results[name].items():
+            print(f"  {stage_name:<30} {format_result(result)}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Saved baseline to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print("\n✗ Regressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\n✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Build a deployable copy of the site in dist/.
+Every page, stylesheet, script and data file the site loads is minified
+(binary data such as the draft cube is copied unchanged) and written with
+a .gz sibling for servers that serve precompressed files.
+Stylesheets, scripts and data files that are loaded from a fixed URL are
+renamed with a hash of their content and every reference to them (HTML
+attributes, fetch() URLs and the year files a summary lists) is rewritten,
+so they can be cached indefinitely. Pages and files fetched from URLs built at
+runtime keep their names. Prints a size report when done.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import posixpath
+import re
+import shutil
+from pathlib import Path
+
+import build_profiler
+
+OUTPUT_DIR = Path("dist")
+ASSET_MANIFEST = "asset-manifest.json"
+HASH_LENGTH = 10
+# Smaller files aren't worth a .gz sibling
+GZIP_MIN_BYTES = 512
+
+PAGES = ["index.html", "profiles/*.html"]
+ASSETS = ["styles.css", "script.js", "profiles/profile.css", "profiles/draft-stats.js"]
+DATA = [
+    "data/players.json",
+    "data/team_index.json",
+    "data/league_database.json",
+    "data/profiles/*.json",
+    "data/bundles/*.json",
+    "data/shards/*/*.json",
+    "data/draft_cube.bin",
+]
+# Build bookkeeping that matches the data patterns but isn't part of the site
+EXCLUDE = {"data/bundles/manifest.json"}
+
+# References to other files: HTML attributes, fetch() string literals and CSS url()s
+HTML_REFERENCE = re.compile(r'''((?:href|src|data-bundle|data-summary)=")([^"#?]+)(")''')
+JS_REFERENCE = re.compile(r'''(fetch\(\s*(['"]))([^'"`$]+)(\2)''')
+CSS_REFERENCE = re.compile(r'''(url\(\s*(['"]?))((?!data:)[^'")]+)(\2\s*\))''')
+
+CSS_STRING = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+CSS_STRING_OR_COMMENT = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/''', re.DOTALL)
+HTML_COMMENT = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+HTML_RAW_BLOCK = re.compile(r"(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2>)", re.DOTALL | re.IGNORECASE)
+
+# A / after one of these (or at the start) begins a regex literal rather than a division
+REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "void", "yield", "await"}
+
+def minify_css(text):
+    """Drop comments and the whitespace CSS doesn't need (strings are left alone)."""
+    text = CSS_STRING_OR_COMMENT.sub(lambda match: match.group(1) or "", text)
+    minified = []
+    # Odd pieces are the strings the split kept
+    for index, part in enumerate(CSS_STRING.split(text)):
+        if index % 2 == 0:
+            part = re.sub(r"\s+", " ", part)
+            part = re.sub(r"\s*([{};,>])\s*", r"\1", part)
+            part = re.sub(r":\s+", ":", part)
+        minified.append(part)
+    return re.sub(r";}", "}", "".join(minified)).strip()
+
+def _scan_js(text):
+    """Split JavaScript into ("code" | "literal", text) pieces, dropping comments.
+
+    Strings, template literals and regex literals are literal pieces; the
+    code inside a template's ${...} is scanned as code.
+    """
+    pieces = []
+    code = []
+    # One entry per open template literal: the brace depth of its ${...}
+    templates = []
+    depth = 0
+    last_significant = ""
+    i, n = 0, len(text)
+
+    def flush():
+        if code:
+            pieces.append(("code", "".join(code)))
+            code.clear()
+
+    def scan_template(start):
+        """Scan template text from start to the closing backtick or a ${; returns the end index."""
+        j = start
+        while j < n:
+            if text[j] == "\\":
+                j += 2
+            elif text[j] == "`":
+                return j + 1, True
+            elif text.startswith("${", j):
+                return j + 2, False
+            else:
+                j += 1
+        return n, True
+
+    while i < n:
+        char = text[i]
+        if text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end == -1 else end
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            code.append(" ")
+        elif char in "'\"":
+            j = i + 1
+            while j < n and text[j] != char and text[j] != "\n":
+                j += 2 if text[j] == "\\" else 1
+            flush()
+            pieces.append(("literal", text[i:j + 1]))
+            i = j + 1
+            last_significant = char
+        elif char == "`" or (char == "}" and templates and templates[-1] == depth):
+            if char == "}":
+                templates.pop()
+            end, closed = scan_template(i + 1)
+            flush()
+            pieces.append(("literal", text[i:end]))
+            if not closed:
+                templates.append(depth)
+            i = end
+            last_significant = "`"
+        elif char == "/" and (last_significant in REGEX_PRECEDERS or not last_significant
+                              or re.search(r"\b(?:%s)$" % "|".join(REGEX_KEYWORDS), "".join(code).rstrip())):
+            j, in_class = i + 1, False
+            while j < n and (in_class or text[j] != "/") and text[j] != "\n":
+                if text[j] == "\\":
+                    j += 1
+                elif text[j] == "[":
+                    in_class = True
+                elif text[j] == "]":
+                    in_class = False
+                j += 1
+            j += 1
+            while j < n and text[j].isalpha():
+                j += 1
+            flush()
+            pieces.append(("literal", text[i:j]))
+            i = j
+            last_significant = "/"
+        else:
+            if char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+            if not char.isspace():
+                last_significant = char
+            code.append(char)
+            i += 1
+    flush()
+    return pieces
+
+def minify_js(text):
+    """Drop comments, indentation and blank lines; line breaks are kept so semicolon insertion is unchanged."""
+    minified = []
+    for kind, piece in _scan_js(text):
+        if kind == "literal":
+            minified.append(piece)
+            continue
+        piece = re.sub(r"[ \t]+", " ", piece)
+        piece = re.sub(r" ?\n[\s]*", "\n", piece)
+        minified.append(piece)
+    return re.sub(r"\n{2,}", "\n", "".join(minified)).strip()
+
+def minify_json(text):
+    """Re-serialize JSON without indentation or spaces."""
+    return json.dumps(json.loads(text), separators=(",", ":"), ensure_ascii=False)
+
+def minify_html(text):
+    """Drop comments, indentation and blank lines; inline scripts and styles are minified, pre and textarea kept."""
+    blocks = []
+
+    def stash(match):
+        tag = match.group(2).lower()
+        body = match.group(3)
+        if tag == "script" and "src=" not in match.group(1):
+            body = minify_js(body)
+        elif tag == "style":
+            body = minify_css(body)
+        blocks.append(match.group(1) + body + match.group(4))
+        return f"\0{len(blocks) - 1}\0"
+
+    text = HTML_RAW_BLOCK.sub(stash, HTML_COMMENT.sub("", text))
+    lines = (line.strip() for line in text.splitlines())
+    text = "\n".join(line for line in lines if line)
+    return re.sub(r"\0(\d+)\0", lambda match: blocks[int(match.group(1))], text)
+
+MINIFIERS = {".css": minify_css, ".js": minify_js, ".json": minify_json, ".html": minify_html}
+
+def collect_sources(patterns):
+    """Expand site-relative glob patterns to sorted POSIX paths."""
+    paths = []
+    for pattern in patterns:
+        paths += sorted(path.as_posix() for path in Path(".").glob(pattern)
+                        if path.is_file() and path.as_posix() not in EXCLUDE)
+    return paths
+
+def as_bytes(content):
+    """Minified text as UTF-8; binary files are already bytes."""
+    return content if isinstance(content, bytes) else content.encode("utf-8")
+
+def hashed_name(path, content):
+    """name.ext -> name.<hash>.ext"""
+    digest = hashlib.sha256(as_bytes(content)).hexdigest()[:HASH_LENGTH]
+    stem, ext = posixpath.splitext(path)
+    return f"{stem}.{digest}{ext}"
+
+def rewrite_references(path, content, renamed):
+    """Point a file's references to other site files at their hashed names."""
+    base = posixpath.dirname(path)
+
+    def replace(prefix, url, suffix):
+        target = posixpath.normpath(posixpath.join(base, url))
+        if target not in renamed:
+            return None
+        build_profiler.count("references_rewritten")
+        return prefix + posixpath.relpath(renamed[target], base or ".") + suffix
+
+    ext = posixpath.splitext(path)[1]
+    if ext == ".html":
+        return HTML_REFERENCE.sub(lambda m: replace(m.group(1), m.group(2), m.group(3)) or m.group(0), content)
+    if ext == ".js":
+        return JS_REFERENCE.sub(lambda m: replace(m.group(1), m.group(3), m.group(4)) or m.group(0), content)
+    if ext == ".css":
+        return CSS_REFERENCE.sub(lambda m: replace(m.group(1), m.group(3), m.group(4)) or m.group(0), content)
+    if path.endswith("/summary.json"):
+        # A shard summary lists its year files relative to itself
+        summary = json.loads(content)
+        for year in summary.get("years", []):
+            target = posixpath.join(base, year["file"])
+            if target in renamed:
+                year["file"] = posixpath.basename(renamed[target])
+                build_profiler.count("references_rewritten")
+        return json.dumps(summary, separators=(",", ":"), ensure_ascii=False)
+    return content
+
+def fixed_url_files(minified):
+    """Files some other file references by a fixed URL, which makes them safe to rename."""
+    referenced = set()
+    for path, content in minified.items():
+        base = posixpath.dirname(path)
+        ext = posixpath.splitext(path)[1]
+        if ext == ".html":
+            urls = [match.group(2) for match in HTML_REFERENCE.finditer(content)]
+        elif ext == ".js":
+            urls = [match.group(3) for match in JS_REFERENCE.finditer(content)]
+        elif ext == ".css":
+            urls = [match.group(3) for match in CSS_REFERENCE.finditer(content)]
+        elif path.endswith("/summary.json"):
+            urls = [year["file"] for year in json.loads(content).get("years", [])]
+        else:
+            urls = []
+        referenced.update(posixpath.normpath(posixpath.join(base, url)) for url in urls)
+    return referenced & set(minified)
+
+def build_order(paths):
+    """Files that reference others come after the files they reference."""
+    rank = {".json": 0, ".css": 1, ".js": 2, ".html": 3}
+    return sorted(paths, key=lambda path: (rank.get(posixpath.splitext(path)[1], 0),
+                                           path.endswith("/summary.json"), path))
+
+def build_assets(output_dir=OUTPUT_DIR):
+    """Minify, hash, compress and write the site to output_dir; returns the asset manifest."""
+    sources = collect_sources(PAGES) + collect_sources(ASSETS) + collect_sources(DATA)
+    minified, source_sizes = {}, {}
+    for path in sources:
+        raw = Path(path).read_bytes()
+        build_profiler.count_file_read(path)
+        source_sizes[path] = len(raw)
+        # Binary data (the draft cube) has no minifier and is copied as is
+        minifier = MINIFIERS.get(posixpath.splitext(path)[1])
+        with build_profiler.stage("minify"):
+            minified[path] = minifier(raw.decode("utf-8")) if minifier else raw
+
+    pages = set(collect_sources(PAGES))
+    renamable = fixed_url_files(minified) - pages
+    renamed, outputs = {}, {}
+    with build_profiler.stage("hash_assets"):
+        for path in build_order(sources):
+            content = rewrite_references(path, minified[path], renamed)
+            if path in renamable:
+                renamed[path] = hashed_name(path, content)
+            outputs[path] = (renamed.get(path, path), content)
+
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    manifest = {}
+    for path, (output, content) in sorted(outputs.items()):
+        data = as_bytes(content)
+        target = output_dir / output
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with build_profiler.stage("write_assets"):
+            target.write_bytes(data)
+        entry = {"file": output, "source_bytes": source_sizes[path], "bytes": len(data), "gzip_bytes": None}
+        if len(data) >= GZIP_MIN_BYTES:
+            with build_profiler.stage("compress"):
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            target.with_name(target.name + ".gz").write_bytes(compressed)
+            entry["gzip_bytes"] = len(compressed)
+        build_profiler.count("bytes_written", len(data))
+        manifest[path] = entry
+
+    with open(output_dir / ASSET_MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def size_report(manifest):
+    """Source, minified and gzipped totals per file type, plus the largest files."""
+    kib = lambda size: f"{size / 1024:8.1f} KiB"
+    totals = {}
+    for path, entry in manifest.items():
+        ext = posixpath.splitext(path)[1].lstrip(".")
+        total = totals.setdefault(ext, [0, 0, 0, 0])
+        total[0] += 1
+        total[1] += entry["source_bytes"]
+        total[2] += entry["bytes"]
+        total[3] += entry["gzip_bytes"] or entry["bytes"]
+    totals["total"] = [sum(total[i] for total in totals.values()) for i in range(4)]
+
+    lines = [f"{'':6} {'files':>5} {'source':>12} {'minified':>12} {'gzip':>12} {'saved':>6}"]
+    for ext, (files, source, minified, compressed) in totals.items():
+        saved = (1 - compressed / source) * 100 if source else 0
+        lines.append(f"{ext:6} {files:5} {kib(source)} {kib(minified)} {kib(compressed)} {saved:5.1f}%")
+
+    lines.append("\nLargest files:")
+    largest = sorted(manifest.items(), key=lambda item: item[1]["source_bytes"], reverse=True)[:5]
+    for path, entry in largest:
+        lines.append(f"  {entry['file']:48} {kib(entry['source_bytes'])} -> {kib(entry['gzip_bytes'] or entry['bytes'])}")
+    return "\n".join(lines)
+
+def main():
+    """Build dist/ and print the size report."""
+    parser = argparse.ArgumentParser(description="Minify, precompress and content-hash the site into dist/.")
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR, help="output directory (default: dist)")
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("build_assets", args)
+
+    manifest = build_assets(args.output)
+    hashed = sum(1 for path, entry in manifest.items() if entry["file"] != path)
+    print(f"✓ Built {len(manifest)} files into {args.output}/ ({hashed} content-hashed)")
+    print(size_report(manifest))
+
+    build_profiler.finish()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Build one slim data bundle per member profile page.
+Each bundle holds the member's compact profile JSON plus only the players they
+drafted and their own standings rows and playoff entries, so a profile page
+fetches a single small file instead of players.json and the league database.
+"""
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+import build_profiler
+from calculate_profile_draft_stats import profile_json_path
+from league_data import load_json, thaw
+from profile_format import compact_profile, load_profile
+from profile_insights import calculate_insights
+
+BUNDLES_DIR = Path("data/bundles")
+BUNDLE_MANIFEST = BUNDLES_DIR / "manifest.json"
+MEMBER_PAGES_FILE = Path("data/member_pages.json")
+
+# Profile JSON keys the profile page reads; the rest stays out of the bundle
+PAGE_PROFILE_KEYS = ["member", "draft_stats", "picks_by_year", "top_10_best_picks", "top_10_worst_picks",
+                     "tendencies", "achievements"]
+
+def slim_players(profile_data, players_data):
+    """Keep only the players a member drafted, with teams for the years they were drafted."""
+    drafted_years = {}
+    for year, picks in profile_data.get("picks_by_year", {}).items():
+        for pick in picks:
+            drafted_years.setdefault(pick["player_id"], set()).add(str(year))
+
+    players = {}
+    for player_id, years in sorted(drafted_years.items()):
+        player = players_data.get("players", {}).get(player_id)
+        if not player:
+            continue
+        positions = player.get("positions", [])
+        teams_by_year = player.get("teams_by_year") or {}
+        players[player_id] = {
+            "name": player.get("name"),
+            "position": positions[0] if positions else None,
+            "teams_by_year": {year: teams_by_year[year] for year in sorted(years) if year in teams_by_year}
+        }
+    return players
+
+def involves_member(entry, alias):
+    """Check whether a playoff entry (or bracket result) mentions the member."""
+    if isinstance(entry, dict):
+        return any(involves_member(value, alias) for value in entry.values())
+    if isinstance(entry, list):
+        return any(involves_member(value, alias) for value in entry)
+    return entry == alias
+
+def slim_league(league_data, alias):
+    """Keep only the member's standings rows, playoff entries and member record."""
+    seasons = {}
+    for year, season in league_data.get("seasons", {}).items():
+        rows = [row for row in season.get("standings", []) if row.get("owner_alias") == alias]
+        if rows:
+            seasons[year] = {"standings": rows}
+
+    playoffs = {
+        year: playoff for year, playoff in league_data.get("playoffs", {}).items()
+        if involves_member(playoff, alias)
+    }
+
+    member = league_data.get("members", {}).get(alias)
+    return {
+        "seasons": seasons,
+        "playoffs": playoffs,
+        "members": {alias: member} if member else {}
+    }
+
+def build_bundle(alias, players_data, league_data):
+    """Build one member's bundle, or None if they have no profile JSON."""
+    with build_profiler.stage("load_profile_json"):
+        profile_data = load_profile(profile_json_path(alias))
+    if profile_data is None:
+        return None
+
+    if "achievements" not in profile_data:
+        with build_profiler.stage("calculate_insights"):
+            profile_data["tendencies"], profile_data["achievements"] = calculate_insights(
+                profile_data, players_data, league_data, alias
+            )
+
+    with build_profiler.stage("slice_data"):
+        bundle = compact_profile({key: profile_data[key] for key in PAGE_PROFILE_KEYS if key in profile_data})
+        bundle["alias"] = alias
+        bundle["players"] = slim_players(profile_data, players_data)
+        bundle["league"] = slim_league(league_data, alias)
+    return bundle
+
+def write_bundle(alias, bundle):
+    """Write a bundle as compact JSON unless unchanged; returns its manifest entry and whether it was written."""
+    with build_profiler.stage("serialize_json"):
+        content = json.dumps(bundle, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    output_file = BUNDLES_DIR / f"{alias}.json"
+    written = False
+    with build_profiler.stage("write_json"):
+        if not output_file.exists() or output_file.read_bytes() != content:
+            output_file.write_bytes(content)
+            written = True
+    if written:
+        build_profiler.count("bytes_written", len(content))
+
+    entry = {
+        "file": output_file.as_posix(),
+        "bytes": len(content),
+        "sha256": hashlib.sha256(content).hexdigest()
+    }
+    return entry, written
+
+def build_all(aliases=None):
+    """Build bundles for every member page (or only the given aliases) and update the manifest."""
+    member_pages = load_json(MEMBER_PAGES_FILE, {})
+    players_data = load_json("data/players.json", {})
+    league_data = load_json("data/league_database.json", {})
+    manifest = thaw(load_json(BUNDLE_MANIFEST, {})) if aliases else {}
+
+    BUNDLES_DIR.mkdir(parents=True, exist_ok=True)
+    written = []
+    for alias in aliases or sorted(member_pages):
+        bundle = build_bundle(alias, players_data, league_data)
+        if bundle is None:
+            print(f"  ⚠️  {alias}: no profile JSON, skipping")
+            manifest.pop(alias, None)
+            continue
+        manifest[alias], was_written = write_bundle(alias, bundle)
+        if was_written:
+            written.append(alias)
+        build_profiler.count("bundles_built")
+
+    with open(BUNDLE_MANIFEST, 'w') as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2)
+    return manifest, written
+
+def main():
+    """Build per-member profile bundles."""
+    parser = argparse.ArgumentParser(description="Build one slim data bundle per member profile page.")
+    parser.add_argument("members", nargs="*", help="member aliases to bundle (default: all)")
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("build_bundles", args)
+
+    manifest, written = build_all(args.members)
+    total = sum(entry["bytes"] for entry in manifest.values())
+    print(f"✓ Built {len(manifest)} bundles ({total / 1024:.1f} KiB), {len(written)} changed")
+    for alias in written:
+        print(f"  ✓ {manifest[alias]['file']} ({manifest[alias]['bytes'] / 1024:.1f} KiB)")
+
+    build_profiler.finish()
+
+if __name__ == "__main__":
+    main()
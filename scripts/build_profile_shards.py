@@ -0,0 +1,276 @@
+"""
+Split each member's profile data into a summary plus one shard per draft year.
+The summary holds everything a profile page draws on first paint (career
+totals, per-year table rows, the league row over the member's draft years,
+tendencies and achievements) and lists the
+member's year shards with their sizes and hashes; a year's picks are only
+fetched when the visitor expands that year.
+
+Shards are written straight from the streaming stats engine: each draft
+year is graded once and its picks go to the members' year shards before
+the next year is read.
+"""
+
+import argparse
+import hashlib
+import json
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import build_profiler
+import league_data
+import member_registry
+from calculate_profile_draft_stats import (
+    DEFAULT_RANKING,
+    draft_stats_summary,
+    generate_profile_json,
+    load_build_manifest,
+    manifest_record,
+    profile_json_path,
+)
+from league_data import load_json, thaw
+from profile_format import compact_profile, expand_picks
+from profile_insights import HIT_TYPES, calculate_insights
+from streaming_stats import stream_member_stats
+
+SHARDS_DIR = Path("data/shards")
+SHARD_MANIFEST = SHARDS_DIR / "manifest.json"
+MEMBER_PAGES_FILE = Path("data/member_pages.json")
+
+# Pick fields the per-year table rows show for a year's best and worst pick
+TABLE_PICK_KEYS = ["player_name", "draft_pos", "season_finish", "value_type", "value_diff"]
+
+def table_pick(pick):
+    """Keep only the fields a year row shows for a pick."""
+    return {key: pick[key] for key in TABLE_PICK_KEYS} if pick else None
+
+def year_summary(picks):
+    """Summarize one year's picks the way the profile page's year rows do."""
+    hits = misses = pushes = 0
+    best_pick = worst_pick = None
+    for pick in picks:
+        value_diff = pick["value_diff"]
+        if pick["value_type"] in HIT_TYPES:
+            hits += 1
+            if best_pick is None or (value_diff and value_diff > (best_pick["value_diff"] or 0)):
+                best_pick = pick
+        elif pick["value_type"] == "miss":
+            misses += 1
+            if worst_pick is None or (value_diff and value_diff < (worst_pick["value_diff"] or 0)):
+                worst_pick = pick
+        elif pick["value_type"] == "push":
+            pushes += 1
+
+    total = hits + misses + pushes
+    return {
+        "picks": len(picks),
+        "hits": hits,
+        "misses": misses,
+        "pushes": pushes,
+        "hit_rate": (hits / total * 100) if total > 0 else 0,
+        "best_pick": table_pick(best_pick),
+        "worst_pick": table_pick(worst_pick)
+    }
+
+def league_row(league_counts, years):
+    """Every member's picks in the given draft years, summarized like a year row."""
+    counts = Counter()
+    for year in years:
+        counts.update(league_counts.get(year, {}))
+    hits = sum(counts[value_type] for value_type in HIT_TYPES)
+    graded = hits + counts["miss"] + counts["push"]
+    return {
+        "picks": sum(counts.values()),
+        "hits": hits,
+        "misses": counts["miss"],
+        "pushes": counts["push"],
+        "hit_rate": (hits / graded * 100) if graded > 0 else 0,
+        "first_year": min(years),
+        "last_year": max(years)
+    }
+
+def encode(data):
+    """Serialize shard data as compact UTF-8 JSON."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def write_shard(path, content):
+    """Write a shard unless unchanged; returns its manifest entry and whether it was written."""
+    written = False
+    with build_profiler.stage("write_json"):
+        if not path.exists() or path.read_bytes() != content:
+            path.write_bytes(content)
+            written = True
+    if written:
+        build_profiler.count("bytes_written", len(content))
+    entry = {
+        "file": path.as_posix(),
+        "bytes": len(content),
+        "sha256": hashlib.sha256(content).hexdigest()
+    }
+    return entry, written
+
+class ShardWriter:
+    """Write year shards as a streaming build hands over each year's picks.
+
+    Pass it as stream_member_stats()'s on_year callback. Only each member's
+    shard entries and year table rows are kept, so the league's picks are
+    never all in memory; finish() then writes a member's summary. Pass
+    league_counts too, so the summary's league row covers every member.
+    """
+
+    def __init__(self):
+        self.years = defaultdict(dict)
+        self.rows = defaultdict(list)
+        self.league_counts = {}
+        self.written = []
+
+    def __call__(self, year, shard):
+        for alias, picks in shard.items():
+            member_dir = SHARDS_DIR / alias
+            member_dir.mkdir(parents=True, exist_ok=True)
+            with build_profiler.stage("slice_data"):
+                content = compact_profile({
+                    "member": member_registry.member_name(alias),
+                    "draft_stats": {},
+                    "picks_by_year": {year: picks}
+                })
+                content["alias"] = alias
+                content["year"] = int(year)
+            with build_profiler.stage("serialize_json"):
+                content = encode(content)
+            entry, was_written = write_shard(member_dir / f"{year}.json", content)
+            if was_written:
+                self.written.append(entry["file"])
+            self.years[alias][str(year)] = entry
+            build_profiler.count("shards_built")
+            self.rows[alias].append(dict(year_summary(picks), year=int(year), file=f"{year}.json",
+                                         bytes=entry["bytes"], sha256=entry["sha256"]))
+
+    def member_stats(self, alias, totals):
+        """A member's full stats: their streamed totals plus the picks read back from their year shards."""
+        stats = dict(totals, picks_by_year={}, picks_by_position=defaultdict(list))
+        for year, entry in self.years[alias].items():
+            with build_profiler.stage("load_json"):
+                picks = expand_picks(league_data.read_json(Path(entry["file"])))
+            stats["picks_by_year"][int(year)] = picks
+            for pick in picks:
+                stats["picks_by_position"][pick["position"]].append(pick)
+        return stats
+
+    def finish(self, alias, stats):
+        """Write a member's summary and drop their stale year shards; returns their manifest entry."""
+        member_dir = SHARDS_DIR / alias
+        years = dict(sorted(self.years[alias].items(), key=lambda item: int(item[0]), reverse=True))
+        for stale in member_dir.glob("*.json"):
+            if stale.stem not in years and stale.name != "summary.json":
+                stale.unlink()
+                self.written.append(stale.as_posix())
+
+        draft_stats = draft_stats_summary(stats)
+        summary = {
+            "alias": alias,
+            "member": member_registry.member_name(alias),
+            "draft_stats": dict(draft_stats, best_pick=table_pick(draft_stats["best_pick"]),
+                                worst_pick=table_pick(draft_stats["worst_pick"])),
+            "years": sorted(self.rows[alias], key=lambda row: row["year"], reverse=True),
+            "league": league_row(self.league_counts, [int(year) for year in years]) if years else None,
+            "tendencies": stats["tendencies"],
+            "achievements": stats["achievements"]
+        }
+        with build_profiler.stage("serialize_json"):
+            content = encode(summary)
+        summary_entry, was_written = write_shard(member_dir / "summary.json", content)
+        if was_written:
+            self.written.append(summary_entry["file"])
+        return {"summary": summary_entry, "years": years}
+
+def save_shard_manifest(manifest):
+    """Write the shard manifest, members in alias order."""
+    with open(SHARD_MANIFEST, 'w') as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2)
+
+def build_all(aliases=None, ranking=None):
+    """Build shards for every member page (or only the given aliases) and update the manifest.
+
+    The drafts are streamed once, writing each year's shards as it is graded;
+    tendencies and achievements come precomputed from the profile JSON.
+    ranking defaults to the one the profile JSON was last built with.
+    """
+    member_pages = load_json(MEMBER_PAGES_FILE, {})
+    manifest = thaw(load_json(SHARD_MANIFEST, {})) if aliases else {}
+    aliases = aliases or sorted(member_pages)
+    profiles = {alias: profile_json_path(alias) for alias in aliases if profile_json_path(alias).exists()}
+    if ranking is None:
+        ranking = (load_build_manifest() or {}).get("ranking", DEFAULT_RANKING)
+
+    SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+    writer = ShardWriter()
+    member_stats = stream_member_stats(set(profiles), on_year=writer, ranking=ranking,
+                                       league_counts=writer.league_counts)
+    players_data = league_data.players()
+    league = league_data.league_database()
+    for alias in aliases:
+        if alias not in member_stats:
+            print(f"  ⚠️  {alias}: no profile JSON, skipping")
+            manifest.pop(alias, None)
+            continue
+        with build_profiler.stage("load_profile_json"):
+            profile_data = load_json(profiles[alias])
+        stats = dict(member_stats[alias], tendencies=profile_data.get("tendencies"),
+                     achievements=profile_data.get("achievements"))
+        if stats["achievements"] is None:
+            stats = writer.member_stats(alias, member_stats[alias])
+            with build_profiler.stage("calculate_insights"):
+                stats["tendencies"], stats["achievements"] = calculate_insights(stats, players_data, league, alias)
+        manifest[alias] = writer.finish(alias, stats)
+
+    save_shard_manifest(manifest)
+    return manifest, writer.written
+
+def stream_profiles(owners=None, ranking=DEFAULT_RANKING, output_format="compact"):
+    """Build profile JSON and shards for all members (or the given owners) in one streaming pass.
+
+    Year shards are written as each draft year is graded; each member's
+    profile is then assembled from their own shards, one member at a time.
+    Returns the members' summary stats, their build manifest records and
+    (output file, written) per member.
+    """
+    SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+    writer = ShardWriter()
+    member_stats = stream_member_stats(owners, on_year=writer, ranking=ranking,
+                                       league_counts=writer.league_counts)
+    players_data = league_data.players()
+    league = league_data.league_database()
+    manifest = thaw(load_json(SHARD_MANIFEST, {}))
+    records, outputs = {}, {}
+    for alias, totals in member_stats.items():
+        stats = writer.member_stats(alias, totals)
+        with build_profiler.stage("calculate_insights"):
+            stats["tendencies"], stats["achievements"] = calculate_insights(stats, players_data, league, alias)
+        totals["tendencies"], totals["achievements"] = stats["tendencies"], stats["achievements"]
+        outputs[alias] = generate_profile_json(alias, stats, output_format)
+        records[alias] = manifest_record(alias, stats)
+        manifest[alias] = writer.finish(alias, stats)
+    save_shard_manifest(manifest)
+    return member_stats, records, outputs
+
+def main():
+    """Build per-member summaries and year shards."""
+    parser = argparse.ArgumentParser(description="Split member profile data into a summary and one shard per draft year.")
+    parser.add_argument("members", nargs="*", help="member aliases to shard (default: all)")
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("build_profile_shards", args)
+
+    manifest, written = build_all(args.members)
+    summaries = sum(entry["summary"]["bytes"] for entry in manifest.values())
+    shards = sum(len(entry["years"]) for entry in manifest.values())
+    print(f"✓ Built {len(manifest)} summaries ({summaries / 1024:.1f} KiB) and {shards} year shards, "
+          f"{len(written)} files changed")
+    for path in written:
+        print(f"  ✓ {path}")
+
+    build_profiler.finish()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Opt-in stage timing and counters for the build scripts.
+Enable with --profile (or the SML_PROFILE environment variable) to write a
+JSON report of per-stage timings and counters, and with --profile-stage
+(or SML_PROFILE_STAGE) to dump a cProfile of one hot stage.
+"""
+
+import cProfile
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+_state = {
+    "enabled": False,
+    "script": None,
+    "report_path": None,
+    "stages": {},
+    "counters": {},
+    "cprofile_stage": None,
+    "cprofile": None,
+    "started": None
+}
+
+def add_arguments(parser):
+    """Add the --profile and --profile-stage options to an argument parser."""
+    parser.add_argument("--profile", nargs="?", const="", default=None, metavar="REPORT",
+                        help="record stage timings and counters to a JSON report (default: <script>_profile.json)")
+    parser.add_argument("--profile-stage", default=None, metavar="STAGE",
+                        help="also dump a cProfile of one stage to <script>_<stage>.prof")
+
+def setup(script_name, args=None):
+    """Enable profiling from parsed arguments or the SML_PROFILE environment variables."""
+    report = getattr(args, "profile", None)
+    if report is None:
+        report = os.environ.get("SML_PROFILE")
+        if report in ("1", "true", "yes"):
+            report = ""
+    cprofile_stage = getattr(args, "profile_stage", None) or os.environ.get("SML_PROFILE_STAGE")
+
+    if report is None and cprofile_stage is None:
+        return
+
+    _state.update({
+        "enabled": True,
+        "script": script_name,
+        "report_path": Path(report or f"{script_name}_profile.json"),
+        "stages": {},
+        "counters": {},
+        "cprofile_stage": cprofile_stage,
+        "cprofile": cProfile.Profile() if cprofile_stage else None,
+        "started": time.perf_counter()
+    })
+
+def enable_worker(is_enabled):
+    """Turn recording on in a worker process; results are sent back with take_snapshot()."""
+    _state.update({"enabled": is_enabled, "stages": {}, "counters": {}, "cprofile": None})
+
+def take_snapshot():
+    """Return and reset the stages and counters recorded so far."""
+    snapshot = {"stages": _state["stages"], "counters": _state["counters"]}
+    _state["stages"] = {}
+    _state["counters"] = {}
+    return snapshot
+
+def merge(snapshot):
+    """Fold stages and counters recorded in a worker process into this one."""
+    if not _state["enabled"] or not snapshot:
+        return
+    for name, record in snapshot["stages"].items():
+        merged = _state["stages"].setdefault(name, {"seconds": 0.0, "calls": 0})
+        merged["seconds"] += record["seconds"]
+        merged["calls"] += record["calls"]
+    for name, amount in snapshot["counters"].items():
+        count(name, amount)
+
+def enabled():
+    """Check whether profiling is turned on."""
+    return _state["enabled"]
+
+@contextmanager
+def stage(name):
+    """Time a named stage; repeated entries accumulate."""
+    if not _state["enabled"]:
+        yield
+        return
+
+    profiler = _state["cprofile"] if name == _state["cprofile_stage"] else None
+    if profiler:
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiler:
+            profiler.disable()
+        record = _state["stages"].setdefault(name, {"seconds": 0.0, "calls": 0})
+        record["seconds"] += elapsed
+        record["calls"] += 1
+
+def count(name, amount=1):
+    """Add to a named counter."""
+    if _state["enabled"]:
+        _state["counters"][name] = _state["counters"].get(name, 0) + amount
+
+def count_file_read(path):
+    """Count the size of a file that was read as bytes_read."""
+    if _state["enabled"]:
+        count("files_read")
+        count("bytes_read", Path(path).stat().st_size)
+
+def report():
+    """Build the report dictionary for the current run."""
+    total = time.perf_counter() - _state["started"]
+    return {
+        "script": _state["script"],
+        "total_seconds": round(total, 6),
+        "stages": {
+            name: {"seconds": round(record["seconds"], 6), "calls": record["calls"]}
+            for name, record in sorted(_state["stages"].items(), key=lambda item: -item[1]["seconds"])
+        },
+        "counters": dict(sorted(_state["counters"].items()))
+    }
+
+def finish():
+    """Write the JSON report (and cProfile dump) if profiling is on."""
+    if not _state["enabled"]:
+        return
+
+    with open(_state["report_path"], 'w') as f:
+        json.dump(report(), f, indent=2)
+    print(f"\n⏱️  Profile report written to {_state['report_path']}")
+
+    if _state["cprofile"]:
+        stage_name = _state["cprofile_stage"]
+        if stage_name in _state["stages"]:
+            dump_path = f"{_state['script']}_{stage_name}.prof"
+            _state["cprofile"].dump_stats(dump_path)
+            print(f"⏱️  cProfile of stage '{stage_name}' written to {dump_path}")
+        else:
+            print(f"⚠️  Stage '{stage_name}' never ran; known stages: {', '.join(sorted(_state['stages']))}")
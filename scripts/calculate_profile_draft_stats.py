@@ -3,15 +3,33 @@ Calculate draft statistics for each member profile.
 Generates comprehensive draft analytics from draft and season data.
 """
 
+import argparse
+import hashlib
 import json
 import os
 from collections import defaultdict
 from pathlib import Path
 
+import build_profiler
+import league_data
+import member_registry
+import season_rankings
+from profile_format import compact_profile
+from profile_insights import calculate_insights
+
+BUILD_MANIFEST = Path("data/build_manifest.json")
+# Bump when manifest contents change meaning so incremental runs start fresh
+MANIFEST_VERSION = 2
+PROFILES_DIR = Path("data/profiles")
+LEAGUE_DATABASE = member_registry.LEAGUE_DATABASE
+MEMBER_ALIASES_FILE = member_registry.MEMBER_ALIASES_FILE
+# Grade against the stored PPR ranks unless told to derive ranks (see season_rankings.py)
+DEFAULT_RANKING = {"ranks": "stored", "scoring": "ppr", "ties": "min"}
+
 def normalize_player_id(name):
     """Normalize player name to player_id format."""
-    # Remove suffixes
-    for suffix in [' Jr.', ' Sr.', ' II', ' III', ' IV']:
+    # Remove suffixes (III before II, or "James Cook III" would keep an "I")
+    for suffix in [' Jr.', ' Sr.', ' III', ' II', ' IV']:
         name = name.replace(suffix, '')
     # Remove punctuation and spaces, lowercase
     return ''.join(c.lower() for c in name if c.isalnum())
@@ -59,51 +77,169 @@ def parse_season_finish(season_finish_str):
     return None
 
 def load_all_drafts():
-    """Load all draft JSON files."""
-    drafts = {}
-    drafts_dir = Path("data/drafts")
-    for year_file in sorted(drafts_dir.glob("*.json")):
-        year = int(year_file.stem)
-        with open(year_file, 'r') as f:
-            drafts[year] = json.load(f)
-    return drafts
+    """Load all draft JSON files, keyed by year (shared, read-only)."""
+    return league_data.drafts()
 
 def load_all_seasons():
-    """Load all season JSON files."""
-    seasons = {}
-    seasons_dir = Path("data/seasons")
-    for year_file in sorted(seasons_dir.glob("*.json")):
-        year = int(year_file.stem)
-        with open(year_file, 'r') as f:
-            seasons[year] = json.load(f)
-    return seasons
-
-def get_season_finish(player_id, position, year, seasons_data):
+    """Load all season JSON files, keyed by year (shared, read-only)."""
+    return league_data.seasons()
+
+def shared_ranks(seasons_data):
+    """Stored ranks held by more than one player, as [(year, position, rank, [player_id, ...])]."""
+    shared = []
+    for year, season in sorted(seasons_data.items()):
+        for position, rankings in season.get("ppr_rankings", {}).items():
+            rank_owners = defaultdict(list)
+            for entry in rankings:
+                rank_owners[entry["rank"]].append(entry["player_id"])
+            shared += [(year, season_rankings.ranking_position(position), rank, player_ids)
+                       for rank, player_ids in sorted(rank_owners.items()) if len(player_ids) > 1]
+    return shared
+
+def print_shared_ranks(seasons_data):
+    """Warn once about every stored rank more than one player holds."""
+    for year, position, rank, player_ids in shared_ranks(seasons_data):
+        print(f"  ⚠️  {year} {position}: rank {rank} shared by {', '.join(player_ids)}")
+
+def build_season_finish_index(seasons_data, ranks="stored", scoring="ppr", ties="min", strict=False):
+    """Build a (year, position, player_id) -> (rank, ppr) lookup from season data.
+
+    Uses the stored ranks by default; ranks="derived" ranks players by their
+    points under the given scoring and tie policy instead. Raises ValueError
+    if a player appears more than once in the same position ranking, since
+    the lookup would be ambiguous. A stored rank shared by several players
+    (a tie in the published finishes) grades each of them at that rank, or
+    raises ValueError with strict=True; shared_ranks() lists them.
+    """
+    if ranks == "derived":
+        return season_rankings.derived_finish_index(seasons_data, scoring, ties)
+    if scoring != "ppr":
+        raise ValueError(f"stored ranks are PPR ranks; {scoring} scoring needs derived ranks")
+    if strict:
+        shared = shared_ranks(seasons_data)
+        if shared:
+            year, position, rank, player_ids = shared[0]
+            raise ValueError(f"Shared season finish: rank {rank} in {year} {position} is held by "
+                             f"{', '.join(player_ids)} ({len(shared)} shared rank(s) in total)")
+    index = {}
+    for year, season in seasons_data.items():
+        for position, rankings in season.get("ppr_rankings", {}).items():
+            position_key = season_rankings.ranking_position(position)
+            for entry in rankings:
+                key = (year, position_key, entry["player_id"])
+                if key in index:
+                    raise ValueError(
+                        f"Ambiguous season finish: {entry['player_id']} is ranked more than once "
+                        f"in {year} {position_key} (ranks {index[key][0]} and {entry['rank']})"
+                    )
+                index[key] = (entry["rank"], entry["ppr"])
+    return index
+
+def get_season_finish(player_id, position, year, seasons_data, finish_index=None):
     """Get season finish for a player in a given year."""
+    if finish_index is not None:
+        return finish_index.get((year, position.upper(), player_id), (None, None))
+    
     if year not in seasons_data:
         return None, None
     
     season = seasons_data[year]
     position_key = position.upper()
-    
-    if position_key not in season.get("ppr_rankings", {}):
+    rankings = next((entries for key, entries in season.get("ppr_rankings", {}).items()
+                     if season_rankings.ranking_position(key) == position_key), None)
+    if rankings is None:
         return None, None
     
-    rankings = season["ppr_rankings"][position_key]
     for entry in rankings:
         if entry["player_id"] == player_id:
             return entry["rank"], entry["ppr"]
     
     return None, None
 
-def calculate_member_stats():
-    """Calculate draft statistics for all members."""
-    drafts = load_all_drafts()
-    seasons = load_all_seasons()
+def grade_pick(year, pick, players_data, finish_index=None, seasons=None):
+    """Grade one draft pick against its season finish and build its pick record."""
+    player_id = pick.get("player_id")
+    draft_pos_str = pick.get("draft_pos", "")
+    
+    # Get player info
+    player_info = players_data.get("players", {}).get(player_id, {})
+    player_name = player_info.get("name", "Unknown")
+    positions = player_info.get("positions", [])
+    position = positions[0] if positions else "UNK"
     
-    # Load players to get positions
-    with open("data/players.json", 'r') as f:
-        players_data = json.load(f)
+    # Parse draft position
+    draft_pos_num = parse_draft_pos(draft_pos_str)
+    
+    # Get season finish
+    season_finish_num, ppr_points = get_season_finish(player_id, position, year, seasons or {}, finish_index)
+    
+    # Calculate value
+    value_diff, value_type = calculate_value(draft_pos_num, season_finish_num)
+    
+    return {
+        "year": year,
+        "round": pick.get("round", 0),
+        "pick": pick.get("pick", 0),
+        "player_id": player_id,
+        "player_name": player_name,
+        "position": position,
+        "draft_pos": draft_pos_str,
+        "draft_pos_num": draft_pos_num,
+        "season_finish": f"{position} {season_finish_num}" if season_finish_num else "—",
+        "season_finish_num": season_finish_num,
+        "ppr_points": ppr_points,
+        "value_diff": value_diff,
+        "value_type": value_type
+    }
+
+def count_pick(stats, pick_record):
+    """Add a graded pick to a member's hit/miss/push counters and round stats."""
+    round_num = pick_record["round"]
+    value_type = pick_record["value_type"]
+    round_stats = stats["round_stats"][round_num]
+    stats["total_picks"] += 1
+    round_stats["total"] += 1
+    
+    if value_type == "hit":
+        stats["hits"] += 1
+        round_stats["hits"] += 1
+    elif value_type == "extreme_hit":
+        stats["hits"] += 1
+        stats["extreme_hits"] += 1
+        round_stats["hits"] += 1
+    elif value_type == "super_hit":
+        stats["hits"] += 1
+        stats["super_hits"] += 1
+        round_stats["hits"] += 1
+    elif value_type == "miss":
+        stats["misses"] += 1
+        round_stats["misses"] += 1
+    elif value_type == "push":
+        stats["pushes"] += 1
+        round_stats["pushes"] += 1
+
+def calculate_member_stats(owners=None, store=None, ranking=DEFAULT_RANKING):
+    """Calculate draft statistics for all members (or only the given owners).
+    
+    With a league store connection (see league_store.py), drafts, players
+    and season finishes (stored ranks) are read from SQLite instead of the
+    JSON files. ranking picks stored or derived ranks (see DEFAULT_RANKING).
+    """
+    if store is not None:
+        from league_store import load_draft_inputs
+        with build_profiler.stage("load_store"):
+            drafts, players_data, finish_index = load_draft_inputs(store)
+        seasons = {}
+    else:
+        # Read every input file in one concurrent pass
+        league_data.preload()
+        drafts = load_all_drafts()
+        seasons = load_all_seasons()
+        with build_profiler.stage("build_finish_index"):
+            finish_index = build_season_finish_index(seasons, **ranking)
+        
+        # Load players to get positions
+        players_data = league_data.players()
     
     # Initialize member stats
     member_stats = defaultdict(lambda: {
@@ -121,152 +257,367 @@ def calculate_member_stats():
     })
     
     # Process each draft year
-    for year, draft_data in drafts.items():
-        for pick in draft_data.get("picks", []):
-            owner = pick.get("owner")
-            if not owner:
-                continue
-            
-            player_id = pick.get("player_id")
-            draft_pos_str = pick.get("draft_pos", "")
-            round_num = pick.get("round", 0)
-            
-            # Get player info
-            player_info = players_data.get("players", {}).get(player_id, {})
-            player_name = player_info.get("name", "Unknown")
-            positions = player_info.get("positions", [])
-            position = positions[0] if positions else "UNK"
-            
-            # Parse draft position
-            draft_pos_num = parse_draft_pos(draft_pos_str)
-            
-            # Get season finish
-            season_finish_num, ppr_points = get_season_finish(player_id, position, year, seasons)
-            
-            # Calculate value
-            value_diff, value_type = calculate_value(draft_pos_num, season_finish_num)
-            
-            # Create pick record
-            pick_record = {
-                "year": year,
-                "round": round_num,
-                "pick": pick.get("pick", 0),
-                "player_id": player_id,
-                "player_name": player_name,
-                "position": position,
-                "draft_pos": draft_pos_str,
-                "draft_pos_num": draft_pos_num,
-                "season_finish": f"{position} {season_finish_num}" if season_finish_num else "—",
-                "season_finish_num": season_finish_num,
-                "ppr_points": ppr_points,
-                "value_diff": value_diff,
-                "value_type": value_type
-            }
+    with build_profiler.stage("grade_picks"):
+        for year, draft_data in drafts.items():
+            for pick in draft_data.get("picks", []):
+                owner = pick.get("owner")
+                if not owner:
+                    continue
+                owner = member_registry.member_id(owner)
+                if owners is not None and owner not in owners:
+                    continue
+                
+                pick_record = grade_pick(year, pick, players_data, finish_index, seasons)
+                
+                # Update member stats
+                stats = member_stats[owner]
+                stats["picks_by_year"][year].append(pick_record)
+                stats["picks_by_position"][pick_record["position"]].append(pick_record)
+                count_pick(stats, pick_record)
+                value_diff = pick_record["value_diff"]
+                
+                # Track best/worst picks
+                if value_diff is not None:
+                    if value_diff > 0:  # Positive value (hit)
+                        stats["best_picks"].append(pick_record)
+                    elif value_diff < -5:  # Miss
+                        stats["worst_picks"].append(pick_record)
+    
+    picks_processed = sum(stats["total_picks"] for stats in member_stats.values())
+    build_profiler.count("picks_processed", picks_processed)
+    build_profiler.count("finish_lookups", picks_processed)
+    
+    # Sort and limit best/worst picks
+    with build_profiler.stage("sort_best_worst"):
+        for owner, stats in member_stats.items():
+            stats["best_picks"].sort(key=lambda x: x.get("value_diff", 0) or 0, reverse=True)
+            stats["best_picks"] = stats["best_picks"][:10]
             
-            # Update member stats
-            stats = member_stats[owner]
-            stats["total_picks"] += 1
-            stats["picks_by_year"][year].append(pick_record)
-            stats["picks_by_position"][position].append(pick_record)
-            stats["round_stats"][round_num]["total"] += 1
+            stats["worst_picks"].sort(key=lambda x: x.get("value_diff", 0) or 0)
+            stats["worst_picks"] = stats["worst_picks"][:10]
             
-            if value_type == "hit":
-                stats["hits"] += 1
-                stats["round_stats"][round_num]["hits"] += 1
-            elif value_type == "extreme_hit":
-                stats["hits"] += 1
-                stats["extreme_hits"] += 1
-                stats["round_stats"][round_num]["hits"] += 1
-            elif value_type == "super_hit":
-                stats["hits"] += 1
-                stats["super_hits"] += 1
-                stats["round_stats"][round_num]["hits"] += 1
-            elif value_type == "miss":
-                stats["misses"] += 1
-                stats["round_stats"][round_num]["misses"] += 1
-            elif value_type == "push":
-                stats["pushes"] += 1
-                stats["round_stats"][round_num]["pushes"] += 1
+            # Calculate hit rate
+            total_with_result = stats["hits"] + stats["misses"] + stats["pushes"]
+            stats["hit_rate"] = (stats["hits"] / total_with_result * 100) if total_with_result > 0 else 0
             
-            # Track best/worst picks
-            if value_diff is not None:
-                if value_diff > 0:  # Positive value (hit)
-                    stats["best_picks"].append(pick_record)
-                elif value_diff < -5:  # Miss
-                    stats["worst_picks"].append(pick_record)
-    
-    # Sort and limit best/worst picks
-    for owner, stats in member_stats.items():
-        stats["best_picks"].sort(key=lambda x: x.get("value_diff", 0) or 0, reverse=True)
-        stats["best_picks"] = stats["best_picks"][:10]
-        
-        stats["worst_picks"].sort(key=lambda x: x.get("value_diff", 0) or 0)
-        stats["worst_picks"] = stats["worst_picks"][:10]
-        
-        # Calculate hit rate
-        total_with_result = stats["hits"] + stats["misses"] + stats["pushes"]
-        stats["hit_rate"] = (stats["hits"] / total_with_result * 100) if total_with_result > 0 else 0
-        
-        # Calculate average value
-        all_values = [p.get("value_diff", 0) or 0 for picks in stats["picks_by_year"].values() for p in picks if p.get("value_diff") is not None]
-        stats["avg_value"] = sum(all_values) / len(all_values) if all_values else 0
+            # Calculate average value
+            all_values = [p.get("value_diff", 0) or 0 for picks in stats["picks_by_year"].values() for p in picks if p.get("value_diff") is not None]
+            stats["avg_value"] = sum(all_values) / len(all_values) if all_values else 0
     
     return dict(member_stats)
 
-def generate_profile_json(member_name, stats):
-    """Generate JSON file for a member profile."""
-    # Normalize member name to filename
-    filename = member_name.lower().replace(" ", "-")
+def load_optional_json(path):
+    """Load a JSON file (shared, read-only), or return an empty dict if it doesn't exist."""
+    return league_data.load_json(path, {})
+
+def add_member_insights(member_stats):
+    """Precompute each member's draft tendencies and achievements.
     
-    output_dir = Path("data/profiles")
-    output_dir.mkdir(exist_ok=True)
+    Member ids are league aliases, so season-based achievements are matched
+    to league standings by id.
+    """
+    players_data = league_data.players()
+    league = league_data.league_database()
     
-    output_file = output_dir / f"{filename}.json"
+    with build_profiler.stage("calculate_insights"):
+        for member, stats in member_stats.items():
+            stats["tendencies"], stats["achievements"] = calculate_insights(
+                stats, players_data, league, member
+            )
+    return member_stats
+
+def profile_json_path(member_name):
+    """Get the profile JSON path for a member, by any of their names."""
+    return PROFILES_DIR / f"{member_registry.member_id(member_name)}.json"
+
+def prune_stale_profiles(keep):
+    """Delete profile JSON files that are no longer produced, such as old per-name duplicates.
+    
+    Returns the deleted paths.
+    """
+    keep = {Path(path) for path in keep}
+    pruned = []
+    for path in sorted(PROFILES_DIR.glob("*.json")):
+        if path not in keep:
+            path.unlink()
+            pruned.append(path)
+    build_profiler.count("files_pruned", len(pruned))
+    return pruned
+
+def write_json_if_changed(output_file, data, compact=False):
+    """Write JSON to a file unless the file already holds identical bytes.
+    
+    Returns True if the file was written.
+    """
+    with build_profiler.stage("serialize_json"):
+        if compact:
+            content = json.dumps(data, separators=(",", ":"))
+        else:
+            content = json.dumps(data, indent=2)
+    
+    with build_profiler.stage("write_json"):
+        output_file = Path(output_file)
+        if output_file.exists() and output_file.read_text() == content:
+            build_profiler.count("files_unchanged")
+            return False
+        output_file.write_text(content)
+    build_profiler.count("files_written")
+    build_profiler.count("bytes_written", len(content.encode()))
+    return True
+
+def draft_stats_summary(stats):
+    """The career totals block of a profile; needs only the summary keys, not the picks."""
+    return {
+        "total_picks": stats["total_picks"],
+        "total_hits": stats["hits"],
+        "total_misses": stats["misses"],
+        "total_pushes": stats["pushes"],
+        "extreme_hits": stats["extreme_hits"],
+        "super_hits": stats["super_hits"],
+        "hit_rate": round(stats["hit_rate"], 1),
+        "avg_value": round(stats["avg_value"], 1),
+        "best_pick": stats["best_picks"][0] if stats["best_picks"] else None,
+        "worst_pick": stats["worst_picks"][0] if stats["worst_picks"] else None
+    }
+
+def generate_profile_json(member_name, stats, output_format="compact"):
+    """Generate JSON file for a member profile.
+    
+    The compact format (see profile_format.py) stores each pick once; "full"
+    writes the original format with every view expanded.
+    Returns the output path and whether the file was (re)written.
+    """
+    output_file = profile_json_path(member_name)
+    output_file.parent.mkdir(exist_ok=True)
     
     # Convert defaultdicts to regular dicts for JSON serialization
     output_data = {
-        "member": member_name,
-        "draft_stats": {
-            "total_picks": stats["total_picks"],
-            "total_hits": stats["hits"],
-            "total_misses": stats["misses"],
-            "total_pushes": stats["pushes"],
-            "extreme_hits": stats["extreme_hits"],
-            "super_hits": stats["super_hits"],
-            "hit_rate": round(stats["hit_rate"], 1),
-            "avg_value": round(stats["avg_value"], 1),
-            "best_pick": stats["best_picks"][0] if stats["best_picks"] else None,
-            "worst_pick": stats["worst_picks"][0] if stats["worst_picks"] else None
-        },
+        "member": member_registry.member_name(member_name),
+        "draft_stats": draft_stats_summary(stats),
         "picks_by_year": {str(k): v for k, v in stats["picks_by_year"].items()},
         "picks_by_position": {k: v for k, v in stats["picks_by_position"].items()},
         "round_stats": {str(k): v for k, v in stats["round_stats"].items()},
         "top_10_best_picks": stats["best_picks"][:10],
         "top_10_worst_picks": stats["worst_picks"][:10]
     }
+    if "tendencies" in stats:
+        output_data["tendencies"] = stats["tendencies"]
+        output_data["achievements"] = stats["achievements"]
+    
+    if output_format == "compact":
+        with build_profiler.stage("compact_profile"):
+            output_data = compact_profile(output_data)
+    written = write_json_if_changed(output_file, output_data, compact=output_format == "compact")
+    
+    return output_file, written
+
+def hash_file(path):
+    """Get the SHA-256 hex digest of a file's contents."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+def collect_input_hashes():
+    """Hash every input file the profile stats depend on."""
+    input_files = sorted(league_data.DRAFTS_DIR.glob("*.json")) + sorted(league_data.SEASONS_DIR.glob("*.json"))
+    input_files += [league_data.PLAYERS_FILE, LEAGUE_DATABASE, MEMBER_ALIASES_FILE]
+    return {path.as_posix(): hash_file(path) for path in input_files if path.exists()}
+
+def hash_player_entries(players_data):
+    """Hash each player entry so changes to single players can be detected."""
+    return {
+        player_id: hashlib.sha256(json.dumps(info, sort_keys=True).encode()).hexdigest()
+        for player_id, info in players_data.get("players", {}).items()
+    }
+
+def load_build_manifest():
+    """Load the build manifest from the previous run, if any."""
+    if not BUILD_MANIFEST.exists():
+        return None
+    with open(BUILD_MANIFEST, 'r') as f:
+        return json.load(f)
+
+def manifest_record(member_name, stats):
+    """A member's build manifest entry: their profile file and the years and players they drafted."""
+    output_file = profile_json_path(member_name)
+    return {
+        "output": output_file.as_posix(),
+        "output_hash": hash_file(output_file),
+        "years": sorted(stats["picks_by_year"].keys()),
+        "players": sorted({p["player_id"] for picks in stats["picks_by_year"].values() for p in picks})
+    }
+
+def save_build_manifest(input_hashes, player_hashes, member_stats, previous=None, owners=None, output_format="compact",
+                        ranking=DEFAULT_RANKING, records=None):
+    """Record input hashes and each member's picks for the next incremental run.
+    
+    records holds manifest_record() entries already taken for members whose
+    picks are no longer in member_stats (the streaming build drops them).
+    """
+    records = dict(records or {})
+    records.update((member_name, manifest_record(member_name, stats)) for member_name, stats in member_stats.items())
+    members = dict(previous.get("members", {})) if previous else {}
+    # Drop members that were rebuilt but no longer have any picks
+    for member_name in (owners or set()) - set(records):
+        members.pop(member_name, None)
+    members.update(records)
+    
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "format": output_format,
+        "ranking": ranking,
+        "inputs": input_hashes,
+        "players": player_hashes,
+        "members": members
+    }
+    with open(BUILD_MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def find_affected_members(manifest, input_hashes, player_hashes):
+    """Find members whose profile must be recomputed since the last build.
+    
+    A member is affected if one of their draft years had its draft or season
+    file change, if they drafted a player whose players.json entry changed,
+    if the league database or member aliases changed, or if their profile file
+    is missing or was edited by hand.
+    """
+    previous_inputs = manifest.get("inputs", {})
+    changed_paths = {
+        path for path in set(previous_inputs) | set(input_hashes)
+        if previous_inputs.get(path) != input_hashes.get(path)
+    }
+    players_path = league_data.PLAYERS_FILE.as_posix()
+    league_paths = {players_path, LEAGUE_DATABASE.as_posix(), MEMBER_ALIASES_FILE.as_posix()}
+    changed_years = {int(Path(path).stem) for path in changed_paths - league_paths}
+    # Standings and aliases feed every member's id and achievements
+    league_changed = bool(changed_paths & (league_paths - {players_path}))
+    
+    previous_players = manifest.get("players", {})
+    changed_players = {
+        player_id for player_id in set(previous_players) | set(player_hashes)
+        if previous_players.get(player_id) != player_hashes.get(player_id)
+    }
+    
+    affected = set()
+    for member_name, record in manifest.get("members", {}).items():
+        output_file = Path(record["output"])
+        if league_changed or changed_years & set(record["years"]) or changed_players & set(record["players"]):
+            affected.add(member_name)
+        elif not output_file.exists() or hash_file(output_file) != record.get("output_hash"):
+            affected.add(member_name)
     
-    with open(output_file, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    # Owners who appear in a changed draft file but not (yet) in the manifest
+    for year in changed_years:
+        draft_data = league_data.draft(year)
+        if draft_data is None:
+            continue
+        for pick in draft_data.get("picks", []):
+            if pick.get("owner"):
+                affected.add(member_registry.member_id(pick["owner"]))
     
-    return output_file
+    return affected
 
 def main():
     """Main execution."""
+    parser = argparse.ArgumentParser(description="Calculate draft statistics for each member profile.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only recompute members whose drafts, seasons or players changed since the last build")
+    parser.add_argument("--engine", choices=["python", "numpy", "stream"], default="python",
+                        help="grade picks one at a time (python), in one vectorized pass (numpy, requires NumPy) "
+                             "or a draft year at a time, writing year shards as it goes (stream)")
+    parser.add_argument("--store", action="store_true",
+                        help="read drafts, players and season finishes from the SQLite league store (python engine)")
+    parser.add_argument("--format", choices=["compact", "full"], default="compact",
+                        help="write compact profiles with each pick stored once, or the full expanded format")
+    parser.add_argument("--ranks", choices=["stored", "derived"], default="stored",
+                        help="grade against the stored season ranks or ranks derived from points")
+    parser.add_argument("--scoring", choices=sorted(season_rankings.SCORING), default="ppr",
+                        help="scoring system for derived ranks (non-PPR scoring needs stat lines)")
+    parser.add_argument("--ties", choices=season_rankings.TIE_POLICIES, default="min",
+                        help="how derived ranks treat players with equal points")
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("calculate_profile_draft_stats", args)
+    ranking = {"ranks": args.ranks, "scoring": args.scoring, "ties": args.ties}
+    if args.ranks == "stored" and args.scoring != "ppr":
+        parser.error("--scoring other than ppr requires --ranks derived")
+    if args.store and args.engine != "python":
+        parser.error("--store only works with the python engine")
+    if args.store and args.ranks == "derived":
+        parser.error("--store grades against the stored ranks; drop --store to use --ranks derived")
+    
     print("=" * 70)
     print("CALCULATING PROFILE DRAFT STATISTICS")
     print("=" * 70)
     print()
     
+    with build_profiler.stage("hash_inputs"):
+        input_hashes = collect_input_hashes()
+        player_hashes = hash_player_entries(league_data.players())
+    
+    manifest = load_build_manifest() if args.incremental else None
+    if manifest is not None and manifest.get("version") != MANIFEST_VERSION:
+        print("Build manifest is from an older version, running a full build")
+        manifest = None
+    elif manifest is not None and manifest.get("format", "full") != args.format:
+        print(f"Profile format changed to {args.format}, running a full build")
+        manifest = None
+    elif manifest is not None and manifest.get("ranking", DEFAULT_RANKING) != ranking:
+        print("Ranking options changed, running a full build")
+        manifest = None
+    owners = None
+    if manifest is not None:
+        owners = find_affected_members(manifest, input_hashes, player_hashes)
+        if not owners:
+            print("✅ Profiles are up to date, nothing to rebuild")
+            save_build_manifest(input_hashes, player_hashes, {}, manifest, output_format=args.format, ranking=ranking)
+            build_profiler.finish()
+            return
+        print(f"Incremental build: recomputing {len(owners)} member(s)")
+    elif args.incremental and not BUILD_MANIFEST.exists():
+        print("No build manifest found, running a full build")
+    
     print("Loading draft and season data...")
-    member_stats = calculate_member_stats()
+    if args.ranks == "stored":
+        print_shared_ranks(load_all_seasons())
+    records, outputs = None, {}
+    if args.engine == "stream":
+        # Profiles are written from the year shards as the stream builds them
+        from build_profile_shards import stream_profiles
+        member_stats, records, outputs = stream_profiles(owners, ranking, args.format)
+    elif args.engine == "numpy":
+        from draft_value_engine import calculate_member_stats_vectorized
+        member_stats = calculate_member_stats_vectorized(owners, ranking)
+    elif args.store:
+        import league_store
+        store = league_store.connect()
+        try:
+            member_stats = calculate_member_stats(owners, store)
+        finally:
+            store.close()
+    else:
+        member_stats = calculate_member_stats(owners, ranking=ranking)
+    if records is None:
+        add_member_insights(member_stats)
     
     print(f"✅ Calculated stats for {len(member_stats)} members")
     print()
     
     print("Generating profile JSON files...")
     for member_name, stats in member_stats.items():
-        output_file = generate_profile_json(member_name, stats)
-        print(f"  ✅ {member_name}: {output_file}")
+        if member_name in outputs:
+            output_file, written = outputs[member_name]
+        else:
+            output_file, written = generate_profile_json(member_name, stats, args.format)
+        if written:
+            print(f"  ✅ {member_name}: {output_file}")
+        else:
+            print(f"  ➖ {member_name}: {output_file} (unchanged)")
+    
+    # The streaming engine keeps no picks in member_stats; its manifest records were taken as it wrote
+    saved = save_build_manifest(input_hashes, player_hashes, member_stats if records is None else {}, manifest,
+                                owners, args.format, ranking, records)
+    for path in prune_stale_profiles(record["output"] for record in saved["members"].values()):
+        print(f"  🗑️  Removed stale {path}")
     
     print()
     print("=" * 70)
@@ -288,6 +639,8 @@ def main():
         if stats['worst_picks']:
             worst = stats['worst_picks'][0]
             print(f"  Worst Pick: {worst['player_name']} ({worst['year']}) - {worst['draft_pos']} → {worst['season_finish']} (diff: {worst['value_diff']})")
+    
+    build_profiler.finish()
 
 if __name__ == "__main__":
     main()
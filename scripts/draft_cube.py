@@ -0,0 +1,239 @@
+"""
+League-wide draft cube: member x year x round x position.
+Every graded pick is binned once into a dense cube holding, per cell, the
+count of each value class, the number of picks with a value_diff, the sum
+of value_diff and the sum of PPR points. League leaderboards and heatmaps
+("hit rate by round", "RB value in rounds 3-5 by year") become sums over
+slices of the cube instead of rescans of every pick.
+
+data/draft_cube.bin is one little-endian file the site can fetch as an
+ArrayBuffer:
+
+    uint32   header length in bytes
+    JSON     header (dimension labels and where each array starts)
+    arrays   counts, graded, value_sum, ppr_sum, each 8-byte aligned
+
+so Python maps the arrays with np.frombuffer and JavaScript with typed
+array views, neither copying nor parsing the picks.
+"""
+
+import argparse
+import json
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+
+import build_profiler
+from draft_value_engine import HIT_CLASSES, MISS, PUSH, VALUE_TYPES, aggregate_picks, format_hit_rate, load_graded_picks
+
+DRAFT_CUBE_FILE = Path("data/draft_cube.bin")
+CUBE_VERSION = 1
+DIMENSIONS = ["member", "year", "round", "position"]
+ALIGNMENT = 8
+# Every stored array and its dtype; counts has a trailing value-class axis
+MEASURES = {
+    "counts": np.uint8,
+    "graded": np.uint8,
+    "value_sum": np.int16,
+    "ppr_sum": np.float32,
+}
+
+def narrow(values, dtype):
+    """Cast to a smaller dtype, refusing values it can't hold."""
+    if np.issubdtype(dtype, np.integer):
+        limits = np.iinfo(dtype)
+        if values.size and (values.min() < limits.min or values.max() > limits.max):
+            raise ValueError(f"values {values.min()}..{values.max()} don't fit in {np.dtype(dtype).name}")
+        return np.rint(values).astype(dtype)
+    return values.astype(dtype)
+
+class DraftCube:
+    """Dense per-cell pick measures with a label table for every dimension."""
+
+    def __init__(self, labels, arrays):
+        self.labels = labels
+        self.arrays = arrays
+
+    @classmethod
+    def from_picks(cls, table, graded):
+        """Bin a pick table and its grades into the cube in one pass."""
+        members = sorted(table["owners"])
+        positions = sorted(table["positions"])
+        member_codes = np.array([members.index(owner) for owner in table["owners"]], dtype=np.int64)
+        position_codes = np.array([positions.index(position) for position in table["positions"]], dtype=np.int64)
+        years, year_codes = np.unique(table["year"], return_inverse=True)
+        rounds, round_codes = np.unique(table["round"], return_inverse=True)
+        shape = (len(members), len(years), len(rounds), len(positions))
+        cells = np.ravel_multi_index(
+            (member_codes[table["owner"]], year_codes, round_codes, position_codes[table["position"]]), shape
+        )
+        num_cells = int(np.prod(shape))
+        num_classes = len(VALUE_TYPES)
+        has_value = graded["has_value"]
+
+        counts = np.bincount(cells * num_classes + graded["value_class"], minlength=num_cells * num_classes)
+        arrays = {
+            "counts": counts.reshape(shape + (num_classes,)),
+            "graded": np.bincount(cells, weights=has_value, minlength=num_cells).reshape(shape),
+            "value_sum": np.bincount(cells, weights=graded["value_diff"] * has_value, minlength=num_cells).reshape(shape),
+            "ppr_sum": np.bincount(cells, weights=table["ppr"], minlength=num_cells).reshape(shape),
+        }
+        labels = {
+            "member": members,
+            "year": [int(year) for year in years],
+            "round": [int(round_num) for round_num in rounds],
+            "position": positions,
+        }
+        return cls(labels, {name: narrow(arrays[name], dtype) for name, dtype in MEASURES.items()})
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Read the file format written by to_bytes(); arrays are views into data."""
+        (header_length,) = struct.unpack_from("<I", data)
+        header = json.loads(bytes(data[4:4 + header_length]))
+        if header.get("version") != CUBE_VERSION:
+            raise ValueError(f"unsupported draft cube version {header.get('version')}")
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"]).newbyteorder("<")
+            count = int(np.prod(spec["shape"]))
+            arrays[name] = np.frombuffer(data, dtype=dtype, count=count, offset=spec["offset"]).reshape(spec["shape"])
+        return cls(header["labels"], arrays)
+
+    def to_bytes(self):
+        """Serialize to the length-prefixed JSON header plus aligned little-endian arrays."""
+        specs = {name: {"dtype": np.dtype(dtype).name, "shape": list(self.arrays[name].shape)}
+                 for name, dtype in MEASURES.items()}
+        header = {"version": CUBE_VERSION, "dimensions": DIMENSIONS, "value_types": VALUE_TYPES,
+                  "labels": self.labels, "arrays": specs}
+        # Offsets depend on the header's length, which depends on the offsets;
+        # recompute until they stop changing (two or three passes)
+        for spec in specs.values():
+            spec["offset"] = 0
+        while True:
+            encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+            offset = -(-(4 + len(encoded)) // ALIGNMENT) * ALIGNMENT
+            offsets = {}
+            for name, dtype in MEASURES.items():
+                offsets[name] = offset
+                offset += -(-self.arrays[name].size * np.dtype(dtype).itemsize // ALIGNMENT) * ALIGNMENT
+            if all(specs[name]["offset"] == offsets[name] for name in MEASURES):
+                break
+            for name in MEASURES:
+                specs[name]["offset"] = offsets[name]
+
+        out = bytearray(offset)
+        struct.pack_into("<I", out, 0, len(encoded))
+        out[4:4 + len(encoded)] = encoded
+        for name, dtype in MEASURES.items():
+            data = np.ascontiguousarray(self.arrays[name], dtype=np.dtype(dtype).newbyteorder("<")).tobytes()
+            out[specs[name]["offset"]:specs[name]["offset"] + len(data)] = data
+        return bytes(out)
+
+    def index(self, dimension, values):
+        """Positions of the given labels along a dimension."""
+        labels = self.labels[dimension]
+        return [labels.index(value) for value in values]
+
+    def slice(self, **where):
+        """A cube restricted to some labels, e.g. slice(position=["RB"], round=[3, 4, 5])."""
+        selectors = [self.index(dim, where[dim]) if dim in where else range(len(self.labels[dim]))
+                     for dim in DIMENSIONS]
+        grid = np.ix_(*selectors)
+        labels = {dim: [self.labels[dim][i] for i in selector] for dim, selector in zip(DIMENSIONS, selectors)}
+        return DraftCube(labels, {name: array[grid] for name, array in self.arrays.items()})
+
+    def totals(self, by=()):
+        """Every measure summed over the dimensions not in by, widened so sums can't overflow."""
+        axes = tuple(i for i, dim in enumerate(DIMENSIONS) if dim not in by)
+        return {name: array.sum(axis=axes, dtype=np.float64 if name == "ppr_sum" else np.int64)
+                for name, array in self.arrays.items()}
+
+    def picks(self):
+        return int(self.arrays["counts"].sum())
+
+def average_value(totals):
+    """Mean value_diff of the graded picks in each group (NaN where none are graded)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return totals["value_sum"] / totals["graded"]
+
+def build_draft_cube():
+    """Grade every pick league-wide and bin it into the cube."""
+    table, graded = load_graded_picks()
+    with build_profiler.stage("build_draft_cube"):
+        return DraftCube.from_picks(table, graded), table, graded
+
+def load_draft_cube(path=DRAFT_CUBE_FILE):
+    """Load a written cube, or None if it hasn't been built."""
+    path = Path(path)
+    return DraftCube.from_bytes(path.read_bytes()) if path.exists() else None
+
+def write_draft_cube(cube, path=DRAFT_CUBE_FILE):
+    """Write the cube if its bytes changed; returns whether it was written."""
+    data = cube.to_bytes()
+    path = Path(path)
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+def check_against_aggregates(cube, table, graded):
+    """Compare the cube's marginals with the engine's grouped counts; returns the mismatches."""
+    aggregates = aggregate_picks(table, graded)
+    member_rows = [cube.labels["member"].index(owner) for owner in table["owners"]]
+    position_rows = [cube.labels["position"].index(position) for position in table["positions"]]
+    checks = {
+        "member": (cube.totals(by=["member"])["counts"][member_rows], aggregates["member"]),
+        "league_round": (cube.totals(by=["round"])["counts"], aggregates["league_round"]),
+        "league_position": (cube.totals(by=["position"])["counts"][position_rows], aggregates["league_position"]),
+        "member_value_sum": (cube.totals(by=["member"])["value_sum"][member_rows], aggregates["member_value_sum"]),
+        "ppr_sum": (cube.totals()["ppr_sum"], table["ppr"].sum()),
+    }
+    return [name for name, (actual, expected) in checks.items() if not np.allclose(actual, expected, atol=0.5)]
+
+def main():
+    """Build data/draft_cube.bin, check it against the engine and print example slices."""
+    parser = argparse.ArgumentParser(description="Build the member x year x round x position draft cube.")
+    parser.add_argument("--output", type=Path, default=DRAFT_CUBE_FILE)
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("draft_cube", args)
+
+    cube, table, graded = build_draft_cube()
+    mismatched = check_against_aggregates(cube, table, graded)
+    if mismatched:
+        print(f"✗ Draft cube totals differ from aggregate_picks() for: {', '.join(mismatched)}")
+        sys.exit(1)
+    written = write_draft_cube(cube, args.output)
+    reloaded = load_draft_cube(args.output)
+    if any(not np.array_equal(reloaded.arrays[name], cube.arrays[name]) for name in MEASURES):
+        print(f"✗ {args.output} doesn't read back as the cube that was written")
+        sys.exit(1)
+    shape = " x ".join(str(len(cube.labels[dim])) for dim in DIMENSIONS)
+    print(f"✓ Binned {cube.picks()} picks into a {shape} cube, "
+          f"{'wrote' if written else 'unchanged'} {args.output} ({args.output.stat().st_size:,} bytes)")
+
+    print("\n📊 League-wide hit rate by round:")
+    for round_num, counts in zip(cube.labels["round"], cube.totals(by=["round"])["counts"]):
+        print(f"  Round {round_num:>2}: {format_hit_rate(counts)} ({counts.sum()} picks)")
+
+    print("\n📊 RB value in rounds 3-5 by year:")
+    totals = cube.slice(position=["RB"], round=[3, 4, 5]).totals(by=["year"])
+    for year, value, graded_count, ppr in zip(cube.labels["year"], average_value(totals),
+                                               totals["graded"], totals["ppr_sum"]):
+        average = f"{value:+.1f}" if graded_count else "—"
+        print(f"  {year}: {average:>6} avg value over {graded_count} graded picks, {ppr:.1f} PPR")
+
+    print("\n🏆 Hit rate leaderboard:")
+    totals = cube.totals(by=["member"])
+    counts = totals["counts"]
+    rates = counts[:, HIT_CLASSES].sum(axis=1) / np.maximum(counts[:, HIT_CLASSES + [MISS, PUSH]].sum(axis=1), 1)
+    for rank, row in enumerate(np.argsort(-rates, kind="stable"), 1):
+        print(f"  {rank:>2}. {cube.labels['member'][row]:10} {format_hit_rate(counts[row])}"
+              f"  avg value {average_value(totals)[row]:+.1f}")
+    build_profiler.finish()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Vectorized draft value engine.
+Loads every pick across all draft years into typed NumPy columns and grades
+them in a single pass. Produces the same member stats as
+calculate_member_stats(), plus league-wide grouped aggregates.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import build_profiler
+import league_data
+import member_registry
+from calculate_profile_draft_stats import (
+    DEFAULT_RANKING,
+    build_season_finish_index,
+    calculate_member_stats,
+    load_all_drafts,
+    load_all_seasons,
+)
+
+# Value classes, in the order used for the value_class column
+VALUE_TYPES = ["miss", "push", "hit", "extreme_hit", "super_hit"]
+MISS, PUSH, HIT, EXTREME_HIT, SUPER_HIT = range(len(VALUE_TYPES))
+HIT_CLASSES = [HIT, EXTREME_HIT, SUPER_HIT]
+
+def parse_positions(position_strs):
+    """Parse an array of position strings (e.g. 'RB 5') to numbers.
+
+    Returns the numbers (0 where missing) and a mask of valid entries.
+    """
+    position_strs = np.char.strip(np.asarray(position_strs, dtype=str))
+    _, _, rest = np.moveaxis(np.char.partition(position_strs, " "), -1, 0)
+    number_strs = np.moveaxis(np.char.partition(np.char.lstrip(rest), " "), -1, 0)[0]
+    valid = np.char.isdigit(number_strs)
+    numbers = np.where(valid, number_strs, "0").astype(np.int64)
+    return numbers, valid
+
+def load_pick_table(drafts, players_data, finish_index, owners=None):
+    """Load all picks into a columnar table of typed arrays."""
+    players = players_data.get("players", {})
+    owner_codes = {}
+    position_codes = {}
+    columns = {name: [] for name in [
+        "year", "round", "pick", "owner", "position", "draft_pos",
+        "finish_num", "ppr_points", "player_id", "player_name"
+    ]}
+
+    for year, draft_data in sorted(drafts.items()):
+        for pick in draft_data.get("picks", []):
+            owner = pick.get("owner")
+            if owner:
+                owner = member_registry.member_id(owner)
+            if not owner or (owners is not None and owner not in owners):
+                continue
+
+            player_id = pick.get("player_id")
+            player_info = players.get(player_id, {})
+            positions = player_info.get("positions", [])
+            position = positions[0] if positions else "UNK"
+            finish_num, ppr_points = finish_index.get((year, position.upper(), player_id), (None, None))
+
+            columns["year"].append(year)
+            columns["round"].append(pick.get("round", 0))
+            columns["pick"].append(pick.get("pick", 0))
+            columns["owner"].append(owner_codes.setdefault(owner, len(owner_codes)))
+            columns["position"].append(position_codes.setdefault(position, len(position_codes)))
+            columns["draft_pos"].append(pick.get("draft_pos", ""))
+            columns["finish_num"].append(finish_num)
+            columns["ppr_points"].append(ppr_points)
+            columns["player_id"].append(player_id)
+            columns["player_name"].append(player_info.get("name", "Unknown"))
+
+    draft_pos_num, has_draft_pos = parse_positions(columns["draft_pos"] or np.empty(0, dtype=str))
+    has_finish = np.array([n is not None for n in columns["finish_num"]], dtype=bool)
+
+    return {
+        "year": np.array(columns["year"], dtype=np.int32),
+        "round": np.array(columns["round"], dtype=np.int32),
+        "pick": np.array(columns["pick"], dtype=np.int32),
+        "owner": np.array(columns["owner"], dtype=np.int32),
+        "position": np.array(columns["position"], dtype=np.int32),
+        "draft_pos_num": draft_pos_num,
+        "has_draft_pos": has_draft_pos,
+        "finish_num": np.array([n or 0 for n in columns["finish_num"]], dtype=np.int64),
+        "has_finish": has_finish,
+        "ppr": np.array([p or 0.0 for p in columns["ppr_points"]], dtype=np.float64),
+        # Raw values kept so pick records match the per-pick build exactly
+        "raw": columns,
+        "owners": list(owner_codes),
+        "positions": list(position_codes),
+    }
+
+def grade_picks(table):
+    """Compute value_diff and value class for every pick in one vectorized pass.
+
+    A pick with no season finish (or no parseable draft position) has no
+    value_diff and counts as a miss.
+    """
+    has_value = table["has_finish"] & table["has_draft_pos"]
+    value_diff = table["draft_pos_num"] - table["finish_num"]
+    value_class = np.select(
+        [value_diff >= 30, value_diff >= 15, value_diff >= 6, np.abs(value_diff) <= 5],
+        [SUPER_HIT, EXTREME_HIT, HIT, PUSH],
+        default=MISS
+    ).astype(np.int8)
+    value_class[~has_value] = MISS
+    value_diff = np.where(has_value, value_diff, 0)
+    return {"value_diff": value_diff, "has_value": has_value, "value_class": value_class}
+
+def grouped_class_counts(group_codes, num_groups, value_class):
+    """Count value classes per group; returns a (num_groups, len(VALUE_TYPES)) array."""
+    num_classes = len(VALUE_TYPES)
+    flat = np.bincount(group_codes * num_classes + value_class, minlength=num_groups * num_classes)
+    return flat.reshape(num_groups, num_classes)
+
+def aggregate_picks(table, graded):
+    """Per-member, per-round and per-position class counts as grouped reductions."""
+    num_owners = len(table["owners"])
+    num_positions = len(table["positions"])
+    rounds, round_codes = np.unique(table["round"], return_inverse=True)
+    value_class = graded["value_class"]
+
+    return {
+        "member": grouped_class_counts(table["owner"], num_owners, value_class),
+        "member_round": grouped_class_counts(
+            table["owner"] * len(rounds) + round_codes, num_owners * len(rounds), value_class
+        ).reshape(num_owners, len(rounds), -1),
+        "member_position": grouped_class_counts(
+            table["owner"] * num_positions + table["position"], num_owners * num_positions, value_class
+        ).reshape(num_owners, num_positions, -1),
+        "member_value_sum": np.bincount(
+            table["owner"], weights=graded["value_diff"] * graded["has_value"], minlength=num_owners
+        ),
+        "member_value_count": np.bincount(table["owner"], weights=graded["has_value"], minlength=num_owners),
+        "league_round": grouped_class_counts(round_codes, len(rounds), value_class),
+        "league_position": grouped_class_counts(table["position"], num_positions, value_class),
+        "rounds": rounds,
+    }
+
+def pick_record(table, graded, i):
+    """Build the pick record for row i, matching calculate_member_stats()."""
+    raw = table["raw"]
+    position = table["positions"][table["position"][i]]
+    has_value = graded["has_value"][i]
+    finish_num = raw["finish_num"][i]
+    return {
+        "year": raw["year"][i],
+        "round": raw["round"][i],
+        "pick": raw["pick"][i],
+        "player_id": raw["player_id"][i],
+        "player_name": raw["player_name"][i],
+        "position": position,
+        "draft_pos": raw["draft_pos"][i],
+        "draft_pos_num": int(table["draft_pos_num"][i]) if table["has_draft_pos"][i] else None,
+        "season_finish": f"{position} {finish_num}" if finish_num else "—",
+        "season_finish_num": finish_num,
+        "ppr_points": raw["ppr_points"][i],
+        "value_diff": int(graded["value_diff"][i]) if has_value else None,
+        "value_type": VALUE_TYPES[graded["value_class"][i]]
+    }
+
+def build_member_stats(table, graded, aggregates):
+    """Materialize member stats in the same shape as calculate_member_stats()."""
+    records = [pick_record(table, graded, i) for i in range(len(table["year"]))]
+    round_index = {int(r): k for k, r in enumerate(aggregates["rounds"])}
+    value_diff = graded["value_diff"]
+    has_value = graded["has_value"]
+    member_stats = {}
+
+    for code, owner in enumerate(table["owners"]):
+        rows = np.flatnonzero(table["owner"] == code)
+        counts = aggregates["member"][code]
+        hits = int(counts[HIT_CLASSES].sum())
+        misses, pushes = int(counts[MISS]), int(counts[PUSH])
+
+        picks_by_year = {}
+        picks_by_position = {}
+        round_stats = {}
+        for i in rows:
+            record = records[i]
+            picks_by_year.setdefault(record["year"], []).append(record)
+            picks_by_position.setdefault(record["position"], []).append(record)
+            round_num = record["round"]
+            if round_num not in round_stats:
+                round_counts = aggregates["member_round"][code, round_index[round_num]]
+                round_stats[round_num] = {
+                    "hits": int(round_counts[HIT_CLASSES].sum()),
+                    "misses": int(round_counts[MISS]),
+                    "pushes": int(round_counts[PUSH]),
+                    "total": int(round_counts.sum())
+                }
+
+        # Stable ordering on ties matches Python's sort of the per-pick build
+        best_rows = rows[has_value[rows] & (value_diff[rows] > 0)]
+        best_rows = best_rows[np.lexsort((best_rows, -value_diff[best_rows]))][:10]
+        worst_rows = rows[has_value[rows] & (value_diff[rows] < -5)]
+        worst_rows = worst_rows[np.lexsort((worst_rows, value_diff[worst_rows]))][:10]
+
+        total_with_result = hits + misses + pushes
+        value_count = int(aggregates["member_value_count"][code])
+        member_stats[owner] = {
+            "total_picks": len(rows),
+            "hits": hits,
+            "misses": misses,
+            "pushes": pushes,
+            "extreme_hits": int(counts[EXTREME_HIT]),
+            "super_hits": int(counts[SUPER_HIT]),
+            "picks_by_year": picks_by_year,
+            "picks_by_position": picks_by_position,
+            "best_picks": [records[i] for i in best_rows],
+            "worst_picks": [records[i] for i in worst_rows],
+            "round_stats": round_stats,
+            "hit_rate": (hits / total_with_result * 100) if total_with_result > 0 else 0,
+            "avg_value": int(aggregates["member_value_sum"][code]) / value_count if value_count else 0
+        }
+
+    return member_stats
+
+def load_graded_picks(owners=None, ranking=DEFAULT_RANKING):
+    """Load all draft, season and player data and grade every pick."""
+    drafts = load_all_drafts()
+    finish_index = build_season_finish_index(load_all_seasons(), **ranking)
+
+    players_data = league_data.players()
+
+    with build_profiler.stage("load_pick_table"):
+        table = load_pick_table(drafts, players_data, finish_index, owners)
+    with build_profiler.stage("grade_picks"):
+        graded = grade_picks(table)
+    build_profiler.count("picks_processed", len(table["year"]))
+    build_profiler.count("finish_lookups", len(table["year"]))
+    return table, graded
+
+def calculate_member_stats_vectorized(owners=None, ranking=DEFAULT_RANKING):
+    """Calculate draft statistics for all members using the columnar engine."""
+    table, graded = load_graded_picks(owners, ranking)
+    with build_profiler.stage("aggregate_picks"):
+        aggregates = aggregate_picks(table, graded)
+    with build_profiler.stage("build_member_stats"):
+        return build_member_stats(table, graded, aggregates)
+
+def format_hit_rate(counts):
+    """Format a class-count row as a hit rate percentage."""
+    graded = counts[HIT_CLASSES].sum() + counts[MISS] + counts[PUSH]
+    return f"{counts[HIT_CLASSES].sum() / graded * 100:.1f}%" if graded else "—"
+
+def main():
+    """Grade every pick league-wide and check the result against the per-pick build."""
+    start = time.perf_counter()
+    vectorized = calculate_member_stats_vectorized()
+    vectorized_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = calculate_member_stats()
+    reference_time = time.perf_counter() - start
+
+    if vectorized != reference:
+        mismatched = sorted(m for m in set(vectorized) | set(reference) if vectorized.get(m) != reference.get(m))
+        print(f"✗ Vectorized stats differ from calculate_member_stats() for: {', '.join(mismatched)}")
+        sys.exit(1)
+
+    print(f"✅ Vectorized stats match calculate_member_stats() for {len(vectorized)} members")
+    print(f"   vectorized: {vectorized_time * 1000:.1f} ms | per-pick: {reference_time * 1000:.1f} ms")
+
+    table, graded = load_graded_picks()
+    aggregates = aggregate_picks(table, graded)
+
+    print("\n📊 League-wide hit rate by round:")
+    for round_num, counts in zip(aggregates["rounds"], aggregates["league_round"]):
+        print(f"  Round {round_num:>2}: {format_hit_rate(counts)} ({counts.sum()} picks)")
+
+    print("\n📊 League-wide hit rate by position:")
+    for position, counts in zip(table["positions"], aggregates["league_position"]):
+        print(f"  {position:>4}: {format_hit_rate(counts)} ({counts.sum()} picks)")
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 """
 Generate biographies for all SML members based on their profile data.
-Moves Biography section to the top and generates personalized content.
+generate_biography() writes the personalized paragraph; render_profiles.py
+places it on each profile page. Running this script re-renders the pages
+through render_profiles, so the pages have a single writer.
 """
 
-import json
-import re
-import os
+import argparse
 from pathlib import Path
 
+import build_profiler
+import league_data
+import member_registry
+from team_index import load_team_index
+
 # Profile directory
 PROFILES_DIR = Path("profiles")
-DATA_DIR = Path("data/profiles")
 
 # Team abbreviation to full name mapping
 TEAM_NAMES = {
@@ -49,41 +53,6 @@ TEAM_NAMES = {
     "NYG": "New York Giants"
 }
 
-def extract_profile_stats(html_content):
-    """Extract league stats from HTML."""
-    stats = {}
-    
-    # Championships
-    match = re.search(r'<span class="stat-value">(\d+)</span>\s*<span class="stat-label">Championships</span>', html_content)
-    if match:
-        stats['championships'] = int(match.group(1))
-    
-    # Runner-ups
-    match = re.search(r'<span class="stat-value">(\d+)</span>\s*<span class="stat-label">Runner-Up</span>', html_content)
-    if match:
-        stats['runner_ups'] = int(match.group(1))
-    
-    # Seasons
-    match = re.search(r'<span class="stat-value">(\d+)</span>\s*<span class="stat-label">Seasons</span>', html_content)
-    if match:
-        stats['seasons'] = int(match.group(1))
-    
-    # Season Record
-    match = re.search(r'<span class="stat-value">([\d-]+)</span>\s*<span class="stat-label">Season Record</span>', html_content)
-    if match:
-        stats['season_record'] = match.group(1)
-    
-    # Playoff Appearances
-    match = re.search(r'<span class="stat-value">(\d+)</span>\s*<span class="stat-label">Playoff Appearances</span>', html_content)
-    if match:
-        stats['playoff_appearances'] = int(match.group(1))
-    
-    # Extract league history
-    history_items = re.findall(r'<span class="history-year">(\d+)</span>\s*<span class="history-event[^"]*">([^<]+)</span>', html_content)
-    stats['history'] = history_items
-    
-    return stats
-
 def get_franchise_player_info(profile_data):
     """Get franchise player information from tendencies."""
     tendencies = profile_data.get('tendencies', {})
@@ -96,10 +65,12 @@ def get_franchise_player_info(profile_data):
         }
     return None
 
-def get_theme_team_info(profile_data):
-    """Get theme team information from tendencies."""
+def get_theme_team_info(profile_data, team_index=None):
+    """Get theme team information from tendencies, or from the team index for older profile JSON."""
     tendencies = profile_data.get('tendencies', {})
     theme_team = tendencies.get('theme_team')
+    if not theme_team and team_index is not None and profile_data.get('member'):
+        theme_team = team_index.theme_teams().get(member_registry.member_id(profile_data['member']))
     if theme_team:
         team_abbr = theme_team['team']
         team_name = TEAM_NAMES.get(team_abbr, team_abbr)
@@ -110,7 +81,19 @@ def get_theme_team_info(profile_data):
         }
     return None
 
-def generate_biography(member_name, profile_stats, profile_data):
+def league_seasons(profile_stats):
+    """Every season a member shows up in: standings, titles, runner-ups, playoffs and the history timeline.
+    
+    Titles and runner-ups include league_history.json's, so seasons from
+    before the league database's standings (such as 2016) count too.
+    """
+    years = set(profile_stats.get('standings', {}))
+    for key in ('championship_years', 'runner_up_years', 'playoff_years'):
+        years.update(profile_stats.get(key, []))
+    years.update(year for year, _ in profile_stats.get('history', []))
+    return sorted(int(year) for year in years)
+
+def generate_biography(member_name, profile_stats, profile_data, team_index=None):
     """Generate a personalized biography as a single 4-6 line paragraph."""
     sentences = []
     
@@ -122,7 +105,13 @@ def generate_biography(member_name, profile_stats, profile_data):
     extreme_hits = stats.get('extreme_hits', 0)
     avg_value = stats.get('avg_value', 0)
     
-    seasons = profile_stats.get('seasons', 0)
+    # Tenure counts every season the league has a record of the member in,
+    # not only the years the league database has drafts and standings for
+    tenure = league_seasons(profile_stats)
+    seasons = max(profile_stats.get('seasons', 0), len(tenure))
+    first_season = tenure[0] if tenure else None
+    latest_season = max([int(year) for year in league_data.league_database().get('seasons', {})] + tenure, default=None)
+    newcomer = first_season is None or first_season >= latest_season - 1
     championships = profile_stats.get('championships', 0)
     runner_ups = profile_stats.get('runner_ups', 0)
     playoff_apps = profile_stats.get('playoff_appearances', 0)
@@ -137,6 +126,8 @@ def generate_biography(member_name, profile_stats, profile_data):
             sentences.append(f"{member_name} is a league veteran with {seasons} seasons of experience in the Sunday Movie League, bringing consistency and dedication to every draft.")
     elif seasons >= 5:
         sentences.append(f"With {seasons} seasons under their belt, {member_name} has established themselves as a reliable competitor in the Sunday Movie League.")
+    elif not newcomer:
+        sentences.append(f"{member_name}'s Sunday Movie League career dates back to the {first_season} season, and they bring that experience to every draft.")
     else:
         sentences.append(f"{member_name} is a{'n emerging' if seasons <= 2 else ''} member of the Sunday Movie League, bringing{' fresh' if seasons <= 2 else ''} energy to the league.")
     
@@ -174,6 +165,10 @@ def generate_biography(member_name, profile_stats, profile_data):
     if franchise_info and len(sentences) < 5:
         years_str = ', '.join(map(str, franchise_info['years']))
         sentences.append(f"Known for their loyalty, they have drafted {franchise_info['name']} {franchise_info['count']} times ({years_str}), earning them the distinction of a true franchise player.")
+    elif len(sentences) < 5:
+        theme_info = get_theme_team_info(profile_data, team_index)
+        if theme_info:
+            sentences.append(f"They keep coming back to the {theme_info['team']}, with {theme_info['count']} of their career picks drafted from that roster.")
     
     # Value hunter (if notable and space available)
     if avg_value >= 5 and len(sentences) < 5:
@@ -182,7 +177,7 @@ def generate_biography(member_name, profile_stats, profile_data):
     # Closing sentence - playoff appearances or future outlook
     if playoff_apps >= 3 and len(sentences) < 6:
         sentences.append(f"With {playoff_apps} playoff appearance{'s' if playoff_apps > 1 else ''} to their name, they have proven they can consistently build competitive rosters and make deep postseason runs.")
-    elif seasons >= 5 and len(sentences) < 6:
+    elif (seasons >= 5 or not newcomer) and len(sentences) < 6:
         sentences.append(f"As they continue their journey in the Sunday Movie League, they look to build on their experience and chase championship glory.")
     elif len(sentences) < 6:
         sentences.append(f"Still early in their SML career, they have plenty of time to develop their draft strategy and make their mark on league history.")
@@ -197,171 +192,22 @@ def generate_biography(member_name, profile_stats, profile_data):
     
     return f'<p>{paragraph_text}</p>'
 
-def move_biography_to_top(html_content):
-    """Move Biography section to appear right after profile stats and before Draft Statistics."""
-    # Find the Biography section (more flexible pattern)
-    bio_match = re.search(
-        r'(<section class="profile-section">\s*<h2 class="section-heading">Biography</h2>.*?</section>)',
-        html_content,
-        re.DOTALL
-    )
-    
-    if not bio_match:
-        return html_content
-    
-    bio_section = bio_match.group(1)
-    
-    # Remove the original Biography section
-    html_content = html_content.replace(bio_section, '', 1)
-    
-    # Find where to insert it - look for closing divs after profile-stats
-    # Try multiple patterns
-    patterns = [
-        r'(</div>\s*</div>\s*\n\s*<!-- Draft Statistics Section -->)',  # Exact match
-        r'(</div>\s*</div>\s*(?:\n\s*)?<!-- Draft Statistics Section -->)',  # Flexible whitespace
-        r'(</div>\s*</div>\s*(?:\n\s*)?<!-- Draft)',  # Partial match
-        r'(<!-- Draft Statistics Section -->)',  # Just the comment
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, html_content)
-        if match:
-            # Insert Biography section before Draft Statistics
-            insert_point = match.start()
-            before = html_content[:insert_point]
-            after = html_content[insert_point:]
-            
-            # Clean up any existing Biography Section comment
-            before = re.sub(r'\s*<!-- Biography Section -->\s*', '', before)
-            
-            # Insert the biography
-            html_content = before + '\n\n        <!-- Biography Section -->\n        ' + bio_section + '\n\n        ' + after
-            break
-    
-    return html_content
+def main():
+    """Regenerate the biographies by re-rendering the profile pages."""
+    parser = argparse.ArgumentParser(description="Generate biographies for all SML member profiles.")
+    parser.add_argument("members", nargs="*", help="member aliases to regenerate (default: all)")
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("generate_biographies", args)
 
-def process_profile(html_file):
-    """Process a single profile HTML file."""
-    print(f"Processing {html_file.name}...")
-    
-    # Read HTML
-    with open(html_file, 'r', encoding='utf-8') as f:
-        html_content = f.read()
-    
-    # Extract member name from HTML - try multiple patterns
-    name_match = re.search(r'<h1 class="profile-name">([^<]+)</h1>', html_content)
-    if not name_match:
-        # Try alternative pattern with more whitespace
-        name_match = re.search(r'<h1[^>]*class="profile-name"[^>]*>([^<]+)</h1>', html_content)
-    if not name_match:
-        # Try to get from filename as fallback
-        member_name = html_file.stem.capitalize()
-        print(f"  Using filename as member name: {member_name}")
-    else:
-        member_name = name_match.group(1).strip()
-    
-    # Extract profile stats from HTML
-    profile_stats = extract_profile_stats(html_content)
-    
-    # Load profile JSON data
-    json_file = DATA_DIR / f"{html_file.stem}.json"
-    if not json_file.exists():
-        print(f"  No JSON data found for {member_name}, using basic biography")
-        profile_data = {}
-    else:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            profile_data = json.load(f)
-    
-    # Generate biography
-    biography_html = generate_biography(member_name, profile_stats, profile_data)
-    
-    # Check if Biography section exists
-    bio_section_pattern = r'(<section class="profile-section">\s*<h2 class="section-heading">Biography</h2>\s*<div class="bio-content">).*?(</div>\s*</section>)'
-    bio_match = re.search(bio_section_pattern, html_content, re.DOTALL)
-    
-    if bio_match:
-        # Replace existing biography content - match the paragraph inside
-        html_content = re.sub(
-            r'(<div class="bio-content">)\s*<p>.*?</p>(\s*</div>)',
-            r'\1\n                ' + biography_html + '\n            \2',
-            html_content,
-            flags=re.DOTALL
-        )
-    else:
-        # Create new Biography section
-        bio_section = f"""        <section class="profile-section">
-            <h2 class="section-heading">Biography</h2>
-            <div class="bio-content">
-                {biography_html.replace(chr(10), chr(10) + '                ')}
-            </div>
-        </section>"""
-        
-        # Insert after profile-stats (before Draft Statistics)
-        # Try multiple patterns
-        patterns = [
-            r'(</div>\s*</div>\s*\n\s*<!-- Draft Statistics Section -->)',
-            r'(</div>\s*</div>\s*(?:\n\s*)?<!-- Draft Statistics Section -->)',
-            r'(<!-- Draft Statistics Section -->)',
-        ]
-        
-        inserted = False
-        for pattern in patterns:
-            match = re.search(pattern, html_content)
-            if match:
-                if '<!-- Draft Statistics Section -->' in pattern:
-                    # Insert before Draft Statistics
-                    html_content = html_content.replace(
-                        match.group(0),
-                        f'        <!-- Biography Section -->\n        {bio_section}\n\n        <!-- Draft Statistics Section -->'
-                    )
-                else:
-                    # Insert after closing divs
-                    html_content = html_content.replace(
-                        match.group(0),
-                        f'</div>\n        </div>\n\n        <!-- Biography Section -->\n        {bio_section}\n\n        <!-- Draft Statistics Section -->'
-                    )
-                inserted = True
-                break
-        
-        if not inserted:
-            # Last resort: find the comment and insert before it
-            html_content = html_content.replace(
-                '<!-- Draft Statistics Section -->',
-                f'        <!-- Biography Section -->\n        {bio_section}\n\n        <!-- Draft Statistics Section -->',
-                1
-            )
-    
-    # Move Biography section to top (if not already there)
-    html_content = move_biography_to_top(html_content)
-    
-    # Write updated HTML
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    print(f"  ✓ Updated biography for {member_name}")
+    # render_profiles imports generate_biography() from here
+    from render_profiles import render_all
+    written = render_all(args.members)
+    print(f"✓ Regenerated biographies, {len(written)} profile page(s) changed")
+    for output_file in written:
+        print(f"  ✓ {output_file}")
 
-def main():
-    """Process all profile HTML files."""
-    if not PROFILES_DIR.exists():
-        print(f"Error: {PROFILES_DIR} directory not found")
-        return
-    
-    profile_files = list(PROFILES_DIR.glob("*.html"))
-    
-    if not profile_files:
-        print("No profile HTML files found")
-        return
-    
-    print(f"Found {len(profile_files)} profile files\n")
-    
-    for html_file in sorted(profile_files):
-        try:
-            process_profile(html_file)
-        except Exception as e:
-            print(f"  ✗ Error processing {html_file.name}: {e}")
-    
-    print(f"\n✓ Completed processing {len(profile_files)} profiles")
+    build_profiler.finish()
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,239 @@
+"""
+Shared, lazily loaded league data for the build scripts.
+Drafts, season rankings, players, the league database and member profiles are
+read on first use and memoized per file, so every script (and every stage
+within a script) shares one parsed copy instead of re-reading or deep-copying
+it. When several files are needed at once they are read concurrently on a
+thread pool.
+
+Shared data is read-only: callers that need to change it take a thaw() copy.
+Set SML_READONLY_DATA=1 (in development and CI) to parse everything straight
+into frozen views, so an accidental mutation raises instead of leaking into
+every later reader. Parsing is about 3x slower that way, so it is off by
+default. Data handed to prime() is frozen regardless, since every league a
+workspace worker builds shares it.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import build_profiler
+from profile_format import expand_profile
+
+DRAFTS_DIR = Path("data/drafts")
+SEASONS_DIR = Path("data/seasons")
+PLAYERS_FILE = Path("data/players.json")
+LEAGUE_DATABASE = Path("data/league_database.json")
+PROFILES_DIR = Path("data/profiles")
+
+# Read files on a thread pool once at least this many are missing from the cache
+CONCURRENT_LOAD_MIN = 4
+MAX_LOAD_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+READ_ONLY = os.environ.get("SML_READONLY_DATA", "") not in ("", "0")
+
+# Absolute path -> ((mtime_ns, size), data); stale entries are reloaded
+_cache = {}
+
+class FrozenDict(dict):
+    """A dict that refuses changes; JSON-serializes and pickles like a dict."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared league data is read-only; use league_data.thaw() for a mutable copy")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+class FrozenList(list):
+    """A list that refuses changes; JSON-serializes and pickles like a list."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared league data is read-only; use league_data.thaw() for a mutable copy")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+def _freeze_value(value):
+    """Freeze a value json has already built (dicts inside it are frozen already)."""
+    if type(value) is list:
+        return FrozenList(_freeze_value(item) for item in value)
+    return value
+
+def _frozen_object(pairs):
+    """json object hook: build a FrozenDict with its list values frozen."""
+    return FrozenDict((key, _freeze_value(value)) for key, value in pairs)
+
+def freeze(data):
+    """Return a read-only view of plain dicts and lists (already frozen parts are reused)."""
+    if isinstance(data, FrozenDict) or isinstance(data, FrozenList):
+        return data
+    if isinstance(data, dict):
+        return FrozenDict((key, freeze(value)) for key, value in data.items())
+    if isinstance(data, list):
+        return FrozenList(freeze(item) for item in data)
+    return data
+
+def thaw(data):
+    """Return a plain, mutable deep copy of shared data."""
+    if isinstance(data, dict):
+        return {key: thaw(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [thaw(item) for item in data]
+    return data
+
+def parse_json(content):
+    """Parse JSON text (straight into frozen views with SML_READONLY_DATA)."""
+    if READ_ONLY:
+        return _freeze_value(json.loads(content, object_pairs_hook=_frozen_object))
+    return json.loads(content)
+
+def _signature(path):
+    """Identify a file's current version, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _read(path):
+    """Read and parse one file (runs on worker threads)."""
+    return parse_json(path.read_bytes())
+
+def load_many(paths):
+    """Load several JSON files, reading uncached ones concurrently.
+
+    Returns {path: data} for the files that exist.
+    """
+    paths = [Path(path) for path in paths]
+    results, missing = {}, []
+    for path in paths:
+        key = Path(os.path.abspath(path))
+        signature = _signature(key)
+        if signature is None:
+            continue
+        cached = _cache.get(key)
+        if cached and cached[0] == signature:
+            results[path] = cached[1]
+            build_profiler.count("json_cache_hits")
+        else:
+            missing.append((path, key, signature))
+
+    if missing:
+        with build_profiler.stage("load_json"):
+            if len(missing) >= CONCURRENT_LOAD_MIN:
+                with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(missing))) as pool:
+                    loaded = list(pool.map(_read, [key for _, key, _ in missing]))
+            else:
+                loaded = [_read(key) for _, key, _ in missing]
+        # Cache and count on this thread; the profiler isn't thread-safe
+        for (path, key, signature), data in zip(missing, loaded):
+            _cache[key] = (signature, data)
+            results[path] = data
+            build_profiler.count_file_read(key)
+    return results
+
+def load_json(path, default=None):
+    """Load one JSON file as shared read-only data, or return a default if it doesn't exist."""
+    return load_many([path]).get(Path(path), default)
+
+def read_json(path, default=None):
+    """Parse one JSON file without caching it (for single-pass streaming reads)."""
+    path = Path(path)
+    if not path.exists():
+        return default
+    data = _read(path)
+    build_profiler.count_file_read(path)
+    return data
+
+def year_files(directory):
+    """Map each year to its <year>.json file in a directory."""
+    return {int(path.stem): path for path in sorted(Path(directory).glob("*.json")) if path.stem.isdigit()}
+
+def _by_year(directory):
+    """Load every <year>.json file in a directory, keyed by year."""
+    files = year_files(directory)
+    loaded = load_many(files.values())
+    return FrozenDict((year, loaded[path]) for year, path in files.items() if path in loaded)
+
+def drafts():
+    """All draft files, keyed by year."""
+    return _by_year(DRAFTS_DIR)
+
+def draft(year):
+    """One year's draft, or None."""
+    return load_json(DRAFTS_DIR / f"{year}.json")
+
+def seasons():
+    """All season ranking files, keyed by year."""
+    return _by_year(SEASONS_DIR)
+
+def season(year):
+    """One year's season rankings, or None."""
+    return load_json(SEASONS_DIR / f"{year}.json")
+
+def players():
+    """The players database (empty if missing)."""
+    return load_json(PLAYERS_FILE, FrozenDict())
+
+def league_database():
+    """The league database (empty if missing)."""
+    return load_json(LEAGUE_DATABASE, FrozenDict())
+
+def preload(include_drafts=True, include_seasons=True, include_players=True, include_league=True):
+    """Warm the cache for everything a build needs in one concurrent pass."""
+    paths = []
+    if include_drafts:
+        paths += year_files(DRAFTS_DIR).values()
+    if include_seasons:
+        paths += year_files(SEASONS_DIR).values()
+    if include_players:
+        paths.append(PLAYERS_FILE)
+    if include_league:
+        paths.append(LEAGUE_DATABASE)
+    load_many(paths)
+
+def profile(member_id, default=None):
+    """A member's profile in the full format (see profile_format), whichever format it was stored in."""
+    path = PROFILES_DIR / f"{member_id}.json"
+    data = load_json(path)
+    if data is None:
+        return default
+    key = ("expanded", Path(os.path.abspath(path)))
+    cached = _cache.get(key)
+    if cached is None or cached[0] is not data:
+        expanded = expand_profile(data)
+        cached = (data, freeze(expanded) if READ_ONLY else expanded)
+        _cache[key] = cached
+    return cached[1]
+
+def cached_files(paths):
+    """[(absolute path, signature, data)] for loaded files, to hand to prime() in another process."""
+    entries = []
+    for path in paths:
+        key = Path(os.path.abspath(path))
+        if key in _cache:
+            entries.append((key.as_posix(), *_cache[key]))
+    return entries
+
+def prime(entries):
+    """Seed the cache with files another process already parsed (see cached_files()).
+
+    An entry whose file has changed since it was parsed is skipped, so that
+    file is read from disk as usual. The data is frozen (already frozen
+    parts are reused as is), so no league can change what the next one sees.
+    """
+    for path, signature, data in entries:
+        key = Path(path)
+        if _signature(key) == signature:
+            _cache[key] = (signature, freeze(data))
+
+def clear_cache():
+    """Forget everything loaded so far (the next access re-reads from disk)."""
+    _cache.clear()
@@ -0,0 +1,436 @@
+"""
+Bulk importer for the league platform's season export.
+Fetches draft results, standings, player season totals and weekly scores for
+any range of years and writes them in the shapes the build scripts already
+read: data/drafts/<year>.json, data/seasons/<year>.json and the season,
+playoff and matchup entries of league_database.json. Player names are
+resolved against players.json by player_resolver, falling back to
+normalize_player_id() for players it can't place, and owners by the member
+registry.
+
+The export is read as four JSON documents per season, relative to --base-url:
+
+    leagues/<league_id>/seasons/<year>/draft      {"picks": [{"round", "pick", "player", "position", "owner"}]}
+    leagues/<league_id>/seasons/<year>/standings  {"teams": [{"rank", "team_name", "owner", "record",
+                                                   "points_for", "points_against", "playoff_team"}],
+                                                   "champion", "runner_up"}
+    leagues/<league_id>/seasons/<year>/players    {"players": [{"player", "position", "points", "rank"}]}
+    leagues/<league_id>/seasons/<year>/scores     {"weeks": [{"week", "matchups": [{"home", "home_points",
+                                                   "away", "away_points"}]}]}
+
+Requests run concurrently over one pooled session (a keep-alive connection
+per worker thread) and are retried with exponential backoff on connection
+errors, 429s and 5xx responses. Every response is cached on disk under its
+URL with its ETag, so re-running an import only revalidates (304s) instead
+of downloading again. `serve` runs a local stand-in for the export, built
+from the data already in the repository, to try the importer against.
+"""
+
+import argparse
+import hashlib
+import http.client
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+import build_profiler
+import league_data
+import member_registry
+from calculate_profile_draft_stats import normalize_player_id
+from player_resolver import AUTO_ACCEPT, PlayerResolver, normalize_position
+
+CACHE_DIR = Path("data/import_cache")
+ENDPOINTS = ("draft", "standings", "players", "scores")
+ENDPOINT_PATH = "leagues/{league_id}/seasons/{year}/{endpoint}"
+
+MAX_FETCH_WORKERS = 8
+RETRIES = 4
+BACKOFF_SECONDS = 0.5
+TIMEOUT_SECONDS = 30
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_PORT = 8765
+
+# draft_pos prefix -> ppr_rankings key
+RANKING_KEYS = {"QB": "QB", "RB": "RB", "WR": "WR", "TE": "TE", "D/ST": "ST", "K": "K"}
+
+class ExportSession:
+    """A pooled, retrying, caching HTTP client for the export.
+
+    Safe to share between threads: each thread keeps its own keep-alive
+    connection, and the counters are updated under a lock (the profiler
+    isn't thread-safe, so callers report them from the main thread).
+    """
+
+    def __init__(self, base_url, cache_dir=CACHE_DIR, retries=RETRIES, backoff=BACKOFF_SECONDS,
+                 timeout=TIMEOUT_SECONDS):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.cache_dir = Path(cache_dir)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.stats = {"requests": 0, "downloaded": 0, "not_modified": 0, "retries": 0}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _connection(self, url):
+        """The calling thread's open connection to the export host."""
+        parts = urlsplit(url)
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            connection = connection_class(parts.netloc, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def _reset(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def cache_file(self, url):
+        return self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get_json(self, path):
+        """GET a document relative to the base URL, revalidating any cached copy by its ETag."""
+        url = urljoin(self.base_url, path)
+        cache_file = self.cache_file(url)
+        cached = league_data.read_json(cache_file)
+        headers = {"Accept": "application/json"}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+
+        parts = urlsplit(url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt
+            try:
+                connection = self._connection(url)
+                connection.request("GET", target, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException) as error:
+                self._reset()
+                failure = error
+            else:
+                self._count("requests")
+                if response.status == 304 and cached:
+                    self._count("not_modified")
+                    return json.loads(cached["body"])
+                if response.status == 200:
+                    self._count("downloaded")
+                    text = body.decode("utf-8")
+                    data = json.loads(text)
+                    etag = response.getheader("ETag")
+                    if etag:
+                        self.cache_dir.mkdir(parents=True, exist_ok=True)
+                        with open(cache_file, "w") as f:
+                            json.dump({"url": url, "etag": etag, "body": text}, f)
+                    return data
+                if response.status not in RETRY_STATUSES:
+                    raise ConnectionError(f"GET {url} failed: {response.status} {response.reason}")
+                failure = f"{response.status} {response.reason}"
+                retry_after = response.getheader("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, int(retry_after))
+            if attempt < self.retries:
+                self._count("retries")
+                time.sleep(delay)
+        raise ConnectionError(f"GET {url} failed after {self.retries + 1} attempts: {failure}")
+
+def parse_years(values):
+    """Expand year arguments like 2016-2020 and 2023 into a sorted list of years."""
+    years = set()
+    for value in values:
+        first, _, last = str(value).partition("-")
+        years.update(range(int(first), int(last or first) + 1))
+    return sorted(years)
+
+def resolve_player_id(resolver, name, position, unknown):
+    """A confidently resolved player_id, or normalize_player_id(name) noted as unknown."""
+    match = resolver.resolve(name, position)
+    if match["player_id"] and match["confidence"] >= AUTO_ACCEPT:
+        return match["player_id"]
+    player_id = normalize_player_id(name)
+    unknown.add(player_id)
+    return player_id
+
+def convert_draft(year, export, resolver, unknown):
+    """Export draft results -> the data/drafts/<year>.json shape, numbering draft_pos by position."""
+    picks = []
+    drafted = {}
+    for pick in sorted(export["picks"], key=lambda pick: (pick["round"], pick["pick"])):
+        position = normalize_position(pick["position"])
+        drafted[position] = drafted.get(position, 0) + 1
+        picks.append({
+            "round": pick["round"],
+            "pick": pick["pick"],
+            "player_id": resolve_player_id(resolver, pick["player"], position, unknown),
+            "owner": pick["owner"],
+            "draft_pos": f"{position} {drafted[position]}"
+        })
+    return {"year": year, "picks": picks}
+
+def convert_rankings(year, export, resolver, unknown):
+    """Export player season totals -> the data/seasons/<year>.json shape."""
+    rankings = {key: [] for key in RANKING_KEYS.values()}
+    for player in sorted(export["players"], key=lambda player: player["rank"]):
+        position = normalize_position(player["position"])
+        if position not in RANKING_KEYS:
+            continue
+        rankings[RANKING_KEYS[position]].append({
+            "player_id": resolve_player_id(resolver, player["player"], position, unknown),
+            "ppr": player["points"],
+            "rank": player["rank"]
+        })
+    return {"year": year, "ppr_rankings": rankings}
+
+def convert_standings(year, export, registry):
+    """Export standings -> league_database.json season and playoff entries."""
+    standings = []
+    for team in sorted(export["teams"], key=lambda team: team["rank"]):
+        standings.append({
+            "rank": team["rank"],
+            "team_name": team.get("team_name") or team["owner"],
+            "owner": team["owner"],
+            "owner_alias": member_registry.member_id(team["owner"], registry),
+            "record": team["record"],
+            "points_for": team["points_for"],
+            "points_against": team["points_against"],
+            "playoff_team": team.get("playoff_team", False)
+        })
+    playoffs = {
+        "year": year,
+        "champion": member_registry.member_id(export["champion"], registry) if export.get("champion") else None,
+        "runner_up": member_registry.member_id(export["runner_up"], registry) if export.get("runner_up") else None,
+        "bracket_results": []
+    }
+    return {"year": year, "standings": standings}, playoffs
+
+def convert_scores(export, registry):
+    """Export weekly scores -> a flat list of matchups between member ids."""
+    return [
+        {
+            "week": week["week"],
+            "home": member_registry.member_id(matchup["home"], registry),
+            "home_points": matchup["home_points"],
+            "away": member_registry.member_id(matchup["away"], registry),
+            "away_points": matchup["away_points"]
+        }
+        for week in sorted(export["weeks"], key=lambda week: week["week"])
+        for matchup in week["matchups"]
+    ]
+
+def fetch_seasons(session, league_id, years, workers=MAX_FETCH_WORKERS):
+    """Fetch every endpoint for every year concurrently; returns {(year, endpoint): document}."""
+    keys = [(year, endpoint) for year in years for endpoint in ENDPOINTS]
+    paths = [ENDPOINT_PATH.format(league_id=league_id, year=year, endpoint=endpoint) for year, endpoint in keys]
+    with build_profiler.stage("fetch"):
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(paths)))) as pool:
+            documents = list(pool.map(session.get_json, paths))
+    for name, value in session.stats.items():
+        build_profiler.count(f"http_{name}", value)
+    return dict(zip(keys, documents))
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+def import_seasons(session, years, data_dir=Path("data"), force=False, workers=MAX_FETCH_WORKERS):
+    """Import the given years into data_dir; returns (imported years, skipped years, unresolved player ids).
+
+    Years that already have a draft file are skipped unless force is set, so
+    a backfill never overwrites hand-checked seasons.
+    """
+    data_dir = Path(data_dir)
+    database_file = data_dir / league_data.LEAGUE_DATABASE.name
+    # A fresh data directory starts from the repository's league database
+    database = league_data.thaw(league_data.read_json(database_file) or league_data.league_database())
+    league_id = database.get("league_id")
+    if not league_id:
+        raise ValueError(f"{database_file} has no league_id to import")
+
+    existing = league_data.year_files(data_dir / league_data.DRAFTS_DIR.name)
+    skipped = [year for year in years if year in existing and not force]
+    years = [year for year in years if year not in skipped]
+    if not years:
+        return [], skipped, set()
+
+    documents = fetch_seasons(session, league_id, years, workers)
+    registry = member_registry.build_registry(database, league_data.load_json(member_registry.MEMBER_ALIASES_FILE, {}))
+    resolver = PlayerResolver()
+    unknown = set()
+
+    with build_profiler.stage("write"):
+        for year in years:
+            draft = convert_draft(year, documents[(year, "draft")], resolver, unknown)
+            rankings = convert_rankings(year, documents[(year, "players")], resolver, unknown)
+            season, playoffs = convert_standings(year, documents[(year, "standings")], registry)
+            matchups = convert_scores(documents[(year, "scores")], registry)
+            if matchups:
+                season["matchups"] = matchups
+
+            write_json(data_dir / league_data.DRAFTS_DIR.name / f"{year}.json", draft)
+            write_json(data_dir / league_data.SEASONS_DIR.name / f"{year}.json", rankings)
+            database.setdefault("seasons", {})[str(year)] = season
+            database.setdefault("playoffs", {})[str(year)] = playoffs
+
+        database["seasons"] = dict(sorted(database["seasons"].items()))
+        database["playoffs"] = dict(sorted(database["playoffs"].items()))
+        database["scraped_at"] = datetime.now().isoformat(timespec="seconds")
+        write_json(database_file, database)
+    league_data.clear_cache()
+    return years, skipped, unknown
+
+def export_documents(league_id):
+    """Build the export documents for every season in the repository (for the stand-in server)."""
+    database = league_data.league_database()
+    players = league_data.players().get("players", {})
+    documents = {}
+    for year in sorted(set(league_data.drafts()) | {int(year) for year in database.get("seasons", {})}):
+        prefix = ENDPOINT_PATH.format(league_id=league_id, year=year, endpoint="")
+        draft = league_data.draft(year) or {"picks": []}
+        documents[prefix + "draft"] = {"picks": [
+            {
+                "round": pick["round"],
+                "pick": pick["pick"],
+                "player": players.get(pick["player_id"], {}).get("name", pick["player_id"]),
+                "position": pick["draft_pos"].split()[0],
+                "owner": pick["owner"]
+            }
+            for pick in draft["picks"]
+        ]}
+        season = league_data.season(year) or {"ppr_rankings": {}}
+        ranking_positions = {key: position for position, key in RANKING_KEYS.items()}
+        documents[prefix + "players"] = {"players": [
+            {
+                "player": players.get(entry["player_id"], {}).get("name", entry["player_id"]),
+                "position": ranking_positions.get(key.upper(), key.upper()),
+                "points": entry["ppr"],
+                "rank": entry["rank"]
+            }
+            for key, entries in season["ppr_rankings"].items()
+            for entry in entries
+        ]}
+        standings = database.get("seasons", {}).get(str(year), {})
+        playoffs = database.get("playoffs", {}).get(str(year), {})
+        documents[prefix + "standings"] = {
+            "teams": [
+                {key: row[key] for key in ("rank", "team_name", "owner", "record", "points_for",
+                                           "points_against", "playoff_team")}
+                for row in standings.get("standings", [])
+            ],
+            "champion": playoffs.get("champion"),
+            "runner_up": playoffs.get("runner_up")
+        }
+        weeks = {}
+        for matchup in standings.get("matchups", []):
+            weeks.setdefault(matchup["week"], []).append(
+                {key: matchup[key] for key in ("home", "home_points", "away", "away_points")})
+        documents[prefix + "scores"] = {"weeks": [{"week": week, "matchups": weeks[week]} for week in sorted(weeks)]}
+    return {f"/{path}": json.dumps(document).encode() for path, document in documents.items()}
+
+def serve(port=DEFAULT_PORT, fail_every=0):
+    """Serve the repository's own seasons as a stand-in export, with ETags and optional 503s."""
+    league_id = league_data.league_database().get("league_id")
+    documents = export_documents(league_id)
+    etags = {path: f'"{hashlib.sha256(body).hexdigest()[:16]}"' for path, body in documents.items()}
+    requests = {"count": 0}
+    lock = threading.Lock()
+
+    class ExportHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def send(self, status, body=b"", headers=()):
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            with lock:
+                requests["count"] += 1
+                failing = fail_every and requests["count"] % fail_every == 0
+            path = urlsplit(self.path).path
+            if failing:
+                self.send(503, headers=[("Retry-After", "0")])
+            elif path not in documents:
+                self.send(404)
+            elif self.headers.get("If-None-Match") == etags[path]:
+                self.send(304, headers=[("ETag", etags[path])])
+            else:
+                self.send(200, documents[path], [("Content-Type", "application/json"), ("ETag", etags[path])])
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), ExportHandler)
+    print(f"✓ Serving {len(documents) // len(ENDPOINTS)} seasons of league {league_id} "
+          f"at http://127.0.0.1:{port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main():
+    """Import seasons from the league export, or serve a local stand-in export."""
+    parser = argparse.ArgumentParser(description="Import drafts, standings and scores from the league export.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    importer = subparsers.add_parser("import", help="import seasons into the data directory")
+    importer.add_argument("years", nargs="+", help="years or ranges to import, e.g. 2016-2020 2023")
+    importer.add_argument("--base-url", required=True, help="base URL of the league export")
+    importer.add_argument("--data-dir", type=Path, default=Path("data"), help="where to write (default: data)")
+    importer.add_argument("--force", action="store_true", help="overwrite years that already have a draft file")
+    importer.add_argument("--workers", type=int, default=MAX_FETCH_WORKERS,
+                          help=f"concurrent requests (default: {MAX_FETCH_WORKERS})")
+    importer.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help=f"response cache (default: {CACHE_DIR})")
+    build_profiler.add_arguments(importer)
+
+    stand_in = subparsers.add_parser("serve", help="serve this repository's seasons as a local stand-in export")
+    stand_in.add_argument("--port", type=int, default=DEFAULT_PORT)
+    stand_in.add_argument("--fail-every", type=int, default=0, help="answer every Nth request with a 503")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.port, args.fail_every)
+        return
+
+    build_profiler.setup("league_importer", args)
+    start = time.perf_counter()
+    session = ExportSession(args.base_url, args.cache_dir)
+    try:
+        imported, skipped, unknown = import_seasons(session, parse_years(args.years), args.data_dir, args.force,
+                                                    args.workers)
+    except ConnectionError as error:
+        print(f"✗ Import failed, nothing was written: {error}")
+        sys.exit(1)
+    stats = session.stats
+    print(f"✓ Imported {len(imported)} seasons in {time.perf_counter() - start:.1f}s "
+          f"({stats['requests']} requests, {stats['not_modified']} unchanged, {stats['retries']} retries)")
+    for year in imported:
+        print(f"  ✓ {year}")
+    if skipped:
+        print(f"  ⚠️  Skipped {', '.join(map(str, skipped))}: draft files exist (use --force to overwrite)")
+    if unknown:
+        print(f"  ⚠️  {len(unknown)} players weren't resolved against players.json: {', '.join(sorted(unknown)[:10])}"
+              + (" ..." if len(unknown) > 10 else ""))
+    build_profiler.finish()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+"""
+SQLite league store with an indexed query API.
+Loads drafts, seasons, players, the league database and league history into
+one local SQLite file so scripts and ad-hoc analyses can query every season
+without re-parsing the JSON files.
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+import build_profiler
+import member_registry
+from league_data import load_json
+from calculate_profile_draft_stats import (
+    build_season_finish_index,
+    collect_input_hashes,
+    load_all_drafts,
+    load_all_seasons,
+    parse_draft_pos,
+)
+
+STORE_PATH = Path("data/league.sqlite")
+LEAGUE_HISTORY = Path("data/league_history.json")
+MEMBER_SEASON_RECORDS = Path("data/member_season_records.json")
+
+HIT_TYPES = ("hit", "extreme_hit", "super_hit")
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+
+CREATE TABLE players (
+    player_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    position TEXT,
+    positions TEXT NOT NULL
+);
+CREATE TABLE player_teams (
+    player_id TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    PRIMARY KEY (player_id, year)
+);
+
+CREATE TABLE picks (
+    year INTEGER NOT NULL,
+    ordinal INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    pick INTEGER NOT NULL,
+    owner TEXT NOT NULL,
+    member_id TEXT NOT NULL,
+    player_id TEXT,
+    draft_pos TEXT,
+    draft_pos_num INTEGER,
+    PRIMARY KEY (year, ordinal)
+);
+CREATE INDEX picks_year_player ON picks (year, player_id);
+CREATE INDEX picks_owner ON picks (member_id);
+CREATE INDEX picks_round ON picks (round);
+
+CREATE TABLE season_finishes (
+    year INTEGER NOT NULL,
+    position TEXT NOT NULL,
+    player_id TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    ppr REAL,
+    PRIMARY KEY (year, position, player_id)
+);
+
+CREATE TABLE members (
+    member_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    playoff_record TEXT,
+    season_record TEXT
+);
+CREATE TABLE member_names (
+    name_key TEXT PRIMARY KEY,
+    member_id TEXT NOT NULL
+);
+CREATE TABLE member_years (
+    member_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    PRIMARY KEY (member_id, kind, year, source)
+);
+
+CREATE TABLE standings (
+    year INTEGER NOT NULL,
+    member_id TEXT NOT NULL,
+    team_name TEXT,
+    rank INTEGER,
+    record TEXT,
+    points_for REAL,
+    points_against REAL,
+    PRIMARY KEY (year, member_id)
+);
+CREATE INDEX standings_owner ON standings (member_id);
+
+CREATE TABLE playoffs (
+    year INTEGER PRIMARY KEY,
+    champion TEXT,
+    runner_up TEXT
+);
+
+-- Every pick graded the same way as calculate_value()
+CREATE VIEW graded_picks AS
+SELECT
+    p.year, p.ordinal, p.round, p.pick, p.owner, p.member_id, p.player_id,
+    COALESCE(pl.name, 'Unknown') AS player_name,
+    COALESCE(pl.position, 'UNK') AS position,
+    p.draft_pos, p.draft_pos_num,
+    f.rank AS season_finish_num,
+    f.ppr AS ppr_points,
+    CASE WHEN f.rank IS NULL THEN NULL ELSE p.draft_pos_num - f.rank END AS value_diff,
+    CASE
+        WHEN f.rank IS NULL THEN 'miss'
+        WHEN p.draft_pos_num - f.rank >= 30 THEN 'super_hit'
+        WHEN p.draft_pos_num - f.rank >= 15 THEN 'extreme_hit'
+        WHEN p.draft_pos_num - f.rank >= 6 THEN 'hit'
+        WHEN abs(p.draft_pos_num - f.rank) <= 5 THEN 'push'
+        ELSE 'miss'
+    END AS value_type
+FROM picks p
+LEFT JOIN players pl ON pl.player_id = p.player_id
+LEFT JOIN season_finishes f
+    ON f.year = p.year AND f.position = upper(COALESCE(pl.position, 'UNK')) AND f.player_id = p.player_id;
+"""
+
+def store_inputs_hash():
+    """Hash every input file the store is built from."""
+    input_hashes = collect_input_hashes()
+    for path in [LEAGUE_HISTORY, MEMBER_SEASON_RECORDS]:
+        if path.exists():
+            input_hashes[path.as_posix()] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return hashlib.sha256(json.dumps(input_hashes, sort_keys=True).encode()).hexdigest()
+
+def load_picks(conn, drafts):
+    """Insert every draft pick, keeping each draft's pick order."""
+    rows = []
+    for year, draft_data in drafts.items():
+        for ordinal, pick in enumerate(draft_data.get("picks", [])):
+            if not pick.get("owner"):
+                continue
+            rows.append((
+                year, ordinal, pick.get("round", 0), pick.get("pick", 0), pick["owner"],
+                member_registry.member_id(pick["owner"]), pick.get("player_id"),
+                pick.get("draft_pos", ""), parse_draft_pos(pick.get("draft_pos", ""))
+            ))
+    conn.executemany("INSERT INTO picks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+def load_players(conn, players_data):
+    """Insert players and the team they played for each year."""
+    players, teams = [], []
+    for player_id, info in players_data.get("players", {}).items():
+        positions = info.get("positions", [])
+        players.append((player_id, info.get("name", "Unknown"), positions[0] if positions else None,
+                        json.dumps(positions)))
+        for year, team in (info.get("teams_by_year") or {}).items():
+            teams.append((player_id, int(year), team))
+    conn.executemany("INSERT INTO players VALUES (?, ?, ?, ?)", players)
+    conn.executemany("INSERT INTO player_teams VALUES (?, ?, ?)", teams)
+
+def load_season_finishes(conn, seasons):
+    """Insert season finishes, rejecting players ranked twice at one position."""
+    finish_index = build_season_finish_index(seasons)
+    conn.executemany(
+        "INSERT INTO season_finishes VALUES (?, ?, ?, ?, ?)",
+        [(year, position, player_id, rank, ppr) for (year, position, player_id), (rank, ppr) in finish_index.items()]
+    )
+
+def load_league(conn, league_data, league_history, season_records):
+    """Insert members, standings, playoffs and league history."""
+    registry = member_registry.load_registry()
+    conn.executemany("INSERT INTO member_names VALUES (?, ?)", registry["lookup"].items())
+
+    members = {}
+    for member_id, member in registry["members"].items():
+        members[member_id] = [member["name"], None, None]
+    for alias, member in league_data.get("members", {}).items():
+        members.setdefault(alias, [member.get("name") or alias, None, None])[1] = member.get("playoff_record")
+    for alias, record in season_records.items():
+        members.setdefault(alias, [alias, None, None])[2] = record.get("season_record")
+    conn.executemany("INSERT INTO members VALUES (?, ?, ?, ?)",
+                     [(member_id, *values) for member_id, values in members.items()])
+
+    member_years = set()
+    for alias, member in league_data.get("members", {}).items():
+        for year in member.get("playoff_appearances") or []:
+            member_years.add((alias, "playoff_appearance", int(year), "league_database"))
+    for alias, history in league_history.items():
+        for kind, key in [("championship", "championships"), ("runner_up", "runner_ups"),
+                          ("playoff_appearance", "playoff_appearances")]:
+            for year in history.get(key, []):
+                member_years.add((alias, kind, int(year), "league_history"))
+    conn.executemany("INSERT INTO member_years VALUES (?, ?, ?, ?)", sorted(member_years))
+
+    standings = []
+    for year, season in league_data.get("seasons", {}).items():
+        for row in season.get("standings", []):
+            if row.get("owner_alias"):
+                standings.append((int(year), row["owner_alias"], row.get("team_name"), row.get("rank"),
+                                  row.get("record"), row.get("points_for"), row.get("points_against")))
+    conn.executemany("INSERT INTO standings VALUES (?, ?, ?, ?, ?, ?, ?)", standings)
+
+    conn.executemany(
+        "INSERT INTO playoffs VALUES (?, ?, ?)",
+        [(int(year), playoff.get("champion"), playoff.get("runner_up"))
+         for year, playoff in league_data.get("playoffs", {}).items()]
+    )
+
+def build_store(db_path=STORE_PATH, force=False):
+    """Build the store from the JSON data unless it is already up to date.
+
+    Returns True if the store was (re)built.
+    """
+    db_path = Path(db_path)
+    with build_profiler.stage("hash_inputs"):
+        inputs_hash = store_inputs_hash()
+    if not force and db_path.exists():
+        with sqlite3.connect(db_path) as conn:
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'inputs_hash'").fetchone()
+            except sqlite3.DatabaseError:
+                row = None
+        if row and row[0] == inputs_hash:
+            return False
+
+    drafts = load_all_drafts()
+    seasons = load_all_seasons()
+    players_data = load_json("data/players.json", {})
+    league_data = load_json(member_registry.LEAGUE_DATABASE, {})
+    league_history = load_json(LEAGUE_HISTORY, {})
+    season_records = load_json(MEMBER_SEASON_RECORDS, {})
+
+    # Build into a temporary file so readers never see a half-built store
+    tmp_path = db_path.with_suffix(".tmp")
+    tmp_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path.unlink(missing_ok=True)
+    with build_profiler.stage("build_store"):
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.executescript(SCHEMA)
+            load_players(conn, players_data)
+            picks = load_picks(conn, drafts)
+            load_season_finishes(conn, seasons)
+            load_league(conn, league_data, league_history, season_records)
+            conn.execute("INSERT INTO meta VALUES ('inputs_hash', ?)", (inputs_hash,))
+            conn.commit()
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+    tmp_path.replace(db_path)
+    build_profiler.count("picks_stored", picks)
+    return True
+
+def connect(db_path=STORE_PATH, build=True):
+    """Open the store (building or refreshing it first unless build=False)."""
+    if build:
+        build_store(db_path)
+    elif not Path(db_path).exists():
+        raise FileNotFoundError(f"League store not found at {db_path}; run scripts/league_store.py build")
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def load_draft_inputs(conn):
+    """Load drafts, players and the season finish index in the shapes calculate_member_stats() uses."""
+    drafts = {}
+    for row in conn.execute("SELECT year, round, pick, owner, player_id, draft_pos FROM picks ORDER BY year, ordinal"):
+        drafts.setdefault(row["year"], {"year": row["year"], "picks": []})["picks"].append({
+            "round": row["round"], "pick": row["pick"], "player_id": row["player_id"],
+            "owner": row["owner"], "draft_pos": row["draft_pos"]
+        })
+
+    players = {}
+    for row in conn.execute("SELECT player_id, name, positions FROM players"):
+        players[row["player_id"]] = {"name": row["name"], "positions": json.loads(row["positions"]),
+                                     "teams_by_year": {}}
+    for row in conn.execute("SELECT player_id, year, team FROM player_teams"):
+        players[row["player_id"]]["teams_by_year"][str(row["year"])] = row["team"]
+
+    finish_index = {
+        (row["year"], row["position"], row["player_id"]): (row["rank"], row["ppr"])
+        for row in conn.execute("SELECT year, position, player_id, rank, ppr FROM season_finishes")
+    }
+    return drafts, {"players": players}, finish_index
+
+def member_picks(conn, member):
+    """Get a member's graded picks (by any of their names) in draft order."""
+    return [dict(row) for row in conn.execute(
+        "SELECT * FROM graded_picks WHERE member_id = ? ORDER BY year, ordinal",
+        (member_registry.member_id(member),)
+    )]
+
+def hit_rate_by_round(conn, member=None):
+    """Hit rate per draft round, league-wide or for one member."""
+    where, params = ("WHERE member_id = ?", (member_registry.member_id(member),)) if member else ("", ())
+    return [dict(row) for row in conn.execute(f"""
+        SELECT round, COUNT(*) AS picks,
+               SUM(value_type IN {HIT_TYPES}) AS hits,
+               ROUND(100.0 * SUM(value_type IN {HIT_TYPES}) / COUNT(*), 1) AS hit_rate
+        FROM graded_picks {where}
+        GROUP BY round ORDER BY round
+    """, params)]
+
+def hit_rate_by_position(conn, member=None):
+    """Hit rate per player position, league-wide or for one member."""
+    where, params = ("WHERE member_id = ?", (member_registry.member_id(member),)) if member else ("", ())
+    return [dict(row) for row in conn.execute(f"""
+        SELECT position, COUNT(*) AS picks,
+               SUM(value_type IN {HIT_TYPES}) AS hits,
+               ROUND(100.0 * SUM(value_type IN {HIT_TYPES}) / COUNT(*), 1) AS hit_rate
+        FROM graded_picks {where}
+        GROUP BY position ORDER BY picks DESC, position
+    """, params)]
+
+def best_value_by_position(conn, year=None):
+    """The best-value pick at each position in each season."""
+    where, params = ("AND year = ?", (year,)) if year is not None else ("", ())
+    return [dict(row) for row in conn.execute(f"""
+        SELECT year, position, member_id, player_name, draft_pos, season_finish_num, value_diff
+        FROM (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY year, position ORDER BY value_diff DESC, round, pick
+            ) AS position_rank
+            FROM graded_picks WHERE value_diff IS NOT NULL {where}
+        )
+        WHERE position_rank = 1
+        ORDER BY year, position
+    """, params)]
+
+def member_summary(conn, member):
+    """Titles, playoff years, records and standings rows for one member.
+
+    Championships and runner-ups combine league history with the league
+    database playoffs; playoff years and record come from the league database.
+    """
+    member_id = member_registry.member_id(member)
+    row = conn.execute("SELECT * FROM members WHERE member_id = ?", (member_id,)).fetchone()
+
+    def years(query):
+        return sorted(str(r[0]) for r in conn.execute(query, (member_id, member_id)))
+
+    championships = years("""
+        SELECT year FROM member_years WHERE member_id = ? AND kind = 'championship'
+        UNION SELECT year FROM playoffs WHERE champion = ?""")
+    runner_ups = years("""
+        SELECT year FROM member_years WHERE member_id = ? AND kind = 'runner_up'
+        UNION SELECT year FROM playoffs WHERE runner_up = ? AND champion IS NOT runner_up""")
+    playoff_years = sorted(str(r[0]) for r in conn.execute(
+        "SELECT year FROM member_years WHERE member_id = ? AND kind = 'playoff_appearance' AND source = 'league_database'",
+        (member_id,)
+    ))
+    standings = {
+        str(r["year"]): dict(r)
+        for r in conn.execute("SELECT * FROM standings WHERE member_id = ? ORDER BY year", (member_id,))
+    }
+    return {
+        "member_id": member_id,
+        "name": row["name"] if row else member,
+        "championship_years": championships,
+        "runner_up_years": runner_ups,
+        "playoff_years": playoff_years,
+        "playoff_record": row["playoff_record"] if row else None,
+        "season_record": row["season_record"] if row else None,
+        "standings": standings
+    }
+
+def print_rows(rows):
+    """Print query rows as an aligned table."""
+    if not rows:
+        print("(no rows)")
+        return
+    columns = list(rows[0])
+    widths = [max(len(str(column)), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("  ".join(str(column).ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+def main():
+    """Build the league store or run one of its queries."""
+    parser = argparse.ArgumentParser(description="Build and query the SQLite league store.")
+    parser.add_argument("command", choices=["build", "hit-rate-by-round", "hit-rate-by-position", "best-value", "member"])
+    parser.add_argument("--db", type=Path, default=STORE_PATH)
+    parser.add_argument("--force", action="store_true", help="rebuild even if the inputs are unchanged")
+    parser.add_argument("--member", help="limit hit rates to one member, or the member to summarize")
+    parser.add_argument("--year", type=int, help="limit best-value picks to one season")
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("league_store", args)
+
+    start = time.perf_counter()
+    if args.command == "build":
+        rebuilt = build_store(args.db, force=args.force)
+        state = "Built" if rebuilt else "Up to date:"
+        print(f"✓ {state} {args.db} in {(time.perf_counter() - start) * 1000:.1f} ms")
+        build_profiler.finish()
+        return
+
+    conn = connect(args.db)
+    query_start = time.perf_counter()
+    with build_profiler.stage("query"):
+        if args.command == "hit-rate-by-round":
+            rows = hit_rate_by_round(conn, args.member)
+        elif args.command == "hit-rate-by-position":
+            rows = hit_rate_by_position(conn, args.member)
+        elif args.command == "best-value":
+            rows = best_value_by_position(conn, args.year)
+        else:
+            if not args.member:
+                parser.error("member requires --member")
+            summary = member_summary(conn, args.member)
+            summary["standings"] = list(summary["standings"].values())
+            print(json.dumps(summary, indent=2))
+            rows = None
+    if rows is not None:
+        print_rows(rows)
+    print(f"\n⏱️  Query took {(time.perf_counter() - query_start) * 1000:.1f} ms")
+    conn.close()
+    build_profiler.finish()
+
+if __name__ == "__main__":
+    main()
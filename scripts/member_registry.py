@@ -0,0 +1,79 @@
+"""
+Canonical member registry.
+Draft files name owners by full name ("Brandon Kircher") while the league
+database, league history and pages use aliases ("kircher"). The registry maps
+every known name, alias or filename to one member id (the league alias) so
+each script computes and writes exactly one artifact per member.
+"""
+
+from pathlib import Path
+
+import league_data
+
+LEAGUE_DATABASE = league_data.LEAGUE_DATABASE
+MEMBER_ALIASES_FILE = Path("data/member_aliases.json")
+
+_registries = {}
+
+def lookup_key(name):
+    """Normalize a name, alias or filename for lookup."""
+    return " ".join(str(name).replace("-", " ").replace("_", " ").split()).lower()
+
+def slugify(name):
+    """Build a filename-safe id for a name the registry doesn't know."""
+    return lookup_key(name).replace(" ", "-")
+
+def build_registry(league, member_aliases):
+    """Build the registry from league database members and extra aliases.
+
+    Returns {"members": {id: {"id", "name", "aliases"}}, "lookup": {key: id}}.
+    Raises ValueError if one name would resolve to two different members.
+    """
+    members = {}
+    for alias, member in league.get("members", {}).items():
+        members[alias] = {"id": alias, "name": member.get("name") or alias, "aliases": []}
+    for alias, names in member_aliases.items():
+        members.setdefault(alias, {"id": alias, "name": alias, "aliases": []})
+        members[alias]["aliases"] = list(names)
+
+    lookup = {}
+    for member_id, member in members.items():
+        for name in [member_id, member["name"], *member["aliases"]]:
+            key = lookup_key(name)
+            if lookup.get(key, member_id) != member_id:
+                raise ValueError(f"Member name '{name}' matches both {lookup[key]} and {member_id}")
+            lookup[key] = member_id
+    return {"members": members, "lookup": lookup}
+
+def load_registry():
+    """Load the registry for the current data directory (cached per directory)."""
+    cache_key = Path.cwd()
+    if cache_key not in _registries:
+        _registries[cache_key] = build_registry(league_data.league_database(),
+                                                league_data.load_json(MEMBER_ALIASES_FILE, {}))
+    return _registries[cache_key]
+
+def clear_cache():
+    """Forget the registries built so far (the next lookup rebuilds from disk)."""
+    _registries.clear()
+
+def member_id(name, registry=None):
+    """Resolve any name, alias or filename to its member id.
+
+    Names the registry doesn't know get a slug of the name, so synthetic or
+    brand-new owners still get exactly one stable id.
+    """
+    registry = registry or load_registry()
+    key = lookup_key(name)
+    return registry["lookup"].get(key) or key.replace(" ", "-")
+
+def member_name(name, registry=None):
+    """Get the display name for any name, alias or filename."""
+    registry = registry or load_registry()
+    member = registry["members"].get(member_id(name, registry))
+    return member["name"] if member else name
+
+def is_known(name, registry=None):
+    """Check whether a name resolves to a registered member."""
+    registry = registry or load_registry()
+    return lookup_key(name) in registry["lookup"]
@@ -0,0 +1,302 @@
+"""
+Indexed player-name resolver.
+Maps raw player names from draft boards, rankings or the league export to
+player_ids in data/players.json. Names are reduced to a normalized key
+(accents, punctuation and Jr./Sr./II-V suffixes dropped, common first-name
+nicknames and team defenses folded together) and looked up in a dict;
+names with no exact key fall back to a character-trigram index scored by
+Jaccard similarity. Every match carries a confidence, and matches that could
+be more than one player are reported as ambiguous instead of guessed.
+
+New players are collected in memory and appended to players.json in one
+write by save(), so ingesting a season of rankings is one pass and one file
+write whatever its size.
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+import unicodedata
+
+import build_profiler
+import league_data
+from calculate_profile_draft_stats import normalize_player_id
+
+# Exact key matches are certain; the rest are scaled down so they sort below them
+EXACT_CONFIDENCE = 1.0
+ALIAS_CONFIDENCE = 0.95
+# Trigram matches below this similarity aren't offered at all
+MIN_SIMILARITY = 0.5
+# A runner-up this close to the best trigram match makes the match ambiguous
+AMBIGUITY_MARGIN = 0.05
+# Matches at or above this confidence can be used without review
+AUTO_ACCEPT = 0.9
+
+SUFFIX_PATTERN = re.compile(r"\s+(?:jr|sr|ii|iii|iv|v)\.?$")
+NON_ALNUM_PATTERN = re.compile(r"[^a-z0-9]+")
+DEFENSE_PATTERN = re.compile(r"(?:^|\s+)(?:d\s*/\s*st|dst|def|defense)$")
+
+# First-name nicknames -> the name players.json is most likely to use
+FIRST_NAME_ALIASES = {
+    "mike": "michael", "gabe": "gabriel", "matt": "matthew", "chris": "christopher",
+    "josh": "joshua", "will": "william", "tony": "anthony", "jake": "jacob",
+    "nick": "nicholas", "dan": "daniel", "danny": "daniel", "ken": "kenneth",
+    "kenny": "kenneth", "rob": "robert", "bob": "robert", "joe": "joseph",
+    "jon": "jonathan", "zach": "zachary", "zack": "zachary", "alex": "alexander",
+    "ben": "benjamin", "sam": "samuel", "tom": "thomas", "drew": "andrew",
+    "hollywood": "marquise", "scotty": "scott", "jeff": "jeffery",
+}
+
+# (abbreviation, city, nickname) for every team, so "HOU", "Houston" and
+# "Houston Texans D/ST" all resolve to the Texans defense
+TEAMS = [
+    ("ARI", "arizona", "cardinals"), ("ATL", "atlanta", "falcons"), ("BAL", "baltimore", "ravens"),
+    ("BUF", "buffalo", "bills"), ("CAR", "carolina", "panthers"), ("CHI", "chicago", "bears"),
+    ("CIN", "cincinnati", "bengals"), ("CLE", "cleveland", "browns"), ("DAL", "dallas", "cowboys"),
+    ("DEN", "denver", "broncos"), ("DET", "detroit", "lions"), ("GB", "green bay", "packers"),
+    ("HOU", "houston", "texans"), ("IND", "indianapolis", "colts"), ("JAX", "jacksonville", "jaguars"),
+    ("KC", "kansas city", "chiefs"), ("LV", "las vegas", "raiders"), ("LAC", "los angeles", "chargers"),
+    ("LAR", "los angeles", "rams"), ("MIA", "miami", "dolphins"), ("MIN", "minnesota", "vikings"),
+    ("NE", "new england", "patriots"), ("NO", "new orleans", "saints"), ("NYG", "new york", "giants"),
+    ("NYJ", "new york", "jets"), ("PHI", "philadelphia", "eagles"), ("PIT", "pittsburgh", "steelers"),
+    ("SF", "san francisco", "49ers"), ("SEA", "seattle", "seahawks"), ("TB", "tampa bay", "buccaneers"),
+    ("TEN", "tennessee", "titans"), ("WAS", "washington", "commanders"),
+]
+TEAM_NICKNAMES = {abbreviation.lower(): nickname for abbreviation, _, nickname in TEAMS}
+TEAM_NICKNAMES.update({nickname: nickname for _, _, nickname in TEAMS})
+TEAM_NICKNAMES.update({"jac": "jaguars", "wsh": "commanders", "la": "rams", "oak": "raiders"})
+CITY_WORDS = {word for _, city, _ in TEAMS for word in city.split()}
+# Cities with one team can name its defense on their own ("Houston")
+CITY_NICKNAMES = {city.replace(" ", ""): nickname for _, city, nickname in TEAMS
+                  if sum(1 for _, other, _ in TEAMS if other == city) == 1}
+
+def strip_accents(text):
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+
+def defense_key(words):
+    """The key of a team defense named by abbreviation, city and/or nickname, or None."""
+    for word in reversed(words):
+        if word in TEAM_NICKNAMES:
+            return f"{TEAM_NICKNAMES[word]}dst"
+    city = "".join(words)
+    return f"{CITY_NICKNAMES[city]}dst" if city in CITY_NICKNAMES else None
+
+def name_keys(name):
+    """A raw name's normalized key and, if a nickname applies, its alias key.
+
+    Keys use the same alphabet as player_ids (lowercase letters and digits),
+    so the normalized key of an ordinary name is its player_id.
+    """
+    text = strip_accents(name).lower().strip()
+    is_defense = DEFENSE_PATTERN.search(text) is not None
+    text = DEFENSE_PATTERN.sub("", text)
+    text = SUFFIX_PATTERN.sub("", text)
+    words = NON_ALNUM_PATTERN.sub(" ", text.replace("'", "").replace(".", "")).split()
+    if is_defense or (words and len(words) <= 3 and all(word in TEAM_NICKNAMES or word in CITY_WORDS for word in words)):
+        key = defense_key(words)
+        if key:
+            return key, None
+    key = "".join(words)
+    if words and words[0] in FIRST_NAME_ALIASES:
+        return key, FIRST_NAME_ALIASES[words[0]] + "".join(words[1:])
+    return key, None
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class PlayerResolver:
+    """Resolve raw names against players.json through precomputed key and trigram indexes."""
+
+    def __init__(self, players=None):
+        self.players = dict((players if players is not None else league_data.players()).get("players", {}))
+        self.new_players = {}
+        self.keys = {}
+        self.aliases = {}
+        self.trigram_index = {}
+        self.trigram_counts = {}
+        with build_profiler.stage("index_players"):
+            for player_id, player in self.players.items():
+                self._index(player_id, player)
+
+    def _index(self, player_id, player):
+        key, alias = name_keys(player["name"])
+        for index_key in dict.fromkeys((key, player_id)):
+            self.keys.setdefault(index_key, []).append(player_id)
+        # Nicknames are indexed under their full first name, so "Mike" and "Michael" meet either way round
+        self.aliases.setdefault(alias or key, []).append(player_id)
+        grams = trigrams(key)
+        self.trigram_counts[player_id] = len(grams)
+        for gram in grams:
+            self.trigram_index.setdefault(gram, []).append(player_id)
+
+    def _filter(self, player_ids, position):
+        player_ids = list(dict.fromkeys(player_ids))
+        if position and len(player_ids) > 1:
+            matching = [player_id for player_id in player_ids if position in self.players[player_id]["positions"]]
+            return matching or player_ids
+        return player_ids
+
+    def _similar(self, key, position):
+        """[(similarity, player_id)] for the trigram neighbours of a key, best first."""
+        grams = trigrams(key)
+        shared = {}
+        for gram in grams:
+            for player_id in self.trigram_index.get(gram, ()):
+                shared[player_id] = shared.get(player_id, 0) + 1
+        scored = []
+        for player_id, count in shared.items():
+            if position and position not in self.players[player_id]["positions"]:
+                continue
+            similarity = count / (len(grams) + self.trigram_counts[player_id] - count)
+            if similarity >= MIN_SIMILARITY:
+                scored.append((similarity, player_id))
+        return sorted(scored, key=lambda item: (-item[0], item[1]))
+
+    def resolve(self, name, position=None):
+        """Match one raw name.
+
+        Returns {"name", "player_id", "confidence", "method", "candidates"}:
+        method is "exact", "alias", "trigram", "ambiguous" or "unmatched",
+        and player_id is None unless exactly one player fits.
+        """
+        position = normalize_position(position)
+        key, alias = name_keys(name)
+        result = {"name": name, "player_id": None, "confidence": 0.0, "method": "unmatched", "candidates": []}
+        for method, index_key, confidence in (("exact", key, EXACT_CONFIDENCE),
+                                              ("alias", alias or key, ALIAS_CONFIDENCE)):
+            index = self.keys if method == "exact" else self.aliases
+            player_ids = self._filter(index.get(index_key, ()), position)
+            if len(player_ids) == 1:
+                return dict(result, player_id=player_ids[0], confidence=confidence, method=method,
+                            candidates=[(player_ids[0], confidence)])
+            if player_ids:
+                return dict(result, method="ambiguous", confidence=confidence,
+                            candidates=[(player_id, confidence) for player_id in player_ids])
+
+        similar = self._similar(key, position)
+        if not similar:
+            return result
+        candidates = [(player_id, round(similarity, 3)) for similarity, player_id in similar[:5]]
+        best = similar[0][0]
+        if len(similar) > 1 and best - similar[1][0] < AMBIGUITY_MARGIN:
+            return dict(result, method="ambiguous", confidence=round(best, 3), candidates=candidates)
+        return dict(result, player_id=similar[0][1], confidence=round(best, 3), method="trigram",
+                    candidates=candidates)
+
+    def resolve_many(self, entries):
+        """Resolve (name, position) pairs; returns results in order."""
+        with build_profiler.stage("resolve"):
+            results = [self.resolve(name, position) for name, position in entries]
+        build_profiler.count("names_resolved", len(results))
+        return results
+
+    def add(self, name, position, team=None, year=None):
+        """Register a new player (written by save()); returns their player_id.
+
+        The id is normalize_player_id(name), with a number appended if that id
+        is already taken by a different player.
+        """
+        base_id = player_id = normalize_player_id(name)
+        number = 2
+        while player_id in self.players:
+            player_id = f"{base_id}{number}"
+            number += 1
+        player = {"name": name, "positions": [normalize_position(position)], "teams_by_year": {}}
+        if team and year:
+            player["teams_by_year"][str(year)] = team
+        self.players[player_id] = player
+        self.new_players[player_id] = player
+        self._index(player_id, player)
+        return player_id
+
+    def save(self, path=league_data.PLAYERS_FILE):
+        """Append every player added since loading to players.json in one write; returns how many."""
+        if not self.new_players:
+            return 0
+        data = league_data.thaw(league_data.read_json(path, {"players": {}}))
+        data["players"].update(self.new_players)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        added = len(self.new_players)
+        self.new_players = {}
+        league_data.clear_cache()
+        return added
+
+def normalize_position(position):
+    """Export and ranking position names -> players.json positions."""
+    if not position:
+        return None
+    position = position.upper()
+    return {"DST": "D/ST", "DEF": "D/ST", "ST": "D/ST", "PK": "K"}.get(position, position)
+
+def read_names(path):
+    """Read 'name' or 'name,position' lines (or a JSON list of {"name", "position"})."""
+    with open(path) as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return [(entry["name"], entry.get("position")) for entry in json.loads(text)]
+    entries = []
+    for line in text.splitlines():
+        name, _, position = line.strip().partition(",")
+        if name:
+            entries.append((name.strip(), position.strip() or None))
+    return entries
+
+def main():
+    """Resolve raw player names and report ambiguous and unmatched ones."""
+    parser = argparse.ArgumentParser(description="Resolve raw player names to players.json ids.")
+    parser.add_argument("names", nargs="*", help="names to resolve (optionally 'Name,POS')")
+    parser.add_argument("--file", help="file of 'name[,position]' lines or a JSON list to resolve")
+    parser.add_argument("--add", action="store_true",
+                        help="append unmatched names (with a position) to players.json in one write")
+    parser.add_argument("--verbose", action="store_true", help="print every match, not just the problems")
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("player_resolver", args)
+
+    entries = [(name.strip(), position.strip() or None)
+               for name, _, position in (value.partition(",") for value in args.names)]
+    if args.file:
+        entries += read_names(args.file)
+    if not entries:
+        parser.error("give names to resolve or --file")
+
+    start = time.perf_counter()
+    resolver = PlayerResolver()
+    results = resolver.resolve_many(entries)
+    elapsed = time.perf_counter() - start
+
+    by_method = {}
+    for (name, position), result in zip(entries, results):
+        by_method.setdefault(result["method"], []).append((name, position, result))
+    print(f"✓ Resolved {len(results)} names in {elapsed * 1000:.1f} ms "
+          + ", ".join(f"{len(by_method.get(method, []))} {method}"
+                      for method in ("exact", "alias", "trigram", "ambiguous", "unmatched")))
+    for method in ("exact", "alias", "trigram", "ambiguous", "unmatched"):
+        if method in ("exact", "alias") and not args.verbose:
+            continue
+        for name, position, result in by_method.get(method, []):
+            candidates = ", ".join(f"{player_id} {confidence:.2f}" for player_id, confidence in result["candidates"])
+            marker = "✓" if result["player_id"] and result["confidence"] >= AUTO_ACCEPT else "⚠️ "
+            print(f"  {marker} {method:9} {name:28} {position or '':5} -> {result['player_id'] or '?':24} {candidates}")
+
+    if args.add:
+        skipped = []
+        for name, position, _ in by_method.get("unmatched", []):
+            if position:
+                resolver.add(name, position)
+            else:
+                skipped.append(name)
+        added = resolver.save()
+        print(f"✓ Added {added} players to {league_data.PLAYERS_FILE}")
+        if skipped:
+            print(f"  ⚠️  Not added without a position: {', '.join(skipped)}")
+    build_profiler.finish()
+    if by_method.get("ambiguous"):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
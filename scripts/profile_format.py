@@ -0,0 +1,163 @@
+"""
+Compact profile JSON format and reader shim.
+The full format repeats every pick record in picks_by_year, picks_by_position,
+the top-10 lists and best/worst pick. The compact format stores each pick once
+in a columnar table of numbers; the other views refer to picks by index.
+"""
+
+import json
+from pathlib import Path
+
+import build_profiler
+
+COMPACT_FORMAT = "compact"
+
+# Numeric pick columns, in the order pick records are rebuilt
+PICK_COLUMNS = ["year", "round", "pick", "player", "position", "draft_position",
+                "draft_pos_num", "season_finish_num", "ppr_points", "value_diff", "value_type"]
+VALUE_TYPES = ["miss", "push", "hit", "extreme_hit", "super_hit"]
+
+# Keys that only exist in the compact format; anything else passes through
+COMPACT_ONLY_KEYS = {"format", "player_ids", "player_names", "positions", "value_types", "picks",
+                     "draft_pos_overrides"}
+
+def pick_key(pick):
+    """Identify a pick record across the different profile views."""
+    return (pick["year"], pick["round"], pick["pick"], pick["player_id"])
+
+def compact_profile(profile):
+    """Convert a full-format profile dict to the compact format."""
+    all_picks = [pick for picks in profile["picks_by_year"].values() for pick in picks]
+    index = {pick_key(pick): i for i, pick in enumerate(all_picks)}
+
+    player_ids, player_names, player_index = [], [], {}
+    positions, position_index = [], {}
+
+    def code(value, values, lookup):
+        if value not in lookup:
+            lookup[value] = len(values)
+            values.append(value)
+        return lookup[value]
+
+    columns = {name: [] for name in PICK_COLUMNS}
+    draft_pos_overrides = {}
+    for i, pick in enumerate(all_picks):
+        if pick["player_id"] not in player_index:
+            player_index[pick["player_id"]] = len(player_ids)
+            player_ids.append(pick["player_id"])
+            player_names.append(pick["player_name"])
+        draft_position = (pick["draft_pos"] or "").split(" ")[0]
+
+        columns["year"].append(pick["year"])
+        columns["round"].append(pick["round"])
+        columns["pick"].append(pick["pick"])
+        columns["player"].append(player_index[pick["player_id"]])
+        columns["position"].append(code(pick["position"], positions, position_index))
+        columns["draft_position"].append(code(draft_position, positions, position_index))
+        columns["draft_pos_num"].append(pick["draft_pos_num"])
+        columns["season_finish_num"].append(pick["season_finish_num"])
+        columns["ppr_points"].append(pick["ppr_points"])
+        columns["value_diff"].append(pick["value_diff"])
+        columns["value_type"].append(VALUE_TYPES.index(pick["value_type"]))
+
+        # Keep draft positions that don't follow the "<POS> <num>" pattern verbatim
+        if pick["draft_pos"] != f"{draft_position} {pick['draft_pos_num']}":
+            draft_pos_overrides[str(i)] = pick["draft_pos"]
+
+    draft_stats = {k: v for k, v in profile["draft_stats"].items() if k not in ("best_pick", "worst_pick")}
+    compact = {
+        "format": COMPACT_FORMAT,
+        "member": profile["member"],
+        "draft_stats": draft_stats,
+        "player_ids": player_ids,
+        "player_names": player_names,
+        "positions": positions,
+        "value_types": VALUE_TYPES,
+        "picks": columns
+    }
+    if draft_pos_overrides:
+        compact["draft_pos_overrides"] = draft_pos_overrides
+    if "picks_by_position" in profile:
+        compact["picks_by_position"] = {
+            position: [index[pick_key(pick)] for pick in picks]
+            for position, picks in profile["picks_by_position"].items()
+        }
+    if "round_stats" in profile:
+        compact["round_stats"] = profile["round_stats"]
+    compact["top_10_best_picks"] = [index[pick_key(pick)] for pick in profile.get("top_10_best_picks", [])]
+    compact["top_10_worst_picks"] = [index[pick_key(pick)] for pick in profile.get("top_10_worst_picks", [])]
+    for key, value in profile.items():
+        if key not in compact and key not in ("picks_by_year", "picks_by_position"):
+            compact[key] = value
+    return compact
+
+def expand_picks(compact):
+    """Rebuild the full pick records of a compact profile, in table order."""
+    columns = compact["picks"]
+    player_ids = compact["player_ids"]
+    player_names = compact["player_names"]
+    positions = compact["positions"]
+    value_types = compact["value_types"]
+    overrides = compact.get("draft_pos_overrides", {})
+
+    picks = []
+    for i, row in enumerate(zip(*(columns[name] for name in PICK_COLUMNS))):
+        (year, round_num, pick_num, player, position, draft_position,
+         draft_pos_num, season_finish_num, ppr_points, value_diff, value_type) = row
+        position = positions[position]
+        picks.append({
+            "year": year,
+            "round": round_num,
+            "pick": pick_num,
+            "player_id": player_ids[player],
+            "player_name": player_names[player],
+            "position": position,
+            "draft_pos": overrides.get(str(i), f"{positions[draft_position]} {draft_pos_num}"),
+            "draft_pos_num": draft_pos_num,
+            "season_finish": f"{position} {season_finish_num}" if season_finish_num else "—",
+            "season_finish_num": season_finish_num,
+            "ppr_points": ppr_points,
+            "value_diff": value_diff,
+            "value_type": value_types[value_type]
+        })
+    return picks
+
+def expand_profile(data):
+    """Return a profile in the full format, whichever format it was stored in."""
+    if data.get("format") != COMPACT_FORMAT:
+        return data
+
+    picks = expand_picks(data)
+    picks_by_year = {}
+    for pick in picks:
+        picks_by_year.setdefault(str(pick["year"]), []).append(pick)
+    best = [picks[i] for i in data.get("top_10_best_picks", [])]
+    worst = [picks[i] for i in data.get("top_10_worst_picks", [])]
+
+    profile = {
+        "member": data["member"],
+        "draft_stats": dict(data["draft_stats"], best_pick=best[0] if best else None,
+                            worst_pick=worst[0] if worst else None),
+        "picks_by_year": picks_by_year,
+        "picks_by_position": {
+            position: [picks[i] for i in indexes]
+            for position, indexes in data.get("picks_by_position", {}).items()
+        },
+        "round_stats": data.get("round_stats", {}),
+        "top_10_best_picks": best,
+        "top_10_worst_picks": worst
+    }
+    for key, value in data.items():
+        if key not in profile and key not in COMPACT_ONLY_KEYS:
+            profile[key] = value
+    return profile
+
+def load_profile(path, default=None):
+    """Load a profile JSON file in either format as a full-format dict."""
+    path = Path(path)
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    build_profiler.count_file_read(path)
+    return expand_profile(data)
@@ -0,0 +1,242 @@
+"""
+Precompute draft tendencies and achievements for member profiles.
+Produces the same records profiles/draft-stats.js used to derive on every
+page load, so profile pages only need their own profile JSON.
+"""
+
+import math
+from collections import Counter
+from decimal import Decimal, ROUND_HALF_UP
+
+HIT_TYPES = {"hit", "extreme_hit", "super_hit"}
+
+# Achievement name -> icon, in the order badges are shown
+ACHIEVEMENT_ICONS = {
+    "Sharpshooter": "🎯",
+    "Gem Hunter": "💎",
+    "Gold Digger": "⭐",
+    "Franchise Tag": "🏷️",
+    "Prophet": "🔮",
+    "Value Hunter": "💰",
+    "Perfect Round": "✨",
+    "Homer": "🏠",
+    "Late Legend": "🌙",
+    "Rising Star": "📈",
+    "Want Cookie?": "🍪",
+    "Cakewalk": "🎂",
+    "Iron Will": "💪"
+}
+
+def to_fixed(value, digits):
+    """Format a number like JavaScript's toFixed() (halves round up)."""
+    quantum = Decimal(1).scaleb(-digits)
+    return str(Decimal(value).quantize(quantum, rounding=ROUND_HALF_UP))
+
+def hit_rate(picks):
+    """Percentage of picks that were hits."""
+    hits = sum(1 for p in picks if p["value_type"] in HIT_TYPES)
+    return (hits / len(picks) * 100) if picks else 0
+
+def team_for_pick(pick, players_data):
+    """Get the NFL team a drafted player was on in the draft year."""
+    player = players_data.get("players", {}).get(pick["player_id"], {})
+    return (player.get("teams_by_year") or {}).get(str(pick["year"]))
+
+def find_franchise_player(all_picks):
+    """Find the player a member drafted most often, if drafted 3+ times."""
+    counts = Counter(p["player_id"] for p in all_picks)
+    if not counts:
+        return None
+    # most_common() keeps first-drafted order between players with equal counts
+    player_id, count = counts.most_common(1)[0]
+    if count < 3:
+        return None
+    picks = [p for p in all_picks if p["player_id"] == player_id]
+    return {
+        "player_id": player_id,
+        "player_name": picks[0]["player_name"],
+        "count": count,
+        "years": [p["year"] for p in picks]
+    }
+
+def find_theme_team(all_picks, players_data):
+    """Find the NFL team a member drafts most from (5+ players or 15%+ of picks)."""
+    counts = Counter(team for team in (team_for_pick(p, players_data) for p in all_picks) if team)
+    for team, count in counts.most_common():
+        percentage = to_fixed(count / len(all_picks) * 100, 1)
+        if count >= 5 or float(percentage) >= 15:
+            return {"team": team, "count": count, "percentage": percentage}
+    return None
+
+def find_early_round_strategy(all_picks):
+    """Find the position a member takes in rounds 1-3 (40%+ of 6+ picks)."""
+    early_picks = [p for p in all_picks if 1 <= p["round"] <= 3]
+    if len(early_picks) < 6:
+        return None
+    position, count = Counter(p["position"] for p in early_picks).most_common(1)[0]
+    percentage = to_fixed(count / len(early_picks) * 100, 0)
+    if float(percentage) < 40:
+        return None
+    return {"position": position, "count": count, "percentage": percentage}
+
+def calculate_tendencies(all_picks, players_data):
+    """Calculate a member's draft tendencies."""
+    return {
+        "franchise_player": find_franchise_player(all_picks),
+        "theme_team": find_theme_team(all_picks, players_data),
+        "early_round_strategy": find_early_round_strategy(all_picks)
+    }
+
+def find_rising_star(picks_by_year):
+    """Find the first year of 3+ consecutive seasons of improving hit rate."""
+    years = sorted(picks_by_year)
+    last_rate = None
+    start_year = None
+    improvements = 0
+    for i, year in enumerate(years):
+        rate = hit_rate(picks_by_year[year])
+        if last_rate is not None and rate > last_rate:
+            improvements += 1
+            if start_year is None:
+                start_year = years[i - 1]
+            if improvements >= 2:
+                return start_year
+        else:
+            improvements = 0
+            start_year = None
+        last_rate = rate
+    return None
+
+def pick_achievements(picks_by_year, tendencies, players_data):
+    """Yield (name, year, description) for every draft-based achievement."""
+    years = sorted(picks_by_year)
+    all_picks = [p for year in years for p in picks_by_year[year]]
+
+    for year in years:
+        rate = hit_rate(picks_by_year[year])
+        if rate >= 30:
+            yield "Sharpshooter", year, f"Achieved {to_fixed(rate, 1)}% hit rate in {year}"
+
+    for year in years:
+        super_hits = sum(1 for p in picks_by_year[year] if p["value_type"] == "super_hit")
+        if super_hits >= 1:
+            plural = "s" if super_hits > 1 else ""
+            yield "Gem Hunter", year, f"Drafted {super_hits} super extreme hit{plural} in {year} (30+ spot difference)"
+
+    for year in years:
+        extreme_hits = sum(1 for p in picks_by_year[year] if p["value_type"] == "extreme_hit")
+        if extreme_hits >= 3:
+            yield "Gold Digger", year, f"Drafted {extreme_hits} extreme hits in {year} (15+ spot difference)"
+
+    franchise = tendencies["franchise_player"]
+    if franchise:
+        third_year = sorted(franchise["years"])[2]
+        yield ("Franchise Tag", third_year,
+               f"Drafted {franchise['player_name']} for the 3rd time in {third_year} ({franchise['count']} total)")
+
+    for year in years:
+        number_ones = [p for p in picks_by_year[year] if p["season_finish_num"] == 1]
+        if len(number_ones) == 1:
+            pick = number_ones[0]
+            yield "Prophet", year, f"Drafted {pick['player_name']} who finished #1 at {pick['position']} in {year}"
+        elif number_ones:
+            players_list = ", ".join(f"{p['player_name']} (#1 {p['position']})" for p in number_ones)
+            yield ("Prophet", year,
+                   f"Drafted {len(number_ones)} players who finished #1 at their position in {year}: {players_list}")
+
+    for year in years:
+        values = [p["value_diff"] for p in picks_by_year[year] if p["value_diff"] is not None]
+        if values and sum(values) / len(values) >= 5:
+            yield "Value Hunter", year, f"Average value of +{to_fixed(sum(values) / len(values), 1)} spots in {year}"
+
+    rounds = {}
+    for pick in all_picks:
+        rounds.setdefault((pick["year"], pick["round"]), []).append(pick)
+    for (year, round_num), picks in rounds.items():
+        if len(picks) >= 3 and all(p["value_type"] in HIT_TYPES for p in picks):
+            yield "Perfect Round", year, f"100% hit rate in Round {round_num} ({year})"
+
+    team_counts = Counter(
+        (pick["year"], team) for pick in all_picks
+        for team in [team_for_pick(pick, players_data)] if team
+    )
+    for (year, team), count in team_counts.items():
+        if count >= 4:
+            yield "Homer", year, f"Drafted {count} players from {team} in {year}"
+
+    for year in years:
+        late_picks = [p for p in picks_by_year[year] if p["round"] >= 10]
+        late_hits = sum(1 for p in late_picks if p["value_type"] in HIT_TYPES)
+        late_rate = (late_hits / len(late_picks) * 100) if late_picks else 0
+        if late_rate >= 40 and len(late_picks) >= 3:
+            yield ("Late Legend", year,
+                   f"{to_fixed(late_rate, 0)}% hit rate in rounds 10+ in {year} ({late_hits}/{len(late_picks)})")
+
+    start_year = find_rising_star(picks_by_year) if len(years) >= 3 else None
+    if start_year is not None:
+        yield "Rising Star", start_year, f"3+ consecutive years of improving hit rate starting in {start_year}"
+
+def season_achievements(league, alias):
+    """Yield (name, year, description) for every standings-based achievement."""
+    seasons = league.get("seasons", {})
+    playoff_years = league.get("members", {}).get(alias, {}).get("playoff_appearances") or []
+
+    for year in sorted(seasons, key=int):
+        standings = seasons[year].get("standings") or []
+        team = next((t for t in standings if t.get("owner_alias") == alias), None)
+        if not team:
+            continue
+
+        if team.get("points_for") == max(t.get("points_for") or 0 for t in standings):
+            yield ("Want Cookie?", year,
+                   f"Led league in scoring in {year} with {to_fixed(team['points_for'], 1)} points")
+
+        if team.get("points_against") == min(t.get("points_against") or math.inf for t in standings):
+            yield ("Cakewalk", year,
+                   f"Easiest schedule in {year} with only {to_fixed(team['points_against'], 1)} points against")
+
+        if year in playoff_years:
+            by_points = sorted(standings, key=lambda t: -(t.get("points_for") or 0))
+            points_rank = next(i for i, t in enumerate(by_points, 1) if t.get("owner_alias") == alias)
+            if points_rank > math.ceil(len(standings) / 2):
+                yield ("Iron Will", year,
+                       f"Made playoffs in {year} despite ranking {points_rank}/{len(standings)} in scoring")
+
+def group_achievements(earned):
+    """Group earned achievements into one badge per name, newest year first."""
+    badges = {}
+    for name, year, description in earned:
+        badges.setdefault(name, []).append((int(year), description))
+
+    grouped = []
+    for name in ACHIEVEMENT_ICONS:
+        if name not in badges:
+            continue
+        entries = sorted(badges[name], key=lambda entry: -entry[0])
+        if len(entries) == 1:
+            description = entries[0][1]
+        else:
+            description = " | ".join(f"{year}: {text}" for year, text in entries)
+        grouped.append({
+            "name": name,
+            "icon": ACHIEVEMENT_ICONS[name],
+            "years": [str(year) for year, _ in entries],
+            "description": description
+        })
+    return grouped
+
+def calculate_insights(stats, players_data, league=None, alias=None):
+    """Calculate tendencies and grouped achievements for one member's stats.
+
+    Season-based achievements need the member's league alias and the league
+    database; they are skipped when either is missing.
+    """
+    picks_by_year = {str(year): picks for year, picks in stats["picks_by_year"].items()}
+    all_picks = [p for year in sorted(picks_by_year) for p in picks_by_year[year]]
+    tendencies = calculate_tendencies(all_picks, players_data)
+
+    earned = list(pick_achievements(picks_by_year, tendencies, players_data))
+    if league and alias:
+        earned += season_achievements(league, alias)
+
+    return tendencies, group_achievements(earned)
@@ -0,0 +1,521 @@
+"""
+Render the league sections of index.html from structured data.
+Champions, season standings (with playoff brackets), draft recaps and the
+history timeline are built from league_database.json, the draft and season
+files, players.json and data/index_page.json, which holds what the scraped
+data doesn't have: streaks, moves, brackets, pre-2021 champions and the
+timeline. Draft boards are graded exactly like the profile pages.
+
+Each section is cached in data/index_cache.json under a hash of its inputs,
+so adding a season only renders that season's tabs and the all-time tables.
+Sections that do need rendering are rendered in parallel.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from string import Template
+
+import build_profiler
+import league_data
+import member_registry
+from calculate_profile_draft_stats import build_season_finish_index, grade_pick, print_shared_ranks
+from league_data import load_json
+
+INDEX_FILE = Path("index.html")
+INDEX_PAGE_FILE = Path("data/index_page.json")
+INDEX_CACHE = Path("data/index_cache.json")
+MEMBER_PAGES_FILE = Path("data/member_pages.json")
+
+# Render on a process pool once at least this many sections are out of date
+PARALLEL_RENDER_MIN = 4
+MAX_RENDER_WORKERS = min(8, os.cpu_count() or 1)
+
+# Any change to this module's templates or formatting invalidates the cache
+RENDERER_HASH = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+# Team abbreviations in players.json -> the ones the draft boards show
+TEAM_LABELS = {
+    "GNB": "GB", "KAN": "KC", "LVR": "LV", "NOR": "NO", "NWE": "NE",
+    "SFO": "SF", "TAM": "TB", "WAS": "Wsh",
+}
+UPPERCASE_TEAMS = {"LAC", "LAR", "NYG", "NYJ", "FA"}
+
+VALUE_BADGES = {
+    "super_hit": ("value-super-hit", "💎"),
+    "extreme_hit": ("value-extreme-hit", "✓"),
+    "hit": ("value-hit", "✓"),
+    "push": ("value-push", "≈"),
+    "miss": ("value-miss", "✗"),
+}
+
+# Templates are compiled once and shared by every section
+SECTION_TEMPLATE = Template("""<section id="$id" class="section">
+            <div class="section-header">
+                <h2 class="section-title">$title</h2>
+            </div>
+
+$body
+        </section>""")
+
+CHAMPIONS_TEMPLATE = Template("""            <div class="current-champ">
+                <div class="champ-crown">REIGNING CHAMPION</div>
+                <div class="champ-year">$year</div>
+                <a href="profiles/$alias.html" class="champ-name-link">$name</a>
+            </div>
+
+            <div class="champ-table">
+                <div class="table-row header-row">
+                    <span class="col-year">Year</span>
+                    <span class="col-champ">Champion</span>
+                    <span class="col-runner">Runner-Up</span>
+                </div>
+$rows
+            </div>""")
+
+CHAMPION_ROW_TEMPLATE = Template("""                <div class="table-row">
+                    <span class="col-year">$year</span>
+                    <span class="col-champ">$champion</span>
+                    <span class="col-runner">$runner_up</span>
+                </div>""")
+
+TAB_TEMPLATE = Template("""                <button class="season-tab$active" data-$kind="$year">$year</button>""")
+
+TABS_TEMPLATE = Template("""            <div class="season-tabs">
+$tabs
+            </div>""")
+
+SEASON_TEMPLATE = Template("""            <!-- $year Season -->
+            <div class="season-content$active" id="season-$year">
+            <h3 class="season-year">$year Regular Season</h3>
+
+            <div class="standings-table-wrapper">
+                <table class="standings-table">
+                    <thead>
+                        <tr>
+                            <th class="col-rank">RK</th>
+                            <th class="col-team">Manager</th>
+                            <th class="col-rec">REC</th>
+                            <th class="col-pf">PF</th>
+                            <th class="col-pa">PA</th>
+                            <th class="col-diff">DIFF</th>
+                            <th class="col-strk">STRK</th>
+                            <th class="col-moves">MOVES</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+$rows
+                    </tbody>
+                </table>
+            </div>
+            <div class="standings-legend">
+                <span class="legend-item"><span class="playoff-indicator"></span> Playoff Team</span>
+            </div>$playoffs
+            </div>""")
+
+# Podium and bracket; left out until a season's playoffs are in the data
+PLAYOFFS_TEMPLATE = Template("""
+
+            <div class="playoff-results">
+                <h3 class="subsection-title">Playoff Results</h3>
+
+                <div class="playoff-podium">
+                    <div class="podium-spot second">
+                        <div class="podium-label">2nd Place</div>
+                        $runner_up
+                    </div>
+                    <div class="podium-spot first">
+                        <div class="podium-label">Champion</div>
+                        $champion
+                    </div>
+                    <div class="podium-spot third">
+                        <div class="podium-label">3rd Place</div>
+                        $third_place
+                    </div>
+                </div>
+
+                <h4 class="bracket-title">Championship Bracket</h4>
+                <div class="bracket">
+$rounds
+                </div>
+
+                <div class="round-label">$third_place_label</div>
+                <div class="single-matchup">
+$third_place_game
+                </div>
+            </div>""")
+
+STANDINGS_ROW_TEMPLATE = Template("""                        <tr$row_class>
+                            <td>$rank</td>
+                            <td>$name</td>
+                            <td>$record</td>
+                            <td>$points_for</td>
+                            <td>$points_against</td>
+                            <td class="$diff_class">$diff</td>
+                            <td class="$streak_class">$streak</td>
+                            <td>$moves</td>
+                        </tr>""")
+
+ROUND_TEMPLATE = Template("""                    <div class="bracket-round">
+                        <div class="round-label">$label</div>
+$matchups
+                    </div>""")
+
+MATCHUP_TEMPLATE = Template("""$indent<div class="matchup$matchup_class">
+$teams
+$indent</div>""")
+
+TEAM_TEMPLATE = Template("""$indent    <div class="team$team_class">
+$indent        <span class="seed">$seed</span>
+$indent        <span class="name">$name</span>
+$indent        <span class="score">$score</span>
+$indent    </div>""")
+
+DRAFT_TEMPLATE = Template("""            <!-- $year Draft -->
+            <div class="draft-content$active" id="draft-$year">
+                <h3 class="season-year">$year Draft</h3>
+
+                <div class="draft-filter">
+                    <label for="team-filter-$year">Filter by Team:</label>
+                    <select id="team-filter-$year" class="team-filter-select">
+                        <option value="all">All Teams</option>
+                    </select>
+                </div>
+
+                <div class="draft-table-wrapper">
+                    <table class="draft-table">
+                        <thead>
+                            <tr>
+                                <th class="col-round">Round</th>
+                                <th class="col-pick">Pick</th>
+                                <th class="col-player">Player</th>
+                                <th class="col-team">Team</th>
+                                <th class="col-draft-pos">Draft Pos</th>
+                                <th class="col-season-finish">Season Finish</th>
+                                <th class="col-points">Points</th>
+                                <th class="col-value">Value</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+$rows
+                        </tbody>
+                    </table>
+                </div>
+            </div>""")
+
+DRAFT_ROW_TEMPLATE = Template("""                            <tr> <td>$round</td> <td>$pick</td> <td>$player</td> <td>$owner</td> """
+                              """<td>$draft_pos</td> <td>$finish</td> <td>$points</td> """
+                              """<td><span class="$value_class">$value_icon</span></td> </tr>""")
+
+TIMELINE_TEMPLATE = Template("""            <div class="timeline">
+$years
+            </div>""")
+
+TIMELINE_YEAR_TEMPLATE = Template("""                <div class="timeline-year$year_class">
+                    <div class="year-label">$year</div>
+                    <div class="year-events">
+$events
+                    </div>
+                </div>""")
+
+EVENT_TEMPLATE = Template("""                        <div class="event$event_class">"""
+                          """<span class="event-icon">$icon</span><span>$text</span></div>""")
+
+def member_link(alias, names, pages, css_class="name-link"):
+    """Link a member's name to their profile page; non-members are plain text."""
+    name = names.get(alias, alias)
+    if alias in pages:
+        return f'<a href="profiles/{alias}.html" class="{css_class}">{name}</a>'
+    return name
+
+def team_label(team):
+    """Format a players.json team abbreviation the way the draft boards show it."""
+    if not team:
+        return "FA"
+    if team in TEAM_LABELS:
+        return TEAM_LABELS[team]
+    if team in UPPERCASE_TEAMS or len(team) < 3:
+        return team
+    return team.capitalize()
+
+def format_diff(points_for, points_against, games):
+    """Average points differential per game, signed to one decimal."""
+    diff = (points_for - points_against) / games if games else 0
+    return ("positive" if diff >= 0 else "negative"), f"{diff:+.1f}"
+
+def render_champions(inputs):
+    """The reigning champion and the all-time champions table."""
+    names, pages = inputs["names"], inputs["pages"]
+    years = sorted(inputs["champions"], key=int, reverse=True)
+    reigning = inputs["champions"][years[0]]
+    rows = [
+        CHAMPION_ROW_TEMPLATE.substitute(
+            year=year,
+            champion=member_link(inputs["champions"][year]["champion"], names, pages),
+            runner_up=member_link(inputs["champions"][year]["runner_up"], names, pages))
+        for year in years[1:]
+    ]
+    body = CHAMPIONS_TEMPLATE.substitute(year=years[0], alias=reigning["champion"],
+                                         name=names.get(reigning["champion"], reigning["champion"]),
+                                         rows="\n".join(rows))
+    return SECTION_TEMPLATE.substitute(id="champions", title="Champions", body=body)
+
+def render_tabs(inputs):
+    """One tab per year, the latest active."""
+    tabs = [TAB_TEMPLATE.substitute(active=" active" if index == 0 else "", kind=inputs["kind"], year=year)
+            for index, year in enumerate(inputs["years"])]
+    return TABS_TEMPLATE.substitute(tabs="\n".join(tabs))
+
+def render_team(team, indent, names, champion=False):
+    """One side of a playoff matchup."""
+    team_class = ""
+    if team.get("bye"):
+        team_class = " bye"
+    elif team.get("winner"):
+        team_class = " winner champ" if champion else " winner"
+    return TEAM_TEMPLATE.substitute(indent=indent, team_class=team_class, seed=team["seed"],
+                                    name=names.get(team["alias"], team["alias"]),
+                                    score="BYE" if team.get("bye") else team["score"])
+
+def render_matchup(matchup, indent, names, championship=False):
+    """A playoff matchup (a bye is a matchup with one team)."""
+    teams = [render_team(team, indent, names, championship) for team in matchup]
+    return MATCHUP_TEMPLATE.substitute(indent=indent, matchup_class=" championship" if championship else "",
+                                       teams="\n".join(teams))
+
+def render_season(inputs):
+    """One season tab: standings, podium and playoff bracket."""
+    names, pages, page = inputs["names"], inputs["pages"], inputs["page"]
+    rows = []
+    for team in inputs["standings"]:
+        alias = team["owner_alias"]
+        wins, losses, ties = (int(part) for part in team["record"].split("-"))
+        diff_class, diff = format_diff(team["points_for"], team["points_against"], wins + losses + ties)
+        # A season still in progress has no streaks or moves recorded yet
+        streak = page.get("streaks", {}).get(alias, "—")
+        rows.append(STANDINGS_ROW_TEMPLATE.substitute(
+            row_class=' class="playoff"' if team["rank"] <= page.get("playoff_teams", 0) else "",
+            rank=team["rank"],
+            name=member_link(alias, names, pages),
+            record=team["record"],
+            points_for=f"{team['points_for']:.2f}",
+            points_against=f"{team['points_against']:.2f}",
+            diff_class=diff_class,
+            diff=diff,
+            streak_class="win" if streak.startswith("W") else "loss" if streak.startswith("L") else "",
+            streak=streak,
+            moves=page.get("moves", {}).get(alias, "—")))
+
+    return SEASON_TEMPLATE.substitute(
+        year=inputs["year"],
+        active=" active" if inputs["latest"] else "",
+        rows="\n".join(rows),
+        playoffs=render_playoffs(inputs) if inputs["playoffs"] and page.get("bracket") else "")
+
+def render_playoffs(inputs):
+    """A season's podium, bracket and third place game."""
+    names, pages, page, playoffs = inputs["names"], inputs["pages"], inputs["page"], inputs["playoffs"]
+    rounds = page["bracket"]
+    bracket = [
+        ROUND_TEMPLATE.substitute(
+            label=bracket_round["label"],
+            matchups="\n".join(render_matchup(matchup, " " * 24, names, index == len(rounds) - 1)
+                               for matchup in bracket_round["matchups"]))
+        for index, bracket_round in enumerate(rounds)
+    ]
+    return PLAYOFFS_TEMPLATE.substitute(
+        runner_up=member_link(playoffs["runner_up"], names, pages, "podium-name"),
+        champion=member_link(playoffs["champion"], names, pages, "podium-name"),
+        third_place=member_link(page["third_place"], names, pages, "podium-name"),
+        rounds="\n\n".join(bracket),
+        third_place_label=page["third_place_game"]["label"],
+        third_place_game=render_matchup(page["third_place_game"]["matchup"], " " * 20, names))
+
+def draft_row(year, pick, players_data, finish_index, owners):
+    """A draft board row: the pick graded against that season's finishes."""
+    graded = grade_pick(year, pick, players_data, finish_index)
+    player = players_data["players"].get(pick["player_id"], {})
+    team = team_label(player.get("teams_by_year", {}).get(str(year)))
+    value_class, value_icon = VALUE_BADGES[graded["value_type"]]
+    return DRAFT_ROW_TEMPLATE.substitute(
+        round=pick["round"], pick=pick["pick"], player=f"{graded['player_name']} ({team}, {graded['position']})",
+        owner=owners[pick["owner"]], draft_pos=graded["draft_pos"] or "—", finish=graded["season_finish"],
+        points=f"{graded['ppr_points']:.1f}" if graded["ppr_points"] is not None else "—",
+        value_class=value_class, value_icon=value_icon)
+
+def render_draft(inputs):
+    """One draft tab: every pick with its season finish and value."""
+    year = inputs["year"]
+    finish_index = build_season_finish_index({year: inputs["season"]} if inputs["season"] else {})
+    rows = [draft_row(year, pick, inputs["players"], finish_index, inputs["owners"])
+            for pick in inputs["picks"]]
+    return DRAFT_TEMPLATE.substitute(year=year, active=" active" if inputs["latest"] else "", rows="\n".join(rows))
+
+def render_timeline(inputs):
+    """The league history timeline."""
+    years = []
+    for entry in inputs["timeline"]:
+        events = [EVENT_TEMPLATE.substitute(event_class=f" {event['class']}" if event.get("class") else "",
+                                            icon=event["icon"], text=event["text"])
+                  for event in entry["events"]]
+        years.append(TIMELINE_YEAR_TEMPLATE.substitute(
+            year_class=f" {entry['class']}" if entry.get("class") else "",
+            year=entry["year"],
+            events="\n".join(events)))
+    body = TIMELINE_TEMPLATE.substitute(years="\n\n".join(years))
+    return SECTION_TEMPLATE.substitute(id="history", title="League History", body=body)
+
+RENDERERS = {
+    "champions": render_champions,
+    "tabs": render_tabs,
+    "season": render_season,
+    "draft": render_draft,
+    "timeline": render_timeline,
+}
+
+def render_section(kind, inputs):
+    """Render one section fragment (runs on worker processes)."""
+    return RENDERERS[kind](inputs)
+
+def section_hash(kind, inputs):
+    """Identify a section by its renderer and everything it is rendered from."""
+    content = json.dumps([RENDERER_HASH, kind, inputs], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+def plan_sections():
+    """List every section as (key, kind, inputs); inputs hold exactly what the section shows."""
+    league = league_data.league_database()
+    page = load_json(INDEX_PAGE_FILE, {})
+    pages = sorted(load_json(MEMBER_PAGES_FILE, {}))
+    players = league_data.players().get("players", {})
+    names = {alias: member["name"] for alias, member in league.get("members", {}).items()}
+    names.update(page.get("names", {}))
+
+    champions = dict(page.get("champions", {}))
+    for year, playoffs in league.get("playoffs", {}).items():
+        champions[year] = {"champion": playoffs["champion"], "runner_up": playoffs["runner_up"]}
+
+    season_years = sorted(league.get("seasons", {}), key=int, reverse=True)
+    sections = [
+        ("champions", "champions", {"champions": champions, "names": names, "pages": pages}),
+        ("season-tabs", "tabs", {"kind": "season", "years": season_years}),
+    ]
+    for index, year in enumerate(season_years):
+        sections.append((f"season-{year}", "season", {
+            "year": year,
+            "latest": index == 0,
+            "standings": league["seasons"][year]["standings"],
+            "playoffs": league.get("playoffs", {}).get(year, {}),
+            "page": page.get("seasons", {}).get(year, {}),
+            "names": names,
+            "pages": pages,
+        }))
+
+    draft_years = sorted(league_data.year_files(league_data.DRAFTS_DIR), reverse=True)
+    sections.append(("draft-tabs", "tabs", {"kind": "draft", "years": draft_years}))
+    registry = member_registry.load_registry()
+    for index, year in enumerate(draft_years):
+        picks = league_data.draft(year).get("picks", [])
+        owners = {pick["owner"]: names.get(member_registry.member_id(pick["owner"], registry), pick["owner"])
+                  for pick in picks}
+        sections.append((f"draft-{year}", "draft", {
+            "year": year,
+            "latest": index == 0,
+            "picks": picks,
+            "season": league_data.season(year),
+            # Only the players this draft shows, so other years' player edits don't invalidate it
+            "players": {"players": {pick["player_id"]: players[pick["player_id"]]
+                                    for pick in picks if pick["player_id"] in players}},
+            "owners": owners,
+        }))
+
+    sections.append(("timeline", "timeline", {"timeline": page.get("timeline", [])}))
+    return sections
+
+def render_sections(sections, cache, force=False):
+    """Render out-of-date sections (in parallel when there are several); returns {key: html} and the keys rendered."""
+    fragments, stale = {}, []
+    for key, kind, inputs in sections:
+        with build_profiler.stage("hash_inputs"):
+            digest = section_hash(kind, inputs)
+        cached = cache.get(key)
+        if not force and cached and cached["hash"] == digest:
+            fragments[key] = cached["html"]
+            build_profiler.count("sections_cached")
+        else:
+            stale.append((key, kind, inputs, digest))
+
+    with build_profiler.stage("render_sections"):
+        if len(stale) >= PARALLEL_RENDER_MIN and MAX_RENDER_WORKERS > 1:
+            with ProcessPoolExecutor(max_workers=min(MAX_RENDER_WORKERS, len(stale))) as pool:
+                rendered = list(pool.map(render_section, [kind for _, kind, _, _ in stale],
+                                         [inputs for _, _, inputs, _ in stale]))
+        else:
+            rendered = [render_section(kind, inputs) for _, kind, inputs, _ in stale]
+
+    for (key, _, _, digest), html in zip(stale, rendered):
+        fragments[key] = html
+        cache[key] = {"hash": digest, "html": html}
+        build_profiler.count("sections_rendered")
+    return fragments, [key for key, _, _, _ in stale]
+
+def assemble(html, sections, fragments):
+    """Swap the champions, standings, drafts and history sections of index.html for the rendered ones."""
+    def tabbed_section(section_id, title, kind):
+        keys = [f"{kind}-tabs"] + [key for key, section_kind, _ in sections if section_kind == kind]
+        return SECTION_TEMPLATE.substitute(id=section_id, title=title,
+                                           body="\n\n".join(fragments[key] for key in keys))
+
+    replacements = {
+        "champions": fragments["champions"],
+        "standings": tabbed_section("standings", "Season Standings", "season"),
+        "drafts": tabbed_section("drafts", "Draft Recaps", "draft"),
+        "history": fragments["timeline"],
+    }
+    for section_id, content in replacements.items():
+        pattern = re.compile(rf'<section id="{section_id}" class="section">.*?</section>', re.DOTALL)
+        if not pattern.search(html):
+            raise ValueError(f"index.html has no {section_id} section")
+        html = pattern.sub(lambda _: content, html, count=1)
+    return html
+
+def render_index(force=False):
+    """Render index.html, returning the section keys that were re-rendered and whether the page changed."""
+    cache = {} if force else league_data.thaw(load_json(INDEX_CACHE, {}))
+    sections = plan_sections()
+    fragments, rendered = render_sections(sections, cache, force)
+
+    with build_profiler.stage("assemble_page"):
+        html = INDEX_FILE.read_text(encoding="utf-8")
+        updated = assemble(html, sections, fragments)
+    changed = updated != html
+    if changed:
+        with build_profiler.stage("write_html"):
+            INDEX_FILE.write_text(updated, encoding="utf-8")
+
+    keys = {key for key, _, _ in sections}
+    with open(INDEX_CACHE, "w") as f:
+        json.dump({key: entry for key, entry in sorted(cache.items()) if key in keys}, f, ensure_ascii=False)
+    return rendered, changed
+
+def main():
+    """Render the generated sections of index.html."""
+    parser = argparse.ArgumentParser(description="Render the champions, standings, drafts and history sections of index.html.")
+    parser.add_argument("--force", action="store_true", help="ignore the section cache and render everything")
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("render_index", args)
+
+    print_shared_ranks(league_data.seasons())
+    rendered, changed = render_index(args.force)
+    print(f"✓ Rendered {len(rendered)} sections ({', '.join(rendered) or 'all cached'}), "
+          f"index.html {'updated' if changed else 'unchanged'}")
+
+    build_profiler.finish()
+
+if __name__ == "__main__":
+    main()
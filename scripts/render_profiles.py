@@ -0,0 +1,379 @@
+"""
+Render member profile pages from structured data.
+Builds each profiles/<member>.html from data/member_pages.json, the member's
+profile JSON, league_history.json, member_season_records.json and the
+league database, instead of patching the existing HTML with regexes.
+"""
+
+import argparse
+from pathlib import Path
+from string import Template
+
+import build_profiler
+import league_data
+import league_store
+from build_bundles import BUNDLE_MANIFEST
+from build_profile_shards import SHARD_MANIFEST
+from generate_biographies import PROFILES_DIR, generate_biography
+from league_data import load_json
+from team_index import load_team_index
+
+MEMBER_PAGES_FILE = Path("data/member_pages.json")
+# Written by season_simulator.py; read directly so rendering doesn't need NumPy
+SIMULATIONS_FILE = Path("data/member_simulations.json")
+
+# Templates are compiled once and shared by every member page
+PAGE_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$name | Sunday Movie League</title>
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Bebas+Neue&family=Barlow:wght@400;500;600;700&display=swap" rel="stylesheet">
+    <link rel="stylesheet" href="../styles.css">
+    <link rel="stylesheet" href="profile.css">
+</head>
+<body>
+    <div class="noise"></div>
+
+    <nav class="nav">
+        <div class="nav-inner">
+            <a href="../index.html" class="nav-link">Home</a>
+            <a href="../index.html#champions" class="nav-link">Champions</a>
+            <a href="../index.html#standings" class="nav-link">Standings</a>
+            <a href="../index.html#drafts" class="nav-link">Drafts</a>
+            <a href="../index.html#history" class="nav-link">History</a>
+            <a href="../index.html#members" class="nav-link">Members</a>
+        </div>
+    </nav>
+
+    <main class="profile-page"$data_attributes>
+        <a href="../index.html#members" class="back-button">
+            <span class="back-arrow">&larr;</span>
+            <span>Back to Members</span>
+        </a>
+
+        <div class="profile-header">
+            <div class="profile-picture">
+                <div class="picture-placeholder">$initials</div>
+                <!-- Replace with: <img src="your-image.jpg" alt="$name"> -->
+            </div>
+            <div class="profile-info">
+$badge                <h1 class="profile-name">$name</h1>
+                <div class="profile-tenure">Member since $member_since</div>
+                <div class="profile-stats">
+$stat_cards
+                </div>
+            </div>
+        </div>
+
+        <!-- Biography Section -->
+        <section class="profile-section">
+            <h2 class="section-heading">Biography</h2>
+            <div class="bio-content">
+                $biography
+            </div>
+        </section>
+
+        <!-- Draft Statistics Section -->
+        <section class="profile-section">
+            <h2 class="section-heading">Draft Statistics</h2>
+
+            <div class="draft-stats-table-wrapper">
+                <table class="draft-stats-table">
+                    <thead>
+                        <tr>
+                            <th>Year</th>
+                            <th>Picks</th>
+                            <th>Hits</th>
+                            <th>Misses</th>
+                            <th>Pushes</th>
+                            <th>Hit Rate</th>
+                            <th>Best Pick</th>
+                            <th>Value</th>
+                            <th></th>
+                            <th>Worst Pick</th>
+                            <th>Value</th>
+                        </tr>
+                    </thead>
+                    <tbody id="draft-stats-tbody">
+                        <tr><td colspan="11">Loading...</td></tr>
+                    </tbody>
+                </table>
+            </div>
+        </section>
+
+        <!-- Draft Tendencies Section -->
+        <section class="profile-section">
+            <h2 class="section-heading">Draft Tendencies</h2>
+
+            <div id="draft-tendencies-content">
+                <div class="tendency-loading">Loading...</div>
+            </div>
+        </section>
+
+        <!-- Achievements Section -->
+        <section class="profile-section">
+            <h2 class="section-heading">Achievements</h2>
+
+            <div id="achievements-content">
+                <div class="achievement-loading">Loading...</div>
+            </div>
+        </section>
+
+        <section class="profile-section">
+            <h2 class="section-heading">League History</h2>
+            <div class="history-timeline">
+$history_items
+            </div>
+        </section>
+    </main>
+
+    <footer class="footer">
+        <div class="footer-content">
+            <div class="footer-logo">SML</div>
+            <p class="footer-text">Sunday Movie League - Est. 2016</p>
+        </div>
+    </footer>
+    <script src="draft-stats.js"></script>
+</body>
+</html>
+""")
+
+BADGE_TEMPLATE = Template("""                <div class="profile-badge">$badge</div>
+""")
+
+STAT_CARD_TEMPLATE = Template("""                    <div class="stat-card">
+                        <span class="stat-value">$value</span>
+                        <span class="stat-label">$label</span>
+                    </div>""")
+
+HISTORY_ITEM_TEMPLATE = Template("""                <div class="history-item">
+                    <span class="history-year">$year</span>
+                    $events
+                </div>""")
+
+def ordinal(n):
+    """Format a number as an ordinal (1st, 2nd, 11th, ...)."""
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+def load_render_context(store=None):
+    """Load every shared data source once for all member pages.
+
+    With a league store, titles, records and standings come from SQLite and
+    the league JSON files aren't read at all.
+    """
+    context = {
+        "store": store,
+        "member_pages": load_json(MEMBER_PAGES_FILE, {}),
+        "bundles": load_json(BUNDLE_MANIFEST, {}),
+        "shards": load_json(SHARD_MANIFEST, {}),
+        "simulations": load_json(SIMULATIONS_FILE, {}).get("members", {}),
+        "team_index": load_team_index()
+    }
+    if store is None:
+        context["league"] = league_data.league_database()
+        context["league_history"] = load_json("data/league_history.json", {})
+        context["season_records"] = load_json("data/member_season_records.json", {})
+    return context
+
+def season_rows(alias, league):
+    """Get a member's standings row for every season, keyed by year."""
+    rows = {}
+    for year, season in league.get("seasons", {}).items():
+        for row in season.get("standings", []):
+            if row.get("owner_alias") == alias:
+                rows[year] = row
+    return rows
+
+def sum_records(records):
+    """Add up W-L-T record strings."""
+    totals = [0, 0, 0]
+    for record in records:
+        for i, value in enumerate(record.split("-")):
+            totals[i] += int(value)
+    return "-".join(str(total) for total in totals)
+
+def league_summary(alias, context):
+    """Collect a member's titles, playoff years, records and standings from the JSON data.
+
+    Returns the same keys as league_store.member_summary().
+    """
+    league = context["league"]
+    history = context["league_history"].get(alias, {})
+    member = league.get("members", {}).get(alias, {})
+
+    championships = set(history.get("championships", []))
+    runner_ups = set(history.get("runner_ups", []))
+    for year, playoff in league.get("playoffs", {}).items():
+        if playoff.get("champion") == alias:
+            championships.add(year)
+        elif playoff.get("runner_up") == alias:
+            runner_ups.add(year)
+
+    return {
+        "championship_years": sorted(championships),
+        "runner_up_years": sorted(runner_ups),
+        "playoff_years": sorted(set(member.get("playoff_appearances", []))),
+        "playoff_record": member.get("playoff_record"),
+        "season_record": context["season_records"].get(alias, {}).get("season_record"),
+        "standings": season_rows(alias, league)
+    }
+
+def build_profile_stats(alias, context):
+    """Build the header stats for a member from structured data.
+
+    Reads the league store when one is in the context, otherwise the JSON
+    files. Returns the same keys extract_profile_stats() scrapes from a page,
+    so the result can be passed straight to generate_biography().
+    """
+    page = context["member_pages"][alias]
+    if context.get("store") is not None:
+        summary = league_store.member_summary(context["store"], alias)
+    else:
+        summary = league_summary(alias, context)
+    rows = summary["standings"]
+
+    season_record = summary["season_record"]
+    if not season_record:
+        season_record = sum_records(row["record"] for _, row in sorted(rows.items())) if rows else "0-0-0"
+
+    return {
+        "championships": len(summary["championship_years"]),
+        "championship_years": summary["championship_years"],
+        "runner_ups": len(summary["runner_up_years"]),
+        "runner_up_years": summary["runner_up_years"],
+        "seasons": page["seasons"],
+        "season_record": season_record,
+        "playoff_record": summary["playoff_record"] or "—",
+        "playoff_appearances": len(summary["playoff_years"]),
+        "playoff_years": set(summary["playoff_years"]),
+        "standings": rows
+    }
+
+def build_history_items(profile_stats):
+    """Build the league history timeline, newest season first."""
+    title_years = profile_stats["championship_years"]
+    years = set(profile_stats["standings"]) | set(title_years) | set(profile_stats["runner_up_years"])
+    items = []
+    for year in sorted(years, reverse=True):
+        row = profile_stats["standings"].get(year)
+        if year in title_years:
+            title = "League Champion"
+            if len(title_years) > 1:
+                title += f" ({ordinal(title_years.index(year) + 1)} Title)"
+            events = f'<span class="history-event championship">{title}</span>'
+        elif year in profile_stats["runner_up_years"]:
+            events = '<span class="history-event runner-up">Runner-Up</span>'
+        elif year in profile_stats["playoff_years"]:
+            events = '<span class="history-event playoff">Playoff Appearance</span>'
+        else:
+            events = f'<span class="history-event">Finished {ordinal(row["rank"])} ({row["record"]})</span>'
+            row = None
+        if row:
+            events += f' <span class="history-event">({row["record"]})</span>'
+        items.append((year, events))
+    return items
+
+def render_stat_cards(page, profile_stats, simulated=None):
+    """Render the header stat cards, with any page-specific cards after Seasons.
+
+    Members with simulated seasons (see season_simulator.py) also get luck and
+    expected title cards at the end.
+    """
+    cards = [
+        (profile_stats["championships"], "Championships"),
+        (profile_stats["runner_ups"], "Runner-Up"),
+        (profile_stats["seasons"], "Seasons"),
+    ]
+    cards += [(extra["value"], extra["label"]) for extra in page.get("extra_stats", [])]
+    cards += [
+        (profile_stats["season_record"], "Season Record"),
+        (profile_stats["playoff_record"], "Playoff Record"),
+        (profile_stats["playoff_appearances"], "Playoff Appearances"),
+    ]
+    if simulated:
+        cards += [
+            (f'{simulated["luck"]:+.1f}', "Luck (Wins)"),
+            (f'{simulated["expected_titles"]:.2f}', "Expected Titles"),
+        ]
+    return "\n".join(STAT_CARD_TEMPLATE.substitute(value=value, label=label) for value, label in cards)
+
+def render_profile(alias, context):
+    """Render one member's profile page."""
+    page = context["member_pages"][alias]
+    profile_stats = build_profile_stats(alias, context)
+    bundle = context["bundles"].get(alias)
+    shards = context["shards"].get(alias)
+    data_attributes = ""
+    if bundle:
+        data_attributes += f' data-bundle="../{bundle["file"]}"'
+    if shards:
+        data_attributes += f' data-summary="../{shards["summary"]["file"]}"'
+
+    with build_profiler.stage("load_profile_json"):
+        profile_data = league_data.profile(alias, {})
+
+    with build_profiler.stage("render_html"):
+        history_items = "\n".join(
+            HISTORY_ITEM_TEMPLATE.substitute(year=year, events=events)
+            for year, events in build_history_items(profile_stats)
+        )
+        return PAGE_TEMPLATE.substitute(
+            name=page["name"],
+            initials=page["initials"],
+            data_attributes=data_attributes,
+            member_since=page["member_since"],
+            badge=BADGE_TEMPLATE.substitute(badge=page["badge"]) if page.get("badge") else "",
+            stat_cards=render_stat_cards(page, profile_stats, context["simulations"].get(alias)),
+            biography=generate_biography(page["name"], profile_stats, profile_data, context["team_index"]),
+            history_items=history_items
+        )
+
+def write_if_changed(output_file, content):
+    """Write a file unless it already holds identical content; returns True if written."""
+    with build_profiler.stage("write_html"):
+        if output_file.exists() and output_file.read_text(encoding='utf-8') == content:
+            return False
+        output_file.write_text(content, encoding='utf-8')
+    build_profiler.count("bytes_written", len(content.encode('utf-8')))
+    return True
+
+def render_all(aliases=None, store=None):
+    """Render every member page (or only the given aliases); returns the written paths."""
+    context = load_render_context(store)
+    written = []
+    for alias in aliases or sorted(context["member_pages"]):
+        output_file = PROFILES_DIR / f"{alias}.html"
+        if write_if_changed(output_file, render_profile(alias, context)):
+            written.append(output_file)
+        build_profiler.count("profiles_rendered")
+    return written
+
+def main():
+    """Render member profile pages."""
+    parser = argparse.ArgumentParser(description="Render member profile pages from structured data.")
+    parser.add_argument("members", nargs="*", help="member aliases to render (default: all)")
+    parser.add_argument("--store", action="store_true",
+                        help="read titles, records and standings from the SQLite league store")
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("render_profiles", args)
+
+    store = league_store.connect() if args.store else None
+    try:
+        written = render_all(args.members, store)
+    finally:
+        if store is not None:
+            store.close()
+    print(f"✓ Rendered profile pages, {len(written)} changed")
+    for output_file in written:
+        print(f"  ✓ {output_file}")
+
+    build_profiler.finish()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Derive season position rankings from points instead of the stored ranks.
+data/seasons/<year>.json keeps a hand-entered rank next to each player's PPR
+total, and the two don't always agree. This module ranks each (year,
+position) bucket by points in a single sort with an explicit tie policy
+(keeping the rank gaps left for players the lists don't include), and
+can score from raw stat lines under other scoring systems (half-PPR,
+standard) so every draft can be re-graded when the scoring changes.
+
+Derived finish indexes have the same shape as
+calculate_profile_draft_stats.build_season_finish_index() and are cached
+per season, so repeated grading passes don't re-sort anything.
+"""
+
+import argparse
+
+import league_data
+
+# Points per unit of each stat line field
+BASE_POINTS = {
+    "pass_yds": 0.04,
+    "pass_td": 4,
+    "int": -2,
+    "rush_yds": 0.1,
+    "rush_td": 6,
+    "rec_yds": 0.1,
+    "rec_td": 6,
+    "fumbles_lost": -2,
+    "two_pt": 2,
+}
+SCORING = {
+    "ppr": dict(BASE_POINTS, rec=1),
+    "half_ppr": dict(BASE_POINTS, rec=0.5),
+    "standard": dict(BASE_POINTS, rec=0),
+}
+# Season files rank defenses under "ST" (see league_importer.RANKING_KEYS)
+# while players.json and the drafts call the position "D/ST"
+RANKING_POSITIONS = {"ST": "D/ST"}
+# Kicker and defense points don't depend on the reception rules
+SCORING_INVARIANT_POSITIONS = {"K", "D/ST", "DST", "DEF"}
+
+# How players with equal points are ranked (shown for a complete list):
+#   min      1, 2, 2, 4 (shared rank, the next rank skipped)
+#   dense    1, 2, 2, 3 (shared rank, no gap)
+#   ordinal  1, 2, 3, 4 (ties broken by player_id)
+TIE_POLICIES = ("min", "dense", "ordinal")
+
+# (year, scoring, ties) -> (season data, {(year, position, player_id): (rank, points)})
+_cache = {}
+
+def score_entry(entry, position, scoring="ppr"):
+    """A ranking entry's points under a scoring system.
+
+    Uses the entry's "stats" line when it has one; otherwise only the stored
+    PPR total can be used, so other scoring systems need stat lines.
+    """
+    stats = entry.get("stats")
+    if stats is not None and position not in SCORING_INVARIANT_POSITIONS:
+        rules = SCORING[scoring]
+        return round(sum(rules.get(field, 0) * value for field, value in stats.items()), 2)
+    if scoring == "ppr" or position in SCORING_INVARIANT_POSITIONS:
+        return entry["ppr"]
+    raise ValueError(f"{entry['player_id']} ({position}) has no stat line to score as {scoring}")
+
+def rank_slots(entries):
+    """The ranks a position list fills, best first.
+
+    Lists only hold the players the league cares about, so the stored ranks
+    skip the unlisted players in between; those gaps are kept. Repeated or
+    missing ranks are bumped so each slot is one past the previous at least,
+    which makes a complete list (or one without ranks) fill 1..n.
+    """
+    slots = []
+    for rank in sorted(entry.get("rank") or 0 for entry in entries):
+        slots.append(max(rank, slots[-1] + 1 if slots else 1))
+    return slots
+
+def rank_bucket(entries, position, scoring="ppr", ties="min"):
+    """Rank one position's entries by points; returns [(player_id, rank, points)] best first.
+
+    Players are sorted by points once and placed into the list's rank slots
+    (see rank_slots), so the stored order is corrected without inventing
+    ranks for players the list leaves out. Raises ValueError if a player
+    appears twice, since their finish would be ambiguous.
+    """
+    if ties not in TIE_POLICIES:
+        raise ValueError(f"unknown tie policy {ties!r} (expected one of {', '.join(TIE_POLICIES)})")
+    scored = {}
+    for entry in entries:
+        player_id = entry["player_id"]
+        if player_id in scored:
+            raise ValueError(f"Ambiguous season finish: {player_id} is ranked more than once in {position}")
+        scored[player_id] = score_entry(entry, position, scoring)
+
+    slots = rank_slots(entries)
+    ranked = []
+    groups = 0
+    group_slot = None
+    previous = None
+    for index, (player_id, points) in enumerate(sorted(scored.items(), key=lambda item: (-item[1], item[0]))):
+        if points != previous:
+            group_slot = slots[groups] if ties == "dense" else slots[index]
+            groups += 1
+        previous = points
+        ranked.append((player_id, slots[index] if ties == "ordinal" else group_slot, points))
+    return ranked
+
+def ranking_position(key):
+    """The player position a season file's ppr_rankings key ranks."""
+    return RANKING_POSITIONS.get(key.upper(), key.upper())
+
+def derive_rankings(season, scoring="ppr", ties="min"):
+    """Rank every position in a season file; returns {position: [(player_id, rank, points)]}."""
+    return {
+        ranking_position(key): rank_bucket(entries, ranking_position(key), scoring, ties)
+        for key, entries in season.get("ppr_rankings", {}).items()
+    }
+
+def derived_finish_index(seasons_data, scoring="ppr", ties="min"):
+    """Build a (year, position, player_id) -> (rank, points) lookup from derived ranks."""
+    index = {}
+    for year, season in seasons_data.items():
+        key = (year, scoring, ties)
+        cached = _cache.get(key)
+        if cached is None or cached[0] is not season:
+            year_index = {
+                (year, position, player_id): (rank, points)
+                for position, ranked in derive_rankings(season, scoring, ties).items()
+                for player_id, rank, points in ranked
+            }
+            cached = (season, year_index)
+            _cache[key] = cached
+        index.update(cached[1])
+    return index
+
+def rank_disagreements(year, season, ties="min"):
+    """Entries whose stored rank differs from the PPR-derived one, as (position, player_id, ppr, stored, derived)."""
+    derived = derived_finish_index({year: season}, "ppr", ties)
+    disagreements = []
+    for key, entries in season.get("ppr_rankings", {}).items():
+        position = ranking_position(key)
+        for entry in entries:
+            rank, _ = derived[(year, position, entry["player_id"])]
+            if entry["rank"] != rank:
+                disagreements.append((position, entry["player_id"], entry["ppr"], entry["rank"], rank))
+    return disagreements
+
+def main():
+    """Report where the stored season ranks disagree with ranks derived from PPR."""
+    parser = argparse.ArgumentParser(description="Compare stored season ranks with ranks derived from PPR totals.")
+    parser.add_argument("years", nargs="*", type=int, help="season years to check (default: all)")
+    parser.add_argument("--ties", choices=TIE_POLICIES, default="min", help="tie policy for derived ranks")
+    parser.add_argument("--verbose", action="store_true", help="list every disagreeing entry")
+    args = parser.parse_args()
+
+    seasons = league_data.seasons()
+    total = 0
+    for year in args.years or sorted(seasons):
+        if year not in seasons:
+            print(f"  ⚠️  {year}: no season file")
+            continue
+        disagreements = rank_disagreements(year, seasons[year], args.ties)
+        entries = sum(len(entries) for entries in seasons[year].get("ppr_rankings", {}).values())
+        total += len(disagreements)
+        print(f"{year}: {len(disagreements)} of {entries} stored ranks differ from the derived ranks")
+        if args.verbose:
+            for position, player_id, ppr, stored, derived in disagreements:
+                print(f"  {position:5} {player_id:28} {ppr:7.1f}  stored {stored:3}  derived {derived:3}")
+    print(f"✓ {total} disagreements; grade with --ranks derived to use the derived ranks")
+
+if __name__ == "__main__":
+    main()
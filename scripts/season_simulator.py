@@ -0,0 +1,296 @@
+"""
+Monte Carlo season and playoff simulator over the league's history.
+Each member's weekly scoring in a season is modelled as a normal
+distribution around their actual points-per-game, with one league-wide
+weekly spread estimated from how much points for and points against vary
+across the standings. Every season is then replayed many times in NumPy
+batches: a round-robin schedule with the teams dealt in at random (the
+real weekly matchups aren't in the data), seeding by wins (points for
+breaks ties) and the league's seeded bracket with byes.
+
+Batches are spread over a process pool. Each batch draws from its own child
+of one SeedSequence, so results depend only on --seed and --sims, never on
+the number of workers. Writes data/member_simulations.json with expected
+wins, luck (actual minus expected wins), luck-adjusted standings and playoff
+and championship odds per season and per member.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import build_profiler
+import league_data
+from league_data import load_json
+
+SIMULATIONS_FILE = Path("data/member_simulations.json")
+INDEX_PAGE_FILE = Path("data/index_page.json")
+
+DEFAULT_SIMS = 100_000
+BATCH_SIZE = 10_000
+DEFAULT_SEED = 2016
+# Used when the standings can't pin down the weekly spread (and as its floor)
+MIN_WEEKLY_SD = 10.0
+DEFAULT_PLAYOFF_TEAMS = 6
+
+def parse_record(record):
+    """'W-L-T' -> (wins, losses, ties)"""
+    wins, losses, ties = (int(part) for part in record.split("-"))
+    return wins, losses, ties
+
+def season_weekly_variance(standings):
+    """Estimate the weekly score variance of one season from its season totals.
+
+    Over g games, points for vary by g*sigma^2 (weekly noise) plus
+    g^2*tau^2 (differences between members), while points against, being
+    spread over many opponents, vary by roughly g*(sigma^2 + tau^2). Solving
+    the two gives sigma^2, or None if the season is too small to say.
+    """
+    games = sum(parse_record(standings[0]["record"]))
+    if len(standings) < 3 or games < 2:
+        return None
+    var_for = np.var([row["points_for"] for row in standings])
+    var_against = np.var([row["points_against"] for row in standings])
+    tau_squared = max((var_for - var_against) / (games * games - games), 0.0)
+    sigma_squared = (var_against - games * tau_squared) / games
+    return sigma_squared if sigma_squared > 0 else None
+
+def fit_weekly_sd(seasons):
+    """Pool the per-season variance estimates into one league-wide weekly standard deviation."""
+    estimates = [variance for variance in (season_weekly_variance(season["standings"])
+                                           for season in seasons.values()) if variance]
+    if not estimates:
+        return MIN_WEEKLY_SD
+    return max(float(np.sqrt(np.mean(estimates))), MIN_WEEKLY_SD)
+
+def bracket_order(playoff_teams):
+    """Seeds in bracket order, with seeds past playoff_teams (byes) as 0.
+
+    For six teams: 1 v bye, 4 v 5, 2 v bye, 3 v 6 - the winners of the first
+    two pairs meet in one semifinal and the last two in the other.
+    """
+    order = [1]
+    while len(order) < playoff_teams:
+        size = len(order) * 2
+        order = [seed for top in order for seed in (top, size + 1 - top)]
+    return [seed if seed <= playoff_teams else 0 for seed in order]
+
+def season_model(year, season, weekly_sd, playoff_teams):
+    """Everything a worker needs to replay one season."""
+    standings = season["standings"]
+    games = sum(parse_record(standings[0]["record"]))
+    if len(standings) % 2:
+        raise ValueError(f"{year}: simulating needs an even number of teams, got {len(standings)}")
+    return {
+        "year": year,
+        "members": [row["owner_alias"] for row in standings],
+        "means": [row["points_for"] / games for row in standings],
+        "weekly_sd": weekly_sd,
+        "weeks": games,
+        "bracket": bracket_order(min(playoff_teams, len(standings)))
+    }
+
+def round_robin(teams, weeks):
+    """A weeks-long schedule of opponents by the circle method: schedule[w, t] is t's opponent in week w.
+
+    Repeats the round robin once every team has played everyone, like the league's own schedule.
+    """
+    schedule = np.empty((teams - 1, teams), dtype=np.intp)
+    rotation = list(range(1, teams))
+    for week in range(teams - 1):
+        circle = [0] + rotation
+        for slot in range(teams // 2):
+            home, away = circle[slot], circle[teams - 1 - slot]
+            schedule[week, home], schedule[week, away] = away, home
+        rotation = rotation[-1:] + rotation[:-1]
+    return schedule[np.arange(weeks) % (teams - 1)]
+
+def deal_teams(rng, batch, teams):
+    """Deal the teams into the schedule's places at random: team[b, s] plays season b from place s."""
+    return np.argsort(rng.random((batch, teams)), axis=1)
+
+def simulate_playoffs(rng, model, means, seeds):
+    """Play the bracket for every simulated season; seeds[b, s] is seed s+1's team. Returns (finalists, champions)."""
+    batch = len(seeds)
+    rows = np.arange(batch)[:, None]
+    slots = np.array(model["bracket"])
+    # Bracket slots hold team indexes, -1 for a bye
+    alive = np.where(slots > 0, seeds[:, np.clip(slots - 1, 0, None)], -1)
+    finalists = None
+    while alive.shape[1] > 1:
+        if alive.shape[1] == 2:
+            finalists = alive.copy()
+        scores = means[None, :] + model["weekly_sd"] * rng.standard_normal((batch, len(means)))
+        home, away = alive[:, 0::2], alive[:, 1::2]
+        home_scores = scores[rows, np.clip(home, 0, None)]
+        away_scores = scores[rows, np.clip(away, 0, None)]
+        alive = np.where(away < 0, home, np.where((home < 0) | (away_scores > home_scores), away, home))
+    return finalists, alive[:, 0]
+
+def simulate_batch(model, batch, seed_sequence):
+    """Replay one season batch times; returns per-team win totals, playoff, final and title counts."""
+    rng = np.random.default_rng(seed_sequence)
+    means = np.array(model["means"])
+    teams, weeks = len(means), model["weeks"]
+    playoff_teams = sum(1 for seed in model["bracket"] if seed)
+
+    # Weekly noise is the same for every place, so scores are drawn straight into schedule places
+    team = deal_teams(rng, batch, teams)
+    schedule = round_robin(teams, weeks)
+    scores = means.astype(np.float32)[team][:, None, :] + np.float32(model["weekly_sd"]) * rng.standard_normal(
+        (batch, weeks, teams), dtype=np.float32)
+    place_wins = np.zeros((batch, teams), dtype=np.int64)
+    for week in range(weeks):
+        place_wins += scores[:, week, :] > scores[:, week, schedule[week]]
+    place_points = scores.sum(axis=1)
+
+    wins = np.empty_like(place_wins)
+    points = np.empty_like(place_points)
+    np.put_along_axis(wins, team, place_wins, axis=1)
+    np.put_along_axis(points, team, place_points, axis=1)
+
+    # Points for is far below 1e6, so it only breaks ties in wins
+    seeds = np.argsort(-(wins * 1e6 + points), axis=1)
+    finalists, champions = simulate_playoffs(rng, model, means, seeds)
+
+    return {
+        "wins": wins.sum(axis=0),
+        "playoffs": np.bincount(seeds[:, :playoff_teams].ravel(), minlength=teams),
+        "finals": np.bincount(finalists.ravel(), minlength=teams),
+        "titles": np.bincount(champions, minlength=teams),
+    }
+
+def run_batch(task):
+    """Worker entry point: simulate one batch of one season."""
+    model, batch, seed_sequence = task
+    return model["year"], simulate_batch(model, batch, seed_sequence)
+
+def simulate_league(sims=DEFAULT_SIMS, seed=DEFAULT_SEED, workers=1, weekly_sd=None):
+    """Replay every season sims times; returns {year: {alias: results}} and the weekly spread used."""
+    league = league_data.league_database()
+    seasons = league.get("seasons", {})
+    page_seasons = load_json(INDEX_PAGE_FILE, {}).get("seasons", {})
+    with build_profiler.stage("fit_models"):
+        weekly_sd = weekly_sd or fit_weekly_sd(seasons)
+        models = [season_model(year, seasons[year], weekly_sd,
+                               page_seasons.get(year, {}).get("playoff_teams", DEFAULT_PLAYOFF_TEAMS))
+                  for year in sorted(seasons)]
+
+    # Fixed batch boundaries and one seed per batch keep results independent of the worker count
+    batches = [BATCH_SIZE] * (sims // BATCH_SIZE) + ([sims % BATCH_SIZE] if sims % BATCH_SIZE else [])
+    tasks = []
+    for model, season_seed in zip(models, np.random.SeedSequence(seed).spawn(len(models))):
+        tasks += [(model, batch, batch_seed) for batch, batch_seed in zip(batches, season_seed.spawn(len(batches)))]
+
+    totals = {}
+    with build_profiler.stage("simulate"):
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(run_batch, tasks))
+        else:
+            results = [run_batch(task) for task in tasks]
+    for year, counts in results:
+        if year in totals:
+            for key, value in counts.items():
+                totals[year][key] = totals[year][key] + value
+        else:
+            totals[year] = counts
+    build_profiler.count("seasons_simulated", sims * len(models))
+
+    simulated = {}
+    for model in models:
+        year = model["year"]
+        standings = {row["owner_alias"]: row for row in seasons[year]["standings"]}
+        playoffs = league.get("playoffs", {}).get(year, {})
+        expected = totals[year]["wins"] / sims
+        # Luck-adjusted standings rank members by expected wins
+        adjusted_ranks = {model["members"][index]: rank for rank, index in enumerate(np.argsort(-expected), start=1)}
+        results = {}
+        for index, alias in enumerate(model["members"]):
+            wins, _, ties = parse_record(standings[alias]["record"])
+            actual_wins = wins + 0.5 * ties
+            results[alias] = {
+                "actual_wins": actual_wins,
+                "expected_wins": round(float(expected[index]), 2),
+                "luck": round(actual_wins - float(expected[index]), 2),
+                "rank": standings[alias]["rank"],
+                "luck_adjusted_rank": adjusted_ranks[alias],
+                "playoff_odds": round(float(totals[year]["playoffs"][index]) / sims, 4),
+                "finals_odds": round(float(totals[year]["finals"][index]) / sims, 4),
+                "title_odds": round(float(totals[year]["titles"][index]) / sims, 4),
+                "champion": playoffs.get("champion") == alias
+            }
+        simulated[year] = results
+    return simulated, weekly_sd
+
+def member_totals(simulated):
+    """Sum each member's seasons into career expected wins, luck and expected titles."""
+    members = {}
+    for year, results in sorted(simulated.items()):
+        for alias, result in results.items():
+            member = members.setdefault(alias, {"seasons": 0, "actual_wins": 0, "expected_wins": 0, "luck": 0,
+                                                "expected_titles": 0, "titles": 0})
+            member["seasons"] += 1
+            member["actual_wins"] += result["actual_wins"]
+            member["expected_wins"] += result["expected_wins"]
+            member["luck"] += result["luck"]
+            member["expected_titles"] += result["title_odds"]
+            member["titles"] += int(result["champion"])
+    for member in members.values():
+        for key in ("expected_wins", "luck", "expected_titles"):
+            member[key] = round(member[key], 2)
+    return dict(sorted(members.items()))
+
+def build_simulations(sims=DEFAULT_SIMS, seed=DEFAULT_SEED, workers=1, weekly_sd=None):
+    """Simulate every season; returns the contents of data/member_simulations.json."""
+    simulated, weekly_sd = simulate_league(sims, seed, workers, weekly_sd)
+    return {
+        "sims": sims,
+        "seed": seed,
+        "weekly_sd": round(weekly_sd, 2),
+        "seasons": simulated,
+        "members": member_totals(simulated)
+    }
+
+def write_simulations(output):
+    """Write data/member_simulations.json; returns False if it already held this output."""
+    if load_json(SIMULATIONS_FILE) == output:
+        return False
+    with open(SIMULATIONS_FILE, "w") as f:
+        json.dump(output, f, indent=2)
+    return True
+
+def main():
+    """Simulate every season and write data/member_simulations.json."""
+    parser = argparse.ArgumentParser(description="Replay every season with Monte Carlo simulations.")
+    parser.add_argument("--sims", type=int, default=DEFAULT_SIMS, help=f"simulations per season (default: {DEFAULT_SIMS:,})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="number of worker processes (default: 0, one per CPU core)")
+    parser.add_argument("--weekly-sd", type=float, default=None,
+                        help="weekly score standard deviation (default: estimated from the standings)")
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("season_simulator", args)
+
+    start = time.perf_counter()
+    output = build_simulations(args.sims, args.seed, args.workers or os.cpu_count(), args.weekly_sd)
+    elapsed = time.perf_counter() - start
+    write_simulations(output)
+
+    print(f"✓ Simulated {len(output['seasons'])} seasons x {args.sims:,} in {elapsed:.1f}s "
+          f"(weekly sd {output['weekly_sd']:.1f}), wrote {SIMULATIONS_FILE}")
+    print(f"\n{'Member':10} {'W':>6} {'xW':>7} {'Luck':>6} {'Titles':>6} {'xTitles':>7}")
+    for alias, member in sorted(output["members"].items(), key=lambda item: -item[1]["luck"]):
+        print(f"{alias:10} {member['actual_wins']:6g} {member['expected_wins']:7.2f} {member['luck']:+6.2f} "
+              f"{member['titles']:6} {member['expected_titles']:7.2f}")
+
+    build_profiler.finish()
+
+if __name__ == "__main__":
+    main()
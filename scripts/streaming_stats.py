@@ -0,0 +1,187 @@
+"""
+Streaming draft stats engine.
+Grades picks one draft year at a time and keeps only running counters and
+bounded best/worst heaps per member, so memory grows with the number of
+members instead of the number of picks. Each year's pick records are handed
+to an optional callback as a shard and then dropped.
+"""
+
+import heapq
+import sys
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from itertools import count
+
+import build_profiler
+import league_data
+import member_registry
+from calculate_profile_draft_stats import (
+    DEFAULT_RANKING,
+    build_season_finish_index,
+    calculate_member_stats,
+    count_pick,
+    grade_pick,
+)
+
+TOP_K = 10
+
+# Keys of calculate_member_stats() results that a streaming pass reproduces
+SUMMARY_KEYS = ["total_picks", "hits", "misses", "pushes", "extreme_hits", "super_hits",
+                "best_picks", "worst_picks", "round_stats", "hit_rate", "avg_value"]
+
+def iter_draft_years(ranking=DEFAULT_RANKING):
+    """Yield (year, draft, finish_index) per draft year, reading each file once without caching it."""
+    for year, draft_file in league_data.year_files(league_data.DRAFTS_DIR).items():
+        with build_profiler.stage("load_json"):
+            draft = league_data.read_json(draft_file, {})
+            season = league_data.read_json(league_data.SEASONS_DIR / f"{year}.json")
+        with build_profiler.stage("build_finish_index"):
+            finish_index = build_season_finish_index({year: season} if season else {}, **ranking)
+        yield year, draft, finish_index
+
+def iter_year_shards(players_data, owners=None, ranking=DEFAULT_RANKING, league_counts=None):
+    """Yield (year, {member_id: [pick records]}) one draft year at a time, in draft order.
+
+    With a league_counts dict, every owned pick of the year (the other
+    owners' too) is also tallied into league_counts[year] by value type.
+    """
+    for year, draft, finish_index in iter_draft_years(ranking):
+        shard = defaultdict(list)
+        tally = Counter()
+        with build_profiler.stage("grade_picks"):
+            for pick in draft.get("picks", []):
+                owner = pick.get("owner")
+                if not owner:
+                    continue
+                owner = member_registry.member_id(owner)
+                if owners is not None and owner not in owners:
+                    if league_counts is not None:
+                        tally[grade_pick(year, pick, players_data, finish_index)["value_type"]] += 1
+                    continue
+                record = grade_pick(year, pick, players_data, finish_index)
+                tally[record["value_type"]] += 1
+                shard[owner].append(record)
+        if league_counts is not None:
+            league_counts[year] = tally
+        yield year, dict(shard)
+
+def push_bounded(heap, k, key, record):
+    """Keep the k records with the largest keys in a min-heap of (key, record)."""
+    if len(heap) < k:
+        heapq.heappush(heap, (key, record))
+    elif key > heap[0][0]:
+        heapq.heapreplace(heap, (key, record))
+
+def ranked(heap):
+    """The records of a bounded heap, largest key first."""
+    return [record for _, record in sorted(heap, key=lambda entry: entry[0], reverse=True)]
+
+def new_member_totals():
+    """Running totals for one member."""
+    return {
+        "total_picks": 0,
+        "hits": 0,
+        "misses": 0,
+        "pushes": 0,
+        "extreme_hits": 0,
+        "super_hits": 0,
+        "round_stats": defaultdict(lambda: {"hits": 0, "misses": 0, "pushes": 0, "total": 0}),
+        "years": [],
+        "value_sum": 0,
+        "value_count": 0,
+        "best_heap": [],
+        "worst_heap": []
+    }
+
+def finish_member_totals(totals):
+    """Turn a member's running totals into calculate_member_stats()-style summary stats."""
+    total_with_result = totals["hits"] + totals["misses"] + totals["pushes"]
+    return {
+        "total_picks": totals["total_picks"],
+        "hits": totals["hits"],
+        "misses": totals["misses"],
+        "pushes": totals["pushes"],
+        "extreme_hits": totals["extreme_hits"],
+        "super_hits": totals["super_hits"],
+        "best_picks": ranked(totals["best_heap"]),
+        "worst_picks": ranked(totals["worst_heap"]),
+        "round_stats": totals["round_stats"],
+        "hit_rate": (totals["hits"] / total_with_result * 100) if total_with_result > 0 else 0,
+        "avg_value": totals["value_sum"] / totals["value_count"] if totals["value_count"] else 0,
+        "years": totals["years"]
+    }
+
+def stream_member_stats(owners=None, on_year=None, k=TOP_K, ranking=DEFAULT_RANKING, league_counts=None):
+    """Calculate summary draft stats for all members (or only the given owners) in one pass.
+
+    Returns the same counters, round stats, hit rate, average value and
+    best/worst picks as calculate_member_stats() (see SUMMARY_KEYS) plus the
+    years each member drafted in, but no picks_by_year or picks_by_position.
+    on_year(year, shard) receives each year's {member_id: [pick records]}
+    before the shard is dropped (build_profile_shards.ShardWriter writes
+    them out as year shards). ranking is as for calculate_member_stats().
+    league_counts, if given, collects every member's value types per year
+    (see iter_year_shards()).
+    """
+    players_data = league_data.players()
+    member_totals = defaultdict(new_member_totals)
+    # Ties keep draft order, like the stable sort in calculate_member_stats()
+    order = count()
+    picks_processed = 0
+
+    for year, shard in iter_year_shards(players_data, owners, ranking, league_counts):
+        with build_profiler.stage("aggregate_picks"):
+            for member, records in shard.items():
+                totals = member_totals[member]
+                totals["years"].append(year)
+                for record in records:
+                    count_pick(totals, record)
+                    value_diff = record["value_diff"]
+                    if value_diff is None:
+                        continue
+                    totals["value_sum"] += value_diff
+                    totals["value_count"] += 1
+                    if value_diff > 0:
+                        push_bounded(totals["best_heap"], k, (value_diff, -next(order)), record)
+                    elif value_diff < -5:
+                        push_bounded(totals["worst_heap"], k, (-value_diff, -next(order)), record)
+                picks_processed += len(records)
+        if on_year is not None:
+            with build_profiler.stage("emit_year"):
+                on_year(year, shard)
+
+    build_profiler.count("picks_processed", picks_processed)
+    return {member: finish_member_totals(totals) for member, totals in member_totals.items()}
+
+def measure(calculate):
+    """Run a stats calculation from a cold cache, returning its result, seconds and peak memory."""
+    league_data.clear_cache()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = calculate()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    """Stream every draft year and check the summaries against the in-memory build."""
+    streamed, streamed_time, streamed_peak = measure(stream_member_stats)
+    reference, reference_time, reference_peak = measure(calculate_member_stats)
+
+    mismatched = sorted(
+        member for member in set(streamed) | set(reference)
+        if member not in streamed or member not in reference
+        or any(streamed[member][key] != reference[member][key] for key in SUMMARY_KEYS)
+    )
+    if mismatched:
+        print(f"✗ Streamed stats differ from calculate_member_stats() for: {', '.join(mismatched)}")
+        sys.exit(1)
+
+    print(f"✅ Streamed stats match calculate_member_stats() for {len(streamed)} members")
+    print(f"   streaming: {streamed_time * 1000:.1f} ms, {streamed_peak / 1024 / 1024:.2f} MiB peak | "
+          f"in-memory: {reference_time * 1000:.1f} ms, {reference_peak / 1024 / 1024:.2f} MiB peak")
+
+if __name__ == "__main__":
+    main()
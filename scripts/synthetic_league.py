@@ -0,0 +1,270 @@
+"""
+Generate a deterministic synthetic league for benchmarking the build scripts.
+Writes drafts, seasons, players, page data and profile pages in the same
+shape as data/ and profiles/, scaled by members, years, rounds and ranked players.
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+
+RANKED_POSITIONS = ["QB", "RB", "WR", "TE"]
+
+# Share of picks spent on each position
+POSITION_WEIGHTS = {"RB": 0.30, "WR": 0.35, "QB": 0.10, "TE": 0.10, "K": 0.07, "D/ST": 0.08}
+
+# Typical PPR totals for the top player at each position
+TOP_PPR = {"QB": 420.0, "RB": 380.0, "WR": 360.0, "TE": 250.0}
+
+TEAMS = [
+    "ARI", "ATL", "BAL", "BUF", "CAR", "CHI", "CIN", "CLE", "DAL", "DEN", "DET", "GNB",
+    "HOU", "IND", "JAX", "KAN", "LAC", "LAR", "LVR", "MIA", "MIN", "NOR", "NWE", "NYG",
+    "NYJ", "PHI", "PIT", "SEA", "SFO", "TAM", "TEN", "WAS"
+]
+
+PROFILE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{name} | Sunday Movie League</title>
+    <link rel="stylesheet" href="../styles.css">
+    <link rel="stylesheet" href="profile.css">
+</head>
+<body>
+    <main class="profile-page">
+        <div class="profile-header">
+            <div class="profile-picture">
+                <div class="picture-placeholder">{initials}</div>
+            </div>
+            <div class="profile-info">
+                <h1 class="profile-name">{name}</h1>
+                <div class="profile-tenure">Member since {first_year}</div>
+                <div class="profile-stats">
+                    <div class="stat-card">
+                        <span class="stat-value">{championships}</span>
+                        <span class="stat-label">Championships</span>
+                    </div>
+                    <div class="stat-card">
+                        <span class="stat-value">{runner_ups}</span>
+                        <span class="stat-label">Runner-Up</span>
+                    </div>
+                    <div class="stat-card">
+                        <span class="stat-value">{seasons}</span>
+                        <span class="stat-label">Seasons</span>
+                    </div>
+                    <div class="stat-card">
+                        <span class="stat-value">{season_record}</span>
+                        <span class="stat-label">Season Record</span>
+                    </div>
+                    <div class="stat-card">
+                        <span class="stat-value">{playoff_appearances}</span>
+                        <span class="stat-label">Playoff Appearances</span>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <!-- Draft Statistics Section -->
+        <section class="profile-section">
+            <h2 class="section-heading">Draft Statistics</h2>
+            <div class="draft-stats-table-wrapper">
+                <table class="draft-stats-table">
+                    <tbody id="draft-stats-tbody">
+                        <tr><td colspan="11">Loading...</td></tr>
+                    </tbody>
+                </table>
+            </div>
+        </section>
+
+        <section class="profile-section">
+            <h2 class="section-heading">Biography</h2>
+            <div class="bio-content">
+                <p>Biography coming soon.</p>
+            </div>
+        </section>
+
+        <section class="profile-section">
+            <h2 class="section-heading">League History</h2>
+            <div class="history-timeline">
+{history}
+            </div>
+        </section>
+    </main>
+    <script src="draft-stats.js"></script>
+</body>
+</html>
+"""
+
+HISTORY_ITEM = """                <div class="history-item">
+                    <span class="history-year">{year}</span>
+                    <span class="history-event">Finished {place} ({record})</span>
+                </div>"""
+
+def ordinal(n):
+    """Format a number as an ordinal (1st, 2nd, 11th, ...)."""
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+def build_player_pool(rng, num_members, num_rounds, ranked_per_position, years):
+    """Create enough players per position to cover every draft and ranking."""
+    picks_per_year = num_members * num_rounds
+    players = {}
+    pool = {}
+    for position, weight in POSITION_WEIGHTS.items():
+        # Every drafted player should exist, with room for undrafted ranked players
+        size = max(ranked_per_position, int(picks_per_year * weight * 1.5) + num_members)
+        code = position.replace("/", "").lower()
+        pool[position] = []
+        for n in range(1, size + 1):
+            player_id = f"synthetic{code}{n:04d}"
+            team = rng.choice(TEAMS)
+            teams_by_year = {}
+            for year in sorted(years, reverse=True):
+                if rng.random() < 0.2:
+                    team = rng.choice(TEAMS)
+                teams_by_year[str(year)] = team
+            players[player_id] = {
+                "name": f"Synthetic {position} {n}",
+                "positions": [position],
+                "teams_by_year": teams_by_year
+            }
+            pool[position].append(player_id)
+    return players, pool
+
+def generate_draft(rng, year, members, num_rounds, pool, talent):
+    """Snake draft where each member picks a position and takes the best available player."""
+    positions = list(POSITION_WEIGHTS)
+    weights = list(POSITION_WEIGHTS.values())
+    # Draft boards: players ordered by noisy perceived talent
+    boards = {
+        position: sorted(ids, key=lambda pid: -(talent[pid] + rng.gauss(0, 0.15)))
+        for position, ids in pool.items()
+    }
+    taken = {position: 0 for position in positions}
+    picks = []
+    for round_num in range(1, num_rounds + 1):
+        order = members if round_num % 2 == 1 else list(reversed(members))
+        for pick_num, owner in enumerate(order, start=1):
+            position = rng.choices(positions, weights)[0]
+            if taken[position] >= len(boards[position]):
+                position = max(positions, key=lambda p: len(boards[p]) - taken[p])
+            player_id = boards[position][taken[position]]
+            taken[position] += 1
+            picks.append({
+                "round": round_num,
+                "pick": pick_num,
+                "player_id": player_id,
+                "owner": owner,
+                "draft_pos": f"{position} {taken[position]}"
+            })
+    return {"year": year, "picks": picks}
+
+def generate_season(rng, year, pool, talent, ranked_per_position):
+    """Rank the top players per position by simulated PPR points."""
+    rankings = {}
+    for position in RANKED_POSITIONS:
+        scored = [
+            (round(max(0.0, TOP_PPR[position] * talent[pid] + rng.gauss(0, 40)), 1), pid)
+            for pid in pool[position]
+        ]
+        scored.sort(reverse=True)
+        rankings[position] = [
+            {"player_id": pid, "ppr": ppr, "rank": rank}
+            for rank, (ppr, pid) in enumerate(scored[:ranked_per_position], start=1)
+        ]
+    rankings["ST"] = []
+    rankings["K"] = []
+    return {"year": year, "ppr_rankings": rankings}
+
+def generate_profile_html(rng, member, years):
+    """Render a profile page for a synthetic member."""
+    wins_total = losses_total = 0
+    history = []
+    for year in sorted(years, reverse=True):
+        wins = rng.randint(2, 12)
+        losses = 14 - wins
+        wins_total += wins
+        losses_total += losses
+        history.append(HISTORY_ITEM.format(year=year, place=ordinal(rng.randint(1, 12)), record=f"{wins}-{losses}-0"))
+    return PROFILE_TEMPLATE.format(
+        name=member,
+        initials=member[:2].upper(),
+        first_year=min(years),
+        championships=rng.randint(0, 2),
+        runner_ups=rng.randint(0, 2),
+        seasons=len(years),
+        season_record=f"{wins_total}-{losses_total}-0",
+        playoff_appearances=rng.randint(0, len(years)),
+        history="\n".join(history)
+    )
+
+def write_json(path, data):
+    """Write JSON in the same format as the checked-in data files."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+def generate_league(output_dir, members=12, years=5, rounds=14, ranked_per_position=60, seed=0, first_year=2021):
+    """Write a synthetic league into output_dir and return a summary of what was written."""
+    rng = random.Random(seed)
+    output_dir = Path(output_dir)
+    year_list = list(range(first_year, first_year + years))
+    member_names = [f"Member{n:02d}" for n in range(1, members + 1)]
+
+    players, pool = build_player_pool(rng, members, rounds, ranked_per_position, year_list)
+    talent = {}
+    for position, ids in pool.items():
+        for n, player_id in enumerate(ids):
+            # Talent decays with depth so higher picks finish higher on average
+            talent[player_id] = 1.0 / (1.0 + n / 12.0)
+
+    write_json(output_dir / "data" / "players.json", {"players": players})
+    for year in year_list:
+        draft_order = member_names[:]
+        rng.shuffle(draft_order)
+        write_json(output_dir / "data" / "drafts" / f"{year}.json",
+                   generate_draft(rng, year, draft_order, rounds, pool, talent))
+        write_json(output_dir / "data" / "seasons" / f"{year}.json",
+                   generate_season(rng, year, pool, talent, ranked_per_position))
+        # Talent drifts between seasons
+        for player_id in talent:
+            talent[player_id] = max(0.05, talent[player_id] * rng.uniform(0.8, 1.2))
+
+    write_json(output_dir / "data" / "member_pages.json", {
+        member.lower(): {"name": member, "initials": member[:2].upper(), "member_since": first_year, "seasons": years}
+        for member in member_names
+    })
+    profiles_dir = output_dir / "profiles"
+    profiles_dir.mkdir(parents=True, exist_ok=True)
+    for member in member_names:
+        html = generate_profile_html(rng, member, year_list)
+        (profiles_dir / f"{member.lower()}.html").write_text(html, encoding='utf-8')
+
+    return {
+        "members": members,
+        "years": years,
+        "rounds": rounds,
+        "picks": members * rounds * years,
+        "players": len(players)
+    }
+
+def main():
+    """Generate a synthetic league from the command line."""
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic league.")
+    parser.add_argument("output_dir", help="directory to write data/ and profiles/ into")
+    parser.add_argument("--members", type=int, default=12)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=14)
+    parser.add_argument("--ranked", type=int, default=60, help="ranked players per position per season")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    summary = generate_league(args.output_dir, args.members, args.years, args.rounds, args.ranked, args.seed)
+    print(f"✅ Wrote synthetic league to {args.output_dir}: "
+          f"{summary['members']} members, {summary['years']} years, "
+          f"{summary['picks']} picks, {summary['players']} players")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Inverted (year, NFL team) -> drafted players index.
+Theme-team and homer detection used to look up every pick's team in
+players.json and regroup the picks for each member. This builds the
+grouping once from the draft files: for every year and team, which member
+drafted which players. Members, teams and players are stored as integer ids
+into name tables, so data/team_index.json stays small enough for profile
+pages to fetch instead of players.json.
+
+TeamIndex answers the grouped questions for every member in one pass:
+stacks() ("who drafted 4+ players from one team in a year") and
+franchises() ("each member's most-drafted team").
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import build_profiler
+import league_data
+import member_registry
+from profile_insights import to_fixed
+
+TEAM_INDEX_FILE = Path("data/team_index.json")
+INDEX_VERSION = 1
+
+# The Homer achievement: this many players from one team in one draft
+HOMER_MIN_COUNT = 4
+# A theme team: this many players from one team overall, or this share of all picks
+THEME_TEAM_MIN_COUNT = 5
+THEME_TEAM_MIN_PERCENT = 15
+
+def encode_index(grouped, member_picks):
+    """{(year, team): [(member, player_id)]} -> the compact JSON form, with integer ids into name tables."""
+    members = sorted(member_picks)
+    teams = sorted({team for _, team in grouped})
+    player_ids = sorted({player_id for pairs in grouped.values() for _, player_id in pairs})
+    years = sorted({year for year, _ in grouped})
+    member_ids = {member: i for i, member in enumerate(members)}
+    team_ids = {team: i for i, team in enumerate(teams)}
+    player_numbers = {player_id: i for i, player_id in enumerate(player_ids)}
+    year_ids = {year: i for i, year in enumerate(years)}
+    entries = []
+    for (year, team), pairs in sorted(grouped.items()):
+        # Pairs are flattened to member, player, member, player, ...
+        flat = []
+        for member, player_id in sorted(pairs):
+            flat += [member_ids[member], player_numbers[player_id]]
+        entries.append([year_ids[year], team_ids[team], flat])
+    return {
+        "version": INDEX_VERSION,
+        "members": members,
+        "teams": teams,
+        "players": player_ids,
+        "years": years,
+        "member_picks": [member_picks[member] for member in members],
+        "entries": entries,
+    }
+
+class TeamIndex:
+    """Query the (year, team) -> [(member, player_id)] index."""
+
+    def __init__(self, data):
+        self.members = data["members"]
+        self.teams = data["teams"]
+        self.players = data["players"]
+        self.years = data["years"]
+        self.member_picks = dict(zip(self.members, data["member_picks"]))
+        self.entries = {}
+        for year, team, pairs in data["entries"]:
+            self.entries[(self.years[year], self.teams[team])] = [
+                (self.members[pairs[i]], self.players[pairs[i + 1]]) for i in range(0, len(pairs), 2)
+            ]
+
+    @classmethod
+    def from_drafts(cls, drafts, players_data, registry=None):
+        """Build the index from {year: draft} and players.json data."""
+        registry = registry or member_registry.load_registry()
+        players = players_data.get("players", {})
+        grouped = {}
+        member_picks = {}
+        for year, draft in sorted(drafts.items()):
+            for pick in draft.get("picks", []):
+                member = member_registry.member_id(pick["owner"], registry)
+                member_picks[member] = member_picks.get(member, 0) + 1
+                team = (players.get(pick["player_id"], {}).get("teams_by_year") or {}).get(str(year))
+                if team:
+                    grouped.setdefault((int(year), team), []).append((member, pick["player_id"]))
+        return cls(encode_index(grouped, member_picks))
+
+    def to_json(self):
+        """The compact form written to data/team_index.json."""
+        return encode_index(self.entries, self.member_picks)
+
+    def drafted(self, year, team):
+        """{member: [player_id]} drafted from one team in one year."""
+        by_member = {}
+        for member, player_id in self.entries.get((int(year), team), []):
+            by_member.setdefault(member, []).append(player_id)
+        return by_member
+
+    def stacks(self, min_count=HOMER_MIN_COUNT):
+        """Every member who drafted min_count+ players from one team in one year, oldest first."""
+        found = []
+        for (year, team), pairs in sorted(self.entries.items()):
+            by_member = {}
+            for member, player_id in pairs:
+                by_member.setdefault(member, []).append(player_id)
+            for member, player_ids in sorted(by_member.items()):
+                if len(player_ids) >= min_count:
+                    found.append({"member": member, "year": year, "team": team,
+                                  "count": len(player_ids), "players": player_ids})
+        return found
+
+    def team_counts(self):
+        """{member: {team: players drafted}} over every year."""
+        counts = {member: {} for member in self.members}
+        for (_, team), pairs in self.entries.items():
+            for member, _ in pairs:
+                counts[member][team] = counts[member].get(team, 0) + 1
+        return counts
+
+    def franchises(self):
+        """{member: {"team", "count", "percentage"}} for each member's most-drafted team.
+
+        Ties go to the alphabetically first team. percentage is the share of
+        all the member's picks, formatted like the profile tendencies.
+        """
+        franchises = {}
+        for member, counts in self.team_counts().items():
+            if not counts:
+                continue
+            team, count = min(counts.items(), key=lambda item: (-item[1], item[0]))
+            franchises[member] = {
+                "team": team,
+                "count": count,
+                "percentage": to_fixed(count / self.member_picks[member] * 100, 1)
+            }
+        return franchises
+
+    def theme_teams(self):
+        """The franchises() that count as a theme team (5+ players or 15%+ of picks)."""
+        return {
+            member: franchise for member, franchise in self.franchises().items()
+            if franchise["count"] >= THEME_TEAM_MIN_COUNT or float(franchise["percentage"]) >= THEME_TEAM_MIN_PERCENT
+        }
+
+def build_team_index():
+    """Build the index from the league's draft files and players.json."""
+    with build_profiler.stage("build_team_index"):
+        return TeamIndex.from_drafts(league_data.drafts(), league_data.players())
+
+def load_team_index(path=TEAM_INDEX_FILE):
+    """Load a written index, or None if it hasn't been built."""
+    data = league_data.load_json(path)
+    return TeamIndex(data) if data else None
+
+def main():
+    """Build data/team_index.json and summarize stacks and theme teams."""
+    parser = argparse.ArgumentParser(description="Build the (year, team) -> drafted players index.")
+    parser.add_argument("--output", type=Path, default=TEAM_INDEX_FILE)
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("team_index", args)
+
+    index = build_team_index()
+    data = index.to_json()
+    with open(args.output, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    print(f"✓ Indexed {sum(len(pairs) for pairs in index.entries.values())} picks across "
+          f"{len(index.entries)} year/team pairs, wrote {args.output} ({args.output.stat().st_size:,} bytes)")
+
+    stacks = index.stacks()
+    print(f"\n{len(stacks)} stacks of {HOMER_MIN_COUNT}+ players from one team:")
+    for stack in stacks:
+        print(f"  {stack['year']} {stack['member']:10} {stack['count']} from {stack['team']}")
+    theme_teams = index.theme_teams()
+    print(f"\n{len(theme_teams)} theme teams:")
+    for member, franchise in sorted(theme_teams.items()):
+        print(f"  {member:10} {franchise['team']:4} {franchise['count']:3} ({franchise['percentage']}%)")
+    build_profiler.finish()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Watch mode: rebuild what an edit affects and preview the site with live reload.
+Watches the hand-edited data files and walks a dependency graph from them:
+
+    drafts, seasons, players, league database, aliases -> data/profiles/<alias>.json
+    drafts, players                                    -> data/team_index.json
+    drafts, seasons, players, league database, aliases -> data/draft_cube.bin
+    league database, index page data                   -> data/member_simulations.json
+    profile JSON                                       -> bundles and year shards
+    profile JSON, page data, simulations, team index   -> profiles/<alias>.html
+    drafts, seasons, players, league database, index page data -> index.html sections
+
+Each rule runs in this process (the loaded league data stays warm between
+builds) and only for what changed: profile stats are recomputed for the
+members the incremental build manifest says are affected, and bundles,
+shards and pages only for members whose profile JSON was rewritten. The
+site is served from the repository root; every HTML page gets a small
+script that reloads it when a build finishes or a stylesheet or script
+changes.
+"""
+
+import argparse
+import fnmatch
+import json
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import build_bundles
+import build_profile_shards
+import build_profiler
+import draft_cube
+import league_data
+import member_registry
+import render_index
+import render_profiles
+import season_simulator
+import team_index
+from calculate_profile_draft_stats import (
+    DEFAULT_RANKING,
+    MANIFEST_VERSION,
+    add_member_insights,
+    calculate_member_stats,
+    collect_input_hashes,
+    find_affected_members,
+    generate_profile_json,
+    hash_player_entries,
+    load_build_manifest,
+    prune_stale_profiles,
+    save_build_manifest,
+)
+
+DEFAULT_PORT = 8000
+POLL_SECONDS = 0.2
+# Wait this long after a change so a save that touches several files builds once
+SETTLE_SECONDS = 0.1
+RELOAD_PATH = "/__reload"
+RELOAD_SCRIPT = (f'<script>new EventSource("{RELOAD_PATH}").onmessage = function () '
+                 '{ location.reload(); };</script>').encode()
+
+DRAFTS = "data/drafts/*.json"
+SEASONS = "data/seasons/*.json"
+PLAYERS = "data/players.json"
+LEAGUE = "data/league_database.json"
+ALIASES = "data/member_aliases.json"
+PROFILE_JSON = "data/profiles/*.json"
+PAGE_DATA = ["data/member_pages.json", "data/league_history.json", "data/member_season_records.json",
+             "data/member_simulations.json"]
+
+# Files edited by hand; their changes start builds
+SOURCES = [DRAFTS, SEASONS, PLAYERS, LEAGUE, ALIASES, "data/index_page.json"] + PAGE_DATA
+# Files that only need the open pages reloaded
+ASSETS = ["*.html", "*.css", "*.js", "profiles/*.html", "profiles/*.css", "profiles/*.js"]
+
+def build_profiles(aliases):
+    """Recompute the profile JSON of the members the changed inputs affect; returns the files written."""
+    manifest = load_build_manifest()
+    output_format = manifest.get("format", "compact") if manifest else "compact"
+    ranking = manifest.get("ranking", DEFAULT_RANKING) if manifest else DEFAULT_RANKING
+    if manifest is not None and manifest.get("version") != MANIFEST_VERSION:
+        manifest = None
+    input_hashes = collect_input_hashes()
+    player_hashes = hash_player_entries(league_data.players())
+    owners = find_affected_members(manifest, input_hashes, player_hashes) if manifest else None
+    if owners == set():
+        save_build_manifest(input_hashes, player_hashes, {}, manifest, output_format=output_format, ranking=ranking)
+        return []
+
+    member_stats = add_member_insights(calculate_member_stats(owners, ranking=ranking))
+    written = []
+    for member_name, stats in member_stats.items():
+        output_file, was_written = generate_profile_json(member_name, stats, output_format)
+        if was_written:
+            written.append(output_file)
+    saved = save_build_manifest(input_hashes, player_hashes, member_stats, manifest, owners, output_format, ranking)
+    written += prune_stale_profiles(record["output"] for record in saved["members"].values())
+    return written
+
+def build_team_index(aliases):
+    """Rebuild data/team_index.json; returns it if its contents changed."""
+    data = team_index.build_team_index().to_json()
+    if league_data.load_json(team_index.TEAM_INDEX_FILE) == data:
+        return []
+    with open(team_index.TEAM_INDEX_FILE, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    return [team_index.TEAM_INDEX_FILE]
+
+def build_draft_cube(aliases):
+    """Rebuild data/draft_cube.bin; returns it if its contents changed."""
+    cube, _, _ = draft_cube.build_draft_cube()
+    return [draft_cube.DRAFT_CUBE_FILE] if draft_cube.write_draft_cube(cube) else []
+
+def build_simulations(aliases):
+    """Re-run the season simulations with the sims and seed of the last run; returns the file if it changed."""
+    settings = league_data.load_json(season_simulator.SIMULATIONS_FILE, {})
+    output = season_simulator.build_simulations(settings.get("sims", season_simulator.DEFAULT_SIMS),
+                                                settings.get("seed", season_simulator.DEFAULT_SEED))
+    return [season_simulator.SIMULATIONS_FILE] if season_simulator.write_simulations(output) else []
+
+def build_member_bundles(aliases):
+    """Rebuild the bundles of the given members (all when None); returns the files written."""
+    _, written = build_bundles.build_all(aliases)
+    return [build_bundles.BUNDLES_DIR / f"{alias}.json" for alias in written]
+
+def build_member_shards(aliases):
+    """Rebuild the year shards of the given members (all when None); returns the files written."""
+    _, written = build_profile_shards.build_all(aliases)
+    return [Path(path) for path in written]
+
+def build_pages(aliases):
+    """Re-render the profile pages of the given members (all when None); returns the pages written."""
+    return render_profiles.render_all(aliases)
+
+def build_index(aliases):
+    """Re-render the index.html sections whose inputs changed; returns index.html if it changed."""
+    _, changed = render_index.render_index()
+    return [render_index.INDEX_FILE] if changed else []
+
+# The dependency graph, in build order. A rule runs when a changed file
+# matches its inputs; matches of member_inputs (data/profiles/<alias>.json)
+# limit it to those members, any other input rebuilds every member. The
+# files a rule writes count as changes for the rules after it.
+RULES = [
+    {"name": "profile stats", "inputs": [DRAFTS, SEASONS, PLAYERS, LEAGUE, ALIASES], "build": build_profiles},
+    {"name": "team index", "inputs": [DRAFTS, PLAYERS, LEAGUE, ALIASES], "build": build_team_index},
+    {"name": "draft cube", "inputs": [DRAFTS, SEASONS, PLAYERS, LEAGUE, ALIASES], "build": build_draft_cube},
+    {"name": "simulations", "inputs": [LEAGUE, "data/index_page.json"], "build": build_simulations},
+    {"name": "bundles", "member_inputs": [PROFILE_JSON], "inputs": [PLAYERS, LEAGUE, "data/member_pages.json"],
+     "build": build_member_bundles},
+    {"name": "shards", "member_inputs": [PROFILE_JSON], "inputs": [PLAYERS, LEAGUE, "data/member_pages.json"],
+     "build": build_member_shards},
+    {"name": "profile pages", "member_inputs": [PROFILE_JSON],
+     "inputs": [LEAGUE, team_index.TEAM_INDEX_FILE.as_posix()] + PAGE_DATA, "build": build_pages},
+    {"name": "index sections", "inputs": [DRAFTS, SEASONS, PLAYERS, LEAGUE, ALIASES, "data/index_page.json"],
+     "build": build_index},
+]
+
+def matches(path, patterns):
+    return any(fnmatch.fnmatch(path, pattern) for pattern in patterns)
+
+def run_rules(changed):
+    """Run every rule the changed paths reach; returns [(rule name, files written, seconds)]."""
+    changed = set(changed)
+    # The registry caches names from the league database and aliases
+    if changed & {LEAGUE, ALIASES}:
+        member_registry.clear_cache()
+    results = []
+    for rule in RULES:
+        shared = [path for path in changed if matches(path, rule["inputs"])]
+        members = sorted(Path(path).stem for path in changed if matches(path, rule.get("member_inputs", [])))
+        if not shared and not members:
+            continue
+        start = time.perf_counter()
+        with build_profiler.stage(rule["name"].replace(" ", "_")):
+            written = rule["build"](None if shared else members)
+        results.append((rule["name"], written, time.perf_counter() - start))
+        changed.update(Path(path).as_posix() for path in written)
+    return results
+
+def snapshot(patterns):
+    """{path: (mtime, size)} for every file matching the patterns."""
+    files = {}
+    for pattern in patterns:
+        for path in Path(".").glob(pattern):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files[path.as_posix()] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+def changed_files(before, after):
+    return sorted(path for path in set(before) | set(after) if before.get(path) != after.get(path))
+
+class ReloadChannel:
+    """Wakes every connected page's event stream when the site changes."""
+
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def notify(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, version, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+def make_handler(channel):
+    class PreviewHandler(SimpleHTTPRequestHandler):
+        """Serve the repository with no caching, live reload in pages and the reload event stream."""
+
+        def end_headers(self):
+            self.send_header("Cache-Control", "no-store")
+            super().end_headers()
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == RELOAD_PATH:
+                return self.stream_reloads()
+            file_path = Path(self.translate_path(path))
+            if path.endswith("/") and file_path.is_dir():
+                file_path = file_path / "index.html"
+            if file_path.suffix == ".html" and file_path.is_file():
+                return self.send_page(file_path)
+            return super().do_GET()
+
+        def send_page(self, file_path):
+            content = file_path.read_bytes()
+            index = content.rfind(b"</body>")
+            content = content[:index] + RELOAD_SCRIPT + content[index:] if index >= 0 else content + RELOAD_SCRIPT
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def stream_reloads(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            version = channel.version
+            try:
+                while True:
+                    latest = channel.wait(version, timeout=15)
+                    # A comment line every 15s notices closed tabs
+                    self.wfile.write(b"data: reload\n\n" if latest != version else b": ping\n\n")
+                    self.wfile.flush()
+                    version = latest
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    return PreviewHandler
+
+def serve(port, channel):
+    """Start the preview server on a background thread."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(channel))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def watch(channel, poll=POLL_SECONDS):
+    """Poll the watched files forever, rebuilding and reloading on changes."""
+    sources, assets = snapshot(SOURCES), snapshot(ASSETS)
+    print(f"👀 Watching {len(sources)} data files and {len(assets)} pages and assets (Ctrl+C to stop)")
+    while True:
+        time.sleep(poll)
+        changed_sources = changed_files(sources, snapshot(SOURCES))
+        changed_assets = changed_files(assets, snapshot(ASSETS))
+        if not changed_sources and not changed_assets:
+            continue
+        time.sleep(SETTLE_SECONDS)
+        changed_sources = changed_files(sources, snapshot(SOURCES))
+        if changed_sources:
+            start = time.perf_counter()
+            print(f"\n✏️  {', '.join(changed_sources)}")
+            try:
+                for name, written, seconds in run_rules(changed_sources):
+                    print(f"  ✓ {name}: {len(written)} file(s) in {seconds * 1000:.0f} ms")
+                print(f"✓ Rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms")
+            except Exception as error:
+                # Keep watching; the next save usually fixes a half-edited file
+                print(f"  ✗ Build failed: {error}")
+        elif changed_assets:
+            print(f"\n✏️  {', '.join(changed_assets)}")
+        # Builds write pages and data, so take fresh snapshots after them
+        sources, assets = snapshot(SOURCES), snapshot(ASSETS)
+        channel.notify()
+
+def main():
+    """Serve the site and rebuild on every data edit."""
+    parser = argparse.ArgumentParser(description="Rebuild affected profiles and pages on edits and serve a live preview.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="preview server port (default: %(default)s)")
+    parser.add_argument("--no-serve", action="store_true", help="only rebuild, don't start the preview server")
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("watch", args)
+
+    channel = ReloadChannel()
+    server = None if args.no_serve else serve(args.port, channel)
+    if server:
+        print(f"✓ Serving the site at http://127.0.0.1:{args.port}/ with live reload")
+    try:
+        watch(channel)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        if server:
+            server.shutdown()
+        build_profiler.finish()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Build several leagues at once from one checkout.
+Each league directory has the same layout as the repository: data/drafts,
+data/league_database.json, data/member_aliases.json and the page data
+(data/member_pages.json and friends), plus data/players.json and
+data/seasons when it doesn't use the shared ones. Every league runs the
+profile stats build and renders its profile pages (biographies included)
+in its own worker process, working in the league's directory,
+so leagues build side by side and scale with cores.
+
+Leagues that don't carry their own players.json or season rankings use the
+shared copies (--shared, the repository's data/ by default). These are
+parsed once and pickled to a snapshot file. Each worker unpickles its own
+copy of the snapshot once and primes league_data's cache with it, instead of
+re-reading and re-parsing the JSON for every league it builds.
+
+Prints a combined timing report (per league and per stage, plus total
+league build time against wall time) and writes it as JSON with --report.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import build_profiler
+import league_data
+import render_profiles
+from calculate_profile_draft_stats import (
+    DEFAULT_RANKING,
+    MANIFEST_VERSION,
+    add_member_insights,
+    calculate_member_stats,
+    collect_input_hashes,
+    find_affected_members,
+    generate_profile_json,
+    hash_player_entries,
+    load_build_manifest,
+    prune_stale_profiles,
+    save_build_manifest,
+)
+
+SHARED_DATA_DIR = Path("data")
+
+# Set in each worker by load_shared_snapshot()
+_shared = {"entries": [], "load_seconds": 0.0}
+
+def shared_files(league_dir, shared_dir):
+    """The shared players file and seasons directory a league uses, or None where it has its own."""
+    data_dir = league_dir / "data"
+    players_file = None if (data_dir / "players.json").exists() else shared_dir / "players.json"
+    seasons_dir = None if league_data.year_files(data_dir / "seasons") else shared_dir / "seasons"
+    return players_file, seasons_dir
+
+def write_shared_snapshot(paths, snapshot_file):
+    """Parse the shared files once and pickle them for the workers to load; returns the file count."""
+    with build_profiler.stage("load_shared_data"):
+        league_data.load_many(paths)
+        entries = league_data.cached_files(paths)
+    with build_profiler.stage("write_shared_snapshot"):
+        with open(snapshot_file, "wb") as f:
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return len(entries)
+
+def load_shared_snapshot(snapshot_file, profiling):
+    """Worker initializer: unpickle the shared snapshot into this worker and keep its parsed files."""
+    build_profiler.enable_worker(profiling)
+    start = time.perf_counter()
+    if snapshot_file:
+        # Frozen once here, so priming the cache for each league reuses the frozen views
+        with open(snapshot_file, "rb") as f:
+            _shared["entries"] = [(path, signature, league_data.freeze(data))
+                                  for path, signature, data in pickle.load(f)]
+    _shared["load_seconds"] = time.perf_counter() - start
+
+@contextlib.contextmanager
+def league_paths(league_dir, players_file, seasons_dir):
+    """Work in a league's directory, reading the shared players and seasons where it has none."""
+    previous_dir = os.getcwd()
+    previous = league_data.PLAYERS_FILE, league_data.SEASONS_DIR
+    os.chdir(league_dir)
+    if players_file:
+        league_data.PLAYERS_FILE = players_file
+    if seasons_dir:
+        league_data.SEASONS_DIR = seasons_dir
+    try:
+        yield
+    finally:
+        league_data.PLAYERS_FILE, league_data.SEASONS_DIR = previous
+        os.chdir(previous_dir)
+
+def build_profile_stats(incremental):
+    """Recompute the league's profile JSON; returns (members computed, files written)."""
+    input_hashes = collect_input_hashes()
+    player_hashes = hash_player_entries(league_data.players())
+    manifest = load_build_manifest() if incremental else None
+    if manifest is not None and (manifest.get("version") != MANIFEST_VERSION or manifest.get("format") != "compact"
+                                 or manifest.get("ranking", DEFAULT_RANKING) != DEFAULT_RANKING):
+        manifest = None
+    owners = find_affected_members(manifest, input_hashes, player_hashes) if manifest else None
+    if owners == set():
+        save_build_manifest(input_hashes, player_hashes, {}, manifest)
+        return 0, []
+
+    member_stats = add_member_insights(calculate_member_stats(owners))
+    written = []
+    for member_name, stats in member_stats.items():
+        output_file, was_written = generate_profile_json(member_name, stats)
+        if was_written:
+            written.append(output_file)
+    saved = save_build_manifest(input_hashes, player_hashes, member_stats, manifest, owners)
+    written += prune_stale_profiles(record["output"] for record in saved["members"].values())
+    return len(member_stats), written
+
+def build_biographies():
+    """Re-render the profile pages with their biographies; returns the pages changed."""
+    return len(render_profiles.render_all())
+
+def run_league(league_dir, players_file, seasons_dir, incremental):
+    """Build one league in a worker process.
+
+    Returns its timing record, the captured log and the worker's profiling
+    snapshot. Errors are reported in the record rather than raised so one
+    broken league doesn't stop the others.
+    """
+    record = {"league": league_dir.name, "path": league_dir.as_posix(), "worker": os.getpid(),
+              "snapshot_load_seconds": round(_shared["load_seconds"], 6), "stages": {}, "error": None}
+    # The first league a worker builds pays for loading the snapshot
+    _shared["load_seconds"] = 0.0
+    league_data.prime(_shared["entries"])
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output), league_paths(league_dir, players_file, seasons_dir):
+        try:
+            stage_start = time.perf_counter()
+            with build_profiler.stage("profile_stats"):
+                record["members"], written = build_profile_stats(incremental)
+            record["profiles_written"] = len(written)
+            record["stages"]["profile_stats"] = round(time.perf_counter() - stage_start, 6)
+
+            stage_start = time.perf_counter()
+            with build_profiler.stage("biographies"):
+                record["biographies"] = build_biographies()
+            record["stages"]["biographies"] = round(time.perf_counter() - stage_start, 6)
+        except Exception as error:
+            record["error"] = f"{type(error).__name__}: {error}"
+    record["seconds"] = round(time.perf_counter() - start, 6)
+    return record, output.getvalue(), build_profiler.take_snapshot()
+
+def format_report(report):
+    """The combined timing report as a table."""
+    stage_names = list(dict.fromkeys(name for league in report["leagues"] for name in league["stages"]))
+    lines = [f"  {'league':<20} {'worker':>7} {'members':>7} {'written':>7}"
+             + "".join(f" {name:>14}" for name in stage_names) + f" {'total':>9}"]
+    for league in report["leagues"]:
+        stages = "".join(f" {league['stages'].get(name, 0) * 1000:11.0f} ms" for name in stage_names)
+        lines.append(f"  {league['league']:<20} {league['worker']:>7} {league.get('members', 0):>7} "
+                     f"{league.get('profiles_written', 0):>7}{stages} {league['seconds'] * 1000:6.0f} ms"
+                     + (f"  ✗ {league['error']}" if league["error"] else ""))
+    lines.append("")
+    if report["shared_files"]:
+        lines.append(f"  Shared data: {report['shared_files']} file(s) parsed once in "
+                     f"{report['shared_seconds'] * 1000:.0f} ms, loaded by {report['workers']} worker(s) in "
+                     f"{report['snapshot_load_seconds'] * 1000:.0f} ms total")
+    else:
+        lines.append("  Shared data: none, every league has its own players and seasons")
+    lines.append(f"  {len(report['leagues'])} league(s) in {report['wall_seconds']:.2f}s wall, "
+                 f"{report['league_seconds']:.2f}s of league build time ({report['speedup']:.1f}x)")
+    return "\n".join(lines)
+
+def build_workspace(league_dirs, shared_dir=SHARED_DATA_DIR, workers=0, incremental=False, verbose=False):
+    """Build every league in parallel worker processes; returns the combined timing report."""
+    start = time.perf_counter()
+    league_dirs = [Path(league_dir).resolve() for league_dir in league_dirs]
+    shared_dir = Path(shared_dir).resolve()
+    plans = [(league_dir, *shared_files(league_dir, shared_dir)) for league_dir in league_dirs]
+    shared_paths = sorted({players_file for _, players_file, _ in plans if players_file})
+    for seasons_dir in sorted({seasons_dir for _, _, seasons_dir in plans if seasons_dir}):
+        shared_paths += league_data.year_files(seasons_dir).values()
+    workers = min(workers or os.cpu_count() or 1, len(plans))
+
+    with tempfile.TemporaryDirectory(prefix="sml-workspace-") as temp_dir:
+        snapshot_file = Path(temp_dir) / "shared.pickle" if shared_paths else None
+        shared_count = write_shared_snapshot(shared_paths, snapshot_file) if snapshot_file else 0
+        shared_seconds = time.perf_counter() - start
+
+        records = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=load_shared_snapshot,
+                                 initargs=(snapshot_file, build_profiler.enabled())) as pool:
+            futures = [pool.submit(run_league, league_dir, players_file, seasons_dir, incremental)
+                       for league_dir, players_file, seasons_dir in plans]
+            # Results are printed in the order the leagues were given
+            for future in futures:
+                record, output, snapshot = future.result()
+                build_profiler.merge(snapshot)
+                records.append(record)
+                if verbose or record["error"]:
+                    print(f"\n── {record['league']} ──\n{output}", end="")
+                status = f"✗ {record['league']}: {record['error']}" if record["error"] else \
+                    f"✓ {record['league']}: {record.get('members', 0)} member(s), {record['biographies']} page(s)"
+                print(f"  {status} in {record['seconds'] * 1000:.0f} ms")
+
+    wall_seconds = time.perf_counter() - start
+    league_seconds = sum(record["seconds"] for record in records)
+    return {
+        "workers": workers,
+        "shared_dir": shared_dir.as_posix(),
+        "shared_files": shared_count,
+        "shared_seconds": round(shared_seconds, 6),
+        "snapshot_load_seconds": round(sum(record["snapshot_load_seconds"] for record in records), 6),
+        "wall_seconds": round(wall_seconds, 6),
+        "league_seconds": round(league_seconds, 6),
+        "speedup": round(league_seconds / wall_seconds, 2) if wall_seconds else 0,
+        "leagues": records,
+    }
+
+def main():
+    """Build every league directory given and print the combined timing report."""
+    parser = argparse.ArgumentParser(description="Build profile stats and biographies for several leagues in parallel.")
+    parser.add_argument("leagues", nargs="+", type=Path, help="league directories (each laid out like the repository)")
+    parser.add_argument("--shared", type=Path, default=SHARED_DATA_DIR,
+                        help="directory with the players.json and seasons/ leagues without their own use "
+                             "(default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="number of worker processes (0 = one per CPU core, default: 0)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only recompute members whose inputs changed since each league's last build")
+    parser.add_argument("--report", type=Path, help="also write the timing report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="print each league's build log")
+    build_profiler.add_arguments(parser)
+    args = parser.parse_args()
+    build_profiler.setup("workspace", args)
+
+    missing = [league.as_posix() for league in args.leagues if not (league / "data" / "drafts").is_dir()]
+    if missing:
+        parser.error(f"not a league directory (no data/drafts): {', '.join(missing)}")
+
+    print(f"Building {len(args.leagues)} league(s)")
+    report = build_workspace(args.leagues, args.shared, args.workers, args.incremental, args.verbose)
+    print(f"\n📊 Workspace timing report:\n{format_report(report)}")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Wrote {args.report}")
+    build_profiler.finish()
+
+    failures = [league["league"] for league in report["leagues"] if league["error"]]
+    if failures:
+        print(f"✗ {len(failures)} league(s) failed: {', '.join(failures)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()